@@ -3,19 +3,14 @@
 
 from __future__ import annotations
 
-import re
+import os
 import sys
 from pathlib import Path
 from typing import Iterable
 
-
-REQUIRED_FOOTER = (
-    "— VaultMesh · Earth’s Civilization Ledger —\n"
-    "© Vault Sovereign · https://vaultmesh.example/\n"
-)
-
-FOOTER_LINE_RE = re.compile(r"^— VaultMesh · Earth’s Civilization Ledger —$", re.M)
-LINK_RE = re.compile(r"https?://", re.I)
+from file_inventory import inventory
+from footer_rules import REQUIRED_FOOTER, has_required_footer, tail_has_link  # noqa: F401 - re-exported
+from vault_catalog import open_catalog
 
 IGNORE_DIRS = {".git", ".github", "node_modules", ".obsidian"}
 
@@ -29,39 +24,38 @@ def iter_markdown(paths: Iterable[Path]) -> Iterable[Path]:
                 continue
             yield path
         elif path.is_dir():
-            for candidate in path.rglob("*.md"):
+            rel = os.path.relpath(path)
+            if rel.startswith(".."):
+                candidates = inventory(path).under(suffixes=[".md"])
+            else:
+                candidates = inventory().under(rel, suffixes=[".md"])
+            for candidate in candidates:
                 if any(part in IGNORE_DIRS for part in candidate.parts):
                     continue
                 yield candidate
 
 
-def has_required_footer(text: str) -> bool:
-    return bool(FOOTER_LINE_RE.search(text))
-
-
-def tail_has_link(text: str, tail_lines: int = 20) -> bool:
-    lines = text.splitlines()[-tail_lines:]
-    return any(LINK_RE.search(line) for line in lines)
-
-
 def main(argv: list[str]) -> int:
     targets = [Path(arg) for arg in argv[1:]] or [Path("docs")]
 
     missing_footer: list[Path] = []
     footer_without_link: list[Path] = []
 
-    for md_file in iter_markdown(targets):
-        try:
-            content = md_file.read_text(encoding="utf-8")
-        except OSError as exc:
-            print(f"[footer] WARN unable to read {md_file}: {exc}")
+    md_files = list(iter_markdown(targets))
+    with open_catalog(md_files) as catalog:
+        status = catalog.footer_status([path.as_posix() for path in md_files])
+
+    for md_file in md_files:
+        if md_file.as_posix() not in status:
+            print(f"[footer] WARN unable to read {md_file}")
             continue
 
-        if not has_required_footer(content):
+        has_footer, has_link = status[md_file.as_posix()]
+        if not has_footer:
             missing_footer.append(md_file)
             continue
 
-        if not tail_has_link(content):
+        if not has_link:
             footer_without_link.append(md_file)
 
     if missing_footer or footer_without_link:
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Coverage of the lines a change adds or modifies.
+
+Changed lines come from unified-diff hunks (the PR files API ``patch``
+field, or ``git diff``) as sorted, merged ``[start, end]`` intervals of
+new-file line numbers. Executed and missing lines from a coverage.py JSON
+report (``coverage json`` / ``pytest --cov-report=json``) are compressed
+into the same form, and the two are intersected with a linear two-pointer
+merge, so cost grows with the number of ranges rather than the number of
+lines. Changed lines that coverage does not consider executable (blank,
+comments, docstrings) are ignored.
+
+Usage:
+  git diff -U0 origin/main...HEAD | python scripts/diff_coverage.py --coverage coverage.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Interval = Tuple[int, int]  # inclusive line range
+
+LINE_COVERAGE_SOURCES = (Path("coverage.json"), Path("eval-results/line-coverage.json"))
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+HUNK_SIZES = re.compile(r"^@@ -\d+(?:,(\d+))? \+\d+(?:,(\d+))? @@")
+
+
+def compress(lines: Iterable[int]) -> List[Interval]:
+    """Sorted line numbers → maximal runs of consecutive lines."""
+
+    intervals: List[Interval] = []
+    for line in lines:
+        if intervals and line <= intervals[-1][1] + 1:
+            if line > intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], line)
+        else:
+            intervals.append((line, line))
+    return intervals
+
+
+def merge(intervals: Iterable[Interval]) -> List[Interval]:
+    """Union of possibly overlapping or adjacent intervals, sorted."""
+
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect(a: Sequence[Interval], b: Sequence[Interval]) -> List[Interval]:
+    """Intersection of two sorted, disjoint interval lists in O(len(a) + len(b))."""
+
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start <= end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def size(intervals: Iterable[Interval]) -> int:
+    return sum(end - start + 1 for start, end in intervals)
+
+
+def hunk_intervals(patch: Optional[str]) -> List[Interval]:
+    """New-file line ranges added or modified by a unified diff of one file."""
+
+    runs: List[Interval] = []
+    line = 0
+    in_hunk = False
+    for text in (patch or "").splitlines():
+        match = HUNK.match(text)
+        if match:
+            line = int(match.group(1))
+            in_hunk = True
+            continue
+        if not in_hunk or text.startswith("\\"):  # "\ No newline at end of file"
+            continue
+        if text.startswith("+"):
+            if runs and runs[-1][1] == line - 1:
+                runs[-1] = (runs[-1][0], line)
+            else:
+                runs.append((line, line))
+            line += 1
+        elif not text.startswith("-"):
+            line += 1
+    return runs
+
+
+def split_patches(diff: Iterable[str]) -> Dict[str, str]:
+    """Multi-file ``git diff`` output → new path → that file's hunks.
+
+    Hunk bodies are consumed by the line counts in their ``@@`` header, so
+    an added line reading ``++ x`` (``+++ x`` in the diff) is never taken
+    for a file header.
+    """
+
+    patches: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    old_left = new_left = 0
+    for text in diff:
+        if old_left > 0 or new_left > 0:
+            if text.startswith("-"):
+                old_left -= 1
+            elif text.startswith("+"):
+                new_left -= 1
+            elif not text.startswith("\\"):
+                old_left, new_left = old_left - 1, new_left - 1
+            if current is not None:
+                current.append(text if text.endswith("\n") else text + "\n")
+            continue
+        sizes = HUNK_SIZES.match(text)
+        if sizes:
+            old_left, new_left = (int(n) if n is not None else 1 for n in sizes.groups())
+        if text.startswith("diff --git "):
+            current = None
+        elif text.startswith("+++ "):
+            target = text[4:].rstrip("\n").rstrip("\t")  # git appends a tab to paths with spaces
+            current = None if target == "/dev/null" else patches.setdefault(target[2:] if target.startswith("b/") else target, [])
+        elif current is not None and (text.startswith("@@") or current):
+            current.append(text if text.endswith("\n") else text + "\n")
+    return {path: "".join(lines).rstrip("\n") for path, lines in patches.items()}
+
+
+class LineCoverage:
+    """Executed/missing intervals per file from a coverage.py JSON report."""
+
+    def __init__(self, files: Dict[str, Tuple[List[Interval], List[Interval]]], source: str = "") -> None:
+        self.files = files
+        self.source = source
+
+    @classmethod
+    def from_json(cls, data: dict, source: str = "") -> "LineCoverage":
+        files = {}
+        for path, entry in (data.get("files") or {}).items():
+            executed = compress(sorted(entry.get("executed_lines") or []))
+            missing = compress(sorted(entry.get("missing_lines") or []))
+            files[Path(path).as_posix()] = (executed, missing)
+        return cls(files, source)
+
+    @classmethod
+    def load(cls, candidates: Sequence[Path] = LINE_COVERAGE_SOURCES) -> Optional["LineCoverage"]:
+        """First readable coverage.py report among ``candidates``, or None."""
+
+        for path in candidates:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and isinstance(data.get("files"), dict):
+                return cls.from_json(data, path.as_posix())
+        return None
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.files
+
+    def file_report(self, path: str, changed: Sequence[Interval]) -> Optional[dict]:
+        entry = self.files.get(path)
+        if entry is None or not changed:
+            return None
+        executed, missing = entry
+        covered = size(intersect(changed, executed))
+        uncovered_ranges = intersect(changed, missing)
+        uncovered = size(uncovered_ranges)
+        if not covered and not uncovered:
+            return None
+        return {"path": path, "covered": covered, "uncovered": uncovered, "uncovered_ranges": uncovered_ranges}
+
+
+def diff_coverage(changed: Iterable[dict], coverage: LineCoverage) -> dict:
+    """Per-file and total covered/uncovered counts for the changed, executable lines."""
+
+    files = []
+    for item in changed:
+        path = item["filename"]
+        if path not in coverage or item.get("status") == "removed":
+            continue
+        report = coverage.file_report(path, merge(hunk_intervals(item.get("patch"))))
+        if report:
+            files.append(report)
+    covered = sum(f["covered"] for f in files)
+    uncovered = sum(f["uncovered"] for f in files)
+    total = covered + uncovered
+    return {
+        "source": coverage.source,
+        "covered": covered,
+        "uncovered": uncovered,
+        "pct": covered / total * 100 if total else None,
+        "files": sorted(files, key=lambda f: (-f["uncovered"], f["path"])),
+    }
+
+
+def format_ranges(intervals: Sequence[Interval], limit: int = 8) -> str:
+    parts = [str(a) if a == b else f"{a}-{b}" for a, b in intervals[:limit]]
+    if len(intervals) > limit:
+        parts.append("…")
+    return ", ".join(parts)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Coverage of changed lines from a unified diff on stdin")
+    parser.add_argument("--coverage", type=Path, help="coverage.py JSON report (default: coverage.json)")
+    args = parser.parse_args(argv)
+
+    coverage = LineCoverage.load([args.coverage] if args.coverage else LINE_COVERAGE_SOURCES)
+    if coverage is None:
+        print("[diff-coverage] no coverage.py JSON report found", file=sys.stderr)
+        return 1
+    patches = split_patches(sys.stdin)
+    report = diff_coverage(({"filename": p, "patch": patch} for p, patch in patches.items()), coverage)
+    for f in report["files"]:
+        print(f"{f['path']}: {f['covered']}/{f['covered'] + f['uncovered']} changed lines covered"
+              + (f"; uncovered {format_ranges(f['uncovered_ranges'])}" if f["uncovered"] else ""))
+    if report["pct"] is None:
+        print("[diff-coverage] no executable changed lines")
+    else:
+        print(f"[diff-coverage] {report['pct']:.1f}% ({report['covered']}/{report['covered'] + report['uncovered']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
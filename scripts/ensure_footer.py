@@ -2,44 +2,61 @@
 """
 Ensure standard footer is present across docs/*.md files.
 Idempotent (won't duplicate). Skips digests.
+
+Usage:
+  python scripts/ensure_footer.py [--changed-only] [--since GIT_REF]
 """
-import os
+import argparse
 import sys
-from glob import glob
+
+from file_inventory import glob as inventory_glob
+from fix_manifest import FixManifest, add_incremental_args, select
 
 
 FOOTER = "\n— VaultMesh · Earth's Civilization Ledger —\n© Vault Sovereign · https://vaultmesh.example/\n"
 
 
-def ensure_footer(path):
+def ensure_footer(path, manifest=None):
     """Add footer to file if not present. Returns True if modified."""
     with open(path, 'r', encoding='utf-8') as f:
         content = f.read()
     
     # Check if footer already exists
     if 'VaultMesh · Earth\'s Civilization Ledger' in content:
+        if manifest is not None:
+            manifest.record(path, content)
         return False
     
     # Add footer
     with open(path, 'a', encoding='utf-8') as f:
         f.write(FOOTER)
     
+    if manifest is not None:
+        manifest.record(path, content + FOOTER)
     return True
 
 
 def main():
     """Ensure footer across all documentation files."""
+    parser = argparse.ArgumentParser(description="Ensure the standard footer in docs")
+    parser.add_argument('--write', action='store_true',
+                        help="Write changes (default behaviour; accepted for Makefile.vm)")
+    add_incremental_args(parser)
+    args = parser.parse_args()
+
     # Find all markdown files in docs (excluding digests)
-    files = sorted([
-        path for path in glob('docs/**/*.md', recursive=True) 
-        if '/digests/' not in path
-    ])
+    manifest = FixManifest('ensure_footer')
+    files = [
+        str(path) for path in select(inventory_glob('docs/**/*.md'), args, manifest)
+        if '/digests/' not in path.as_posix()
+    ]
     
     changed_count = 0
     for filepath in files:
-        if ensure_footer(filepath):
+        if ensure_footer(filepath, manifest):
             changed_count += 1
     
+    manifest.save()
     print(f"Footer ensured in {changed_count} files.")
     return 0
 
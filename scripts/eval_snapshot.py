@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Normalized quality-metrics snapshot for PR summaries and HTML reports.
+
+Coverage, adversarial, ROE compliance and JUnit results are parsed once into
+``eval-results/snapshot.json``. The snapshot records every input file with
+its sha256 (plus size/mtime, so unchanged files are not re-hashed), and is
+rebuilt only when the set of inputs or one of their hashes changes.
+
+Consumers call :func:`load_snapshot` and read the normalized sections:
+
+- ``coverage``: ``{"source", "pct"}``
+- ``adversarial``: ``{"source", "status", "passed", "failed", "total", "findings", "warnings"}``
+- ``roe``: ``{"source", "status", "lab_only", "compliant", "issues", "warnings"}``
+- ``junit``: ``{"source", "tests", "passed", "failures", "errors", "skipped", "time",
+  "suites", "slowest", "failure_details"}`` (see junit_reader.py)
+
+A section is ``None`` when its input is missing, or ``{"source", "error"}``
+when it cannot be parsed.
+
+Used by pr_summary.py and generate_html_reports.py.
+
+Usage:
+  python scripts/eval_snapshot.py [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from file_inventory import glob as inventory_glob
+from junit_reader import read_junit
+
+EVAL_RESULTS_DIR = Path("eval-results")
+SNAPSHOT_NAME = "snapshot.json"
+SNAPSHOT_VERSION = 2
+COVERAGE_SOURCES = ("coverage-results.json", "coverage.json")
+
+
+def _number(value: Any) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _ratio_pct(value: float) -> float:
+    return value * 100 if value <= 1.0 else value
+
+
+def discover(root: Path = Path(".")) -> Dict[str, Optional[Path]]:
+    """Input file per section (first match wins, as the old per-consumer parsers did)."""
+
+    results = root / EVAL_RESULTS_DIR
+    coverage = next((results / name for name in COVERAGE_SOURCES if (results / name).exists()), None)
+    adversarial = sorted(results.glob("adversarial*.json"))
+    roe = sorted(results.glob("roe*.json"))
+    junit = [path for path in inventory_glob("**/junit*.xml", root=root) if path.is_file()]
+    return {
+        "coverage": coverage,
+        "adversarial": adversarial[0] if adversarial else None,
+        "roe": roe[0] if roe else None,
+        "junit": junit[0] if junit else None,
+    }
+
+
+def parse_coverage(path: Path) -> Dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    pct: Optional[float] = None
+    if isinstance(data, dict):
+        total = data.get("total") or {}
+        lines = total.get("lines") if isinstance(total, dict) else {}
+        if isinstance(lines, dict):
+            pct = _number(lines.get("pct"))
+        for key in ("coverage", "line_rate"):
+            if pct is None and _number(data.get(key)) is not None:
+                pct = _ratio_pct(float(data[key]))
+        summary = data.get("summary")
+        if pct is None and isinstance(summary, dict):
+            pct = _number(summary.get("coverage_percentage"))
+    elif _number(data) is not None:
+        pct = _ratio_pct(float(data))
+    return {"pct": pct}
+
+
+def parse_adversarial(path: Path) -> Dict[str, Any]:
+    """Counts from ``passed``/``failed``/``total``, or for the scanner's
+    ``"passed": true`` form, prompts scanned with findings counted as failures."""
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    summary = data.get("summary") if isinstance(data.get("summary"), dict) else {}
+    findings = int(_number(summary.get("findings_count")) or len(data.get("findings") or []))
+    warnings = int(_number(summary.get("warnings_count")) or len(data.get("warnings") or []))
+    passed, failed = data.get("passed"), data.get("failed")
+    if isinstance(passed, bool) or passed is None:
+        total = int(_number(data.get("total")) or _number(summary.get("total_prompts")) or 0)
+        failed = min(findings, total) if total else findings
+        passed = total - failed
+    else:
+        passed = int(_number(passed) or _number(data.get("ok")) or 0)
+        failed = int(_number(failed) or _number(data.get("errors")) or 0)
+        total = int(_number(data.get("total")) or passed + failed)
+    status = data.get("status") or ("passed" if not failed else "failed")
+    return {"status": status, "passed": passed, "failed": failed, "total": total,
+            "findings": findings, "warnings": warnings}
+
+
+def parse_roe(path: Path) -> Dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    summary = data.get("summary") if isinstance(data.get("summary"), dict) else {}
+    issues = data.get("issues") if isinstance(data.get("issues"), list) else []
+    warnings = data.get("warnings") if isinstance(data.get("warnings"), list) else []
+    return {
+        "status": data.get("status") or ("passed" if data.get("passed") else "failed"),
+        "lab_only": int(_number(summary.get("lab_only_prompts")) or 0),
+        "compliant": int(_number(summary.get("roe_compliant")) or 0),
+        "issues": int(_number(summary.get("compliance_issues")) or len(issues)),
+        "warnings": int(_number(summary.get("warnings")) or len(warnings)),
+    }
+
+
+PARSERS = {
+    "coverage": parse_coverage,
+    "adversarial": parse_adversarial,
+    "roe": parse_roe,
+    "junit": read_junit,
+}
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint(inputs: Dict[str, Optional[Path]], previous: Dict[str, dict]) -> Dict[str, dict]:
+    """``{section: {"path", "sha256", "size", "mtime_ns"}}``; hashes reused while stat is unchanged."""
+
+    result: Dict[str, dict] = {}
+    for section, path in inputs.items():
+        if path is None:
+            continue
+        st = path.stat()
+        old = previous.get(section) or {}
+        if old.get("path") == path.as_posix() and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+            digest = old["sha256"]
+        else:
+            digest = sha256_file(path)
+        result[section] = {"path": path.as_posix(), "sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return result
+
+
+def _hashes(inputs: Dict[str, dict]) -> Dict[str, tuple]:
+    return {section: (entry["path"], entry["sha256"]) for section, entry in inputs.items()}
+
+
+def build_snapshot(inputs: Dict[str, Optional[Path]], fingerprints: Dict[str, dict]) -> dict:
+    snapshot: Dict[str, Any] = {"version": SNAPSHOT_VERSION, "inputs": fingerprints}
+    for section, parse in PARSERS.items():
+        path = inputs.get(section)
+        if path is None:
+            snapshot[section] = None
+            continue
+        try:
+            snapshot[section] = dict(parse(path), source=path.as_posix())
+        except Exception as exc:  # noqa: BLE001 - report, never abort the consumers
+            snapshot[section] = {"source": path.as_posix(), "error": str(exc)}
+    return snapshot
+
+
+def load_snapshot(root: Path = Path("."), *, force: bool = False, write: bool = True) -> dict:
+    """Current snapshot, rebuilt only when an input was added, removed or changed."""
+
+    path = root / EVAL_RESULTS_DIR / SNAPSHOT_NAME
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = {}
+    if not isinstance(cached, dict) or cached.get("version") != SNAPSHOT_VERSION:
+        cached = {}
+
+    inputs = discover(root)
+    fingerprints = fingerprint(inputs, cached.get("inputs") or {})
+    if not force and cached and _hashes(cached.get("inputs") or {}) == _hashes(fingerprints):
+        if cached["inputs"] != fingerprints and write:  # touched but identical: refresh stat keys
+            cached["inputs"] = fingerprints
+            _write(path, cached)
+        return cached
+
+    snapshot = build_snapshot(inputs, fingerprints)
+    if write:
+        _write(path, snapshot)
+    return snapshot
+
+
+def _write(path: Path, snapshot: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def describe(snapshot: dict) -> List[str]:
+    lines = []
+    for section in PARSERS:
+        value = snapshot.get(section)
+        if value is None:
+            lines.append(f"{section}: missing")
+        elif "error" in value:
+            lines.append(f"{section}: ERROR {value['error']} ({value['source']})")
+        else:
+            fields = ", ".join(f"{k}={v}" for k, v in sorted(value.items()) if k != "source" and not isinstance(v, list))
+            lines.append(f"{section}: {fields} ({value['source']})")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the normalized eval-results snapshot")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no input changed")
+    args = parser.parse_args(argv)
+    snapshot = load_snapshot(force=args.force)
+    for line in describe(snapshot):
+        print(f"[snapshot] {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
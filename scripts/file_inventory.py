@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Shared per-process file inventory for VaultMesh scripts.
+
+Paths come from a single ``git ls-files`` call (tracked + untracked, honouring
+``.gitignore``); outside a git checkout we fall back to an ``os.scandir`` walk
+that never descends into ignored trees. Results are cached per root so every
+pattern query after the first is an in-memory filter.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+IGNORE_DIRS = frozenset(
+    {
+        ".git",
+        ".obsidian",
+        ".cache",
+        "node_modules",
+        "__pycache__",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".ruff_cache",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+    }
+)
+
+
+def _git_paths(root: Path) -> Optional[List[str]]:
+    """Return repo-relative paths from the git index, or None outside git."""
+
+    def ls_files(*flags: str) -> Optional[List[str]]:
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", *flags],
+                cwd=root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return [p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+    listed = ls_files("--cached", "--others", "--exclude-standard")
+    if listed is None:
+        return None
+    deleted = set(ls_files("--deleted") or ())
+    seen: set[str] = set()
+    paths: List[str] = []
+    for path in listed:
+        if path in deleted or path in seen:
+            continue
+        seen.add(path)
+        paths.append(path)
+    return paths
+
+
+def _walk_paths(root: Path, ignore_dirs: frozenset[str]) -> List[str]:
+    """Fallback enumeration that prunes ignored directories before descending."""
+
+    paths: List[str] = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(root / rel_dir if rel_dir else root))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        stack.append(rel)
+                elif entry.is_file():
+                    paths.append(rel)
+            except OSError:
+                continue
+    return paths
+
+
+@lru_cache(maxsize=256)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a path glob (``*``, ``?``, ``**``) into an anchored regex."""
+
+    out: List[str] = []
+    i = 0
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+class FileInventory:
+    """Immutable snapshot of the files under ``root``."""
+
+    def __init__(self, root: Path, paths: Sequence[str], source: str) -> None:
+        self.root = root
+        self.source = source
+        self._paths: Tuple[str, ...] = tuple(sorted(paths))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return self._paths
+
+    def _wrap(self, rel: str) -> Path:
+        return Path(rel) if self.root == Path(".") else self.root / rel
+
+    def glob(self, *patterns: str) -> List[Path]:
+        """Return files matching any of the glob ``patterns`` (sorted, de-duplicated)."""
+
+        regexes = [_glob_regex(p) for p in patterns]
+        return [self._wrap(rel) for rel in self._paths if any(rx.match(rel) for rx in regexes)]
+
+    def under(self, prefix: str = "", suffixes: Optional[Iterable[str]] = None) -> List[Path]:
+        """Return files below directory ``prefix`` with a (case-insensitive) suffix filter."""
+
+        prefix = prefix.strip("/")
+        if prefix in ("", "."):
+            prefix = ""
+        lead = f"{prefix}/" if prefix else ""
+        wanted = tuple(s.lower() for s in suffixes) if suffixes else None
+        matches: List[Path] = []
+        for rel in self._paths:
+            if lead and not rel.startswith(lead):
+                continue
+            if wanted and not rel.lower().endswith(wanted):
+                continue
+            matches.append(self._wrap(rel))
+        return matches
+
+
+@lru_cache(maxsize=None)
+def _load(root_key: str, ignore_dirs: frozenset[str]) -> FileInventory:
+    root = Path(root_key)
+    git_paths = _git_paths(root)
+    if git_paths is not None:
+        kept = [p for p in git_paths if not ignore_dirs.intersection(p.split("/")[:-1])]
+        return FileInventory(root, kept, "git")
+    return FileInventory(root, _walk_paths(root, ignore_dirs), "walk")
+
+
+def inventory(root: Path | str = ".", ignore_dirs: Iterable[str] = IGNORE_DIRS) -> FileInventory:
+    """Return the cached inventory for ``root`` (enumerated once per process)."""
+
+    root_path = Path(root)
+    root_key = "." if root_path == Path(".") else str(root_path)
+    return _load(root_key, frozenset(ignore_dirs))
+
+
+def glob(*patterns: str, root: Path | str = ".") -> List[Path]:
+    """Shorthand for ``inventory(root).glob(*patterns)``."""
+
+    return inventory(root).glob(*patterns)
+
+
+def refresh() -> None:
+    """Drop cached inventories (for long-running processes and tests)."""
+
+    _load.cache_clear()
+
+
+def main(argv: List[str]) -> int:
+    patterns = argv[1:] or ["**"]
+    inv = inventory()
+    for path in inv.glob(*patterns):
+        print(path.as_posix())
+    print(f"[inventory] {len(inv)} files via {inv.source}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
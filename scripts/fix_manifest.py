@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Per-script manifests that let markdown fixers skip unchanged files.
+
+Each fixer records ``(size, mtime_ns, sha256 of its output)`` for every file it
+has processed under ``.cache/manifests/<script>.json``. With ``--changed-only``
+a file whose size and mtime still match is skipped without being read, and
+``--since <git-ref>`` narrows the candidate set to files in the git diff.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+MANIFEST_DIR = Path(".cache/manifests")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FixManifest:
+    """Fingerprints of files as last written (or verified) by one script."""
+
+    def __init__(self, name: str, directory: Path = MANIFEST_DIR) -> None:
+        self.path = directory / f"{name}.json"
+        self.entries: dict[str, list] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                self.entries = data
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def is_current(self, path: Path | str) -> bool:
+        """True when ``path`` still has the size/mtime recorded after the last run."""
+
+        entry = self.entries.get(Path(path).as_posix())
+        if not entry:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry[0] == st.st_size and entry[1] == st.st_mtime_ns
+
+    def output_hash(self, path: Path | str) -> Optional[str]:
+        entry = self.entries.get(Path(path).as_posix())
+        return entry[2] if entry else None
+
+    def record(self, path: Path | str, text: str) -> None:
+        """Remember ``path`` as holding ``text`` (call after any write)."""
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self.entries[Path(path).as_posix()] = [st.st_size, st.st_mtime_ns, content_hash(text)]
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def changed_since(ref: str) -> Set[str]:
+    """Repo-relative paths changed between ``ref`` and the working tree (plus untracked)."""
+
+    paths: Set[str] = set()
+    for cmd in (
+        ["git", "diff", "--name-only", "-z", ref, "--"],
+        ["git", "ls-files", "-z", "--others", "--exclude-standard"],
+    ):
+        try:
+            out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise SystemExit(f"[manifest] unable to diff against {ref}: {exc}") from exc
+        paths.update(p for p in out.decode("utf-8", "surrogateescape").split("\0") if p)
+    return paths
+
+
+def add_incremental_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Skip files unchanged since the last run (size/mtime manifest)",
+    )
+    parser.add_argument("--since", metavar="GIT_REF", help="Only consider files changed since GIT_REF")
+
+
+def select(paths: Iterable[Path], args: argparse.Namespace, manifest: FixManifest) -> List[Path]:
+    """Filter candidate ``paths`` according to ``--since`` / ``--changed-only``."""
+
+    selected = list(paths)
+    if getattr(args, "since", None):
+        diff = changed_since(args.since)
+        selected = [p for p in selected if Path(p).as_posix() in diff]
+    if getattr(args, "changed_only", False):
+        selected = [p for p in selected if not manifest.is_current(p)]
+    return selected
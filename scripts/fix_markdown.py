@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
-"""Auto-fix common markdown lint issues: bare URLs and unlabeled fences."""
+"""Auto-fix common markdown lint issues: bare URLs and unlabeled fences.
 
+Usage:
+  python scripts/fix_markdown.py [--changed-only] [--since GIT_REF]
+"""
+
+import argparse
 import re
 import sys
 from pathlib import Path
 
+from file_inventory import glob as inventory_glob
+from fix_manifest import FixManifest, add_incremental_args, select
+
 DOCS = Path("docs")
 
 def fix_bare_urls(text: str) -> str:
@@ -22,12 +30,17 @@ def fix_unlabeled_fences(text: str) -> str:
 
 def main():
     """Process all markdown files in docs directory."""
+    parser = argparse.ArgumentParser(description="Auto-fix bare URLs and unlabeled fences")
+    add_incremental_args(parser)
+    args = parser.parse_args()
+
     if not DOCS.exists():
         print("[fix_markdown] docs directory not found")
         return 1
     
+    manifest = FixManifest("fix_markdown")
     fixed = 0
-    for path in DOCS.rglob("*.md"):
+    for path in select(inventory_glob(f"{DOCS.as_posix()}/**/*.md"), args, manifest):
         try:
             original_text = path.read_text(encoding="utf-8")
             fixed_text = original_text
@@ -41,10 +54,12 @@ def main():
                 path.write_text(fixed_text, encoding="utf-8")
                 fixed += 1
                 print(f"[fix_markdown] fixed {path}")
+            manifest.record(path, fixed_text)
                 
         except Exception as e:
             print(f"[fix_markdown] error processing {path}: {e}", file=sys.stderr)
     
+    manifest.save()
     print(f"[fix_markdown] updated {fixed} file(s)")
     return 0
 
@@ -1,62 +1,113 @@
 #!/usr/bin/env python3
-"""Fix MD036: Convert emphasis-as-headings to proper markdown headings."""
+"""Fix MD036: Convert emphasis-as-headings to proper markdown headings.
 
+Usage:
+  python scripts/fix_md_headings.py [--changed-only] [--since GIT_REF]
+"""
+
+import argparse
 import re
 import sys
 from pathlib import Path
 
+from file_inventory import glob as inventory_glob
+from fix_manifest import FixManifest, add_incremental_args, select
+
 DOCS = Path("docs")
 
-# Patterns for emphasis that should be headings
-H1 = re.compile(r"^\s*(\*\*|__|_)([^*_].+?)\1\s*$")
-H2 = re.compile(r"^\s*(#+)?\s*(\*\*|__|_)([^*_].+?)\2\s*$")
+# Emphasis-only line, optionally already prefixed with #'s: "**Title**", "## _Title_"
+EMPHASIS_LINE = re.compile(r"(?:#+\s*)?(\*\*|__|_)([^*_].+?)\1")
+FENCE_PREFIXES = ("```", "~~~")
+
+
+def heading_title(stripped):
+    """Return the heading text if ``stripped`` is an emphasis-only line, else None."""
+    # Cheap first/last character test keeps the regex off ordinary prose lines
+    if not stripped or stripped[0] not in "*_#" or stripped[-1] not in "*_":
+        return None
+    match = EMPHASIS_LINE.fullmatch(stripped)
+    if not match:
+        return None
+    return match.group(2).strip("*_ ").strip() or None
+
+
+def normalize_lines(lines):
+    """Stream ``lines`` and yield them with emphasis-as-headings converted.
+
+    Single pass with a one-line lookahead window: the first content line
+    becomes an H1, later emphasis-only lines flanked by blank lines become H2.
+    Lines inside fenced code blocks are never rewritten.
+    """
+    it = iter(lines)
+    current = next(it, None)
+    if current is None:
+        return
+    prev_blank = None  # None marks "no previous line" (first line of the file)
+    seen_content = False
+    in_fence = False
+
+    while current is not None:
+        following = next(it, None)
+        stripped = current.strip()
+        out = current
+
+        if stripped.startswith(FENCE_PREFIXES):
+            in_fence = not in_fence
+        elif stripped and not in_fence:
+            title = heading_title(stripped)
+            if title:
+                if not seen_content:
+                    out = f"# {title}"
+                elif prev_blank and following is not None and not following.strip():
+                    out = f"## {title}"
+
+        if stripped:
+            seen_content = True
+        prev_blank = not stripped
+        yield out
+        current = following
+
+
+def normalize(text):
+    """Return ``text`` with emphasis-as-headings converted (unchanged text is returned as-is)."""
+    lines = text.splitlines()
+    out = list(normalize_lines(lines))
+    if out == lines:
+        return text
+    result = "\n".join(out)
+    return result + "\n" if text.endswith("\n") else result
+
 
 def main():
     """Process all markdown files to fix emphasis-as-headings."""
+    parser = argparse.ArgumentParser(description="Convert emphasis-as-headings to headings")
+    add_incremental_args(parser)
+    args = parser.parse_args()
+
     if not DOCS.exists():
         print("[fix_md_headings] docs directory not found")
         return 1
     
+    manifest = FixManifest("fix_md_headings")
     updated = 0
     
-    for path in DOCS.rglob("*.md"):
+    for path in select(inventory_glob(f"{DOCS.as_posix()}/**/*.md"), args, manifest):
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
-            out = []
-            
-            for i, line in enumerate(lines):
-                stripped = line.strip()
-                
-                # If it's the very first non-empty line → H1
-                if stripped and (not any(l.strip() for l in lines[:i])):
-                    match = H1.match(stripped) or H2.match(stripped)
-                    if match:
-                        title = (match.group(2) if match.lastindex == 3 else match.group(1)).strip("*_ ").strip()
-                        out.append(f"# {title}")
-                        continue
-                
-                # Otherwise convert emphasized line flanked by blanks into H2
-                if i > 0 and i < len(lines) - 1:
-                    if not lines[i-1].strip() and not lines[i+1].strip():
-                        match = H1.match(stripped) or H2.match(stripped)
-                        if match:
-                            title = (match.group(2) if match.lastindex == 3 else match.group(1)).strip("*_ ").strip()
-                            out.append(f"## {title}")
-                            continue
-                
-                out.append(line)
-            
-            new_content = "\n".join(out)
-            original_content = "\n".join(lines)
+            text = path.read_text(encoding="utf-8")
+            new_content = normalize(text)
             
-            if new_content != original_content:
+            if new_content != text:
                 path.write_text(new_content, encoding="utf-8")
                 updated += 1
                 print(f"[fix_md_headings] fixed {path}")
+                manifest.record(path, new_content)
+            else:
+                manifest.record(path, text)
                 
         except Exception as e:
             print(f"[fix_md_headings] error processing {path}: {e}", file=sys.stderr)
     
+    manifest.save()
     print(f"[fix_md_headings] updated {updated} file(s)")
     return 0
 
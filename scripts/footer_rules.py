@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Footer rules shared by the footer gate and the docs catalog."""
+
+from __future__ import annotations
+
+import re
+
+REQUIRED_FOOTER = (
+    "— VaultMesh · Earth’s Civilization Ledger —\n"
+    "© Vault Sovereign · https://vaultmesh.example/\n"
+)
+
+FOOTER_LINE_RE = re.compile(r"^— VaultMesh · Earth’s Civilization Ledger —$", re.M)
+LINK_RE = re.compile(r"https?://", re.I)
+
+
+def has_required_footer(text: str) -> bool:
+    return bool(FOOTER_LINE_RE.search(text))
+
+
+def tail_has_link(text: str, tail_lines: int = 20) -> bool:
+    lines = text.splitlines()[-tail_lines:]
+    return any(LINK_RE.search(line) for line in lines)
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
-"""Generate HTML reports for coverage, adversarial, and JUnit results."""
+"""Generate HTML reports for coverage, adversarial, and JUnit results.
+
+Metrics come from the normalized eval-results/snapshot.json (scripts/eval_snapshot.py).
+"""
 
-import json
 import sys
-import xml.etree.ElementTree as ET
+from html import escape
 from pathlib import Path
 
+from eval_snapshot import load_snapshot
+
 
 def generate_coverage_html():
     """Generate coverage HTML report."""
@@ -26,36 +30,9 @@ def generate_coverage_html():
             print(f"[reports] copied {source}")
             return
     
-    # Fallback: generate minimal HTML from JSON
-    data = {}
-    json_sources = [
-        "eval-results/coverage-results.json",
-        "eval-results/coverage.json"
-    ]
-    
-    for source in json_sources:
-        path = Path(source)
-        if path.exists():
-            try:
-                data = json.loads(path.read_text())
-                break
-            except Exception:
-                continue
-    
-    pct = None
-    if isinstance(data, dict):
-        total = data.get("total") or {}
-        lines = total.get("lines") if isinstance(total, dict) else {}
-        if isinstance(lines, dict) and isinstance(lines.get("pct"), (int, float)):
-            pct = float(lines["pct"])
-        elif isinstance(data.get("coverage"), (int, float)):
-            val = float(data["coverage"])
-            pct = val * 100 if val <= 1.0 else val
-        elif isinstance(data.get("line_rate"), (int, float)):
-            val = float(data["line_rate"])
-            pct = val * 100 if val <= 1.0 else val
-    elif isinstance(data, (int, float)):
-        pct = float(data) * 100 if data <= 1.0 else float(data)
+    # Fallback: generate minimal HTML from the normalized snapshot
+    coverage = load_snapshot().get("coverage") or {}
+    pct = coverage.get("pct")
     
     html = f"""<!doctype html>
 <html><head>
@@ -81,21 +58,14 @@ def generate_adversarial_html():
     reports_dir.mkdir(parents=True, exist_ok=True)
     
     summary = None
-    for path in sorted(Path("eval-results").glob("adversarial*.json")):
-        try:
-            data = json.loads(path.read_text())
-            passed = data.get("passed") or data.get("ok") or 0
-            failed = data.get("failed") or data.get("errors") or 0
-            total = data.get("total") or (passed + failed)
-            summary = {
-                "file": str(path),
-                "passed": passed,
-                "failed": failed,
-                "total": total
-            }
-            break
-        except Exception:
-            continue
+    adversarial = load_snapshot().get("adversarial")
+    if adversarial and "error" not in adversarial:
+        summary = {
+            "file": adversarial["source"],
+            "passed": adversarial["passed"],
+            "failed": adversarial["failed"],
+            "total": adversarial["total"]
+        }
     
     html = """<!doctype html>
 <html><head>
@@ -128,28 +98,45 @@ body { font-family: system-ui, sans-serif; margin: 2rem; }
     print("[reports] adversarial HTML written")
 
 
+def junit_tables(junit):
+    """Per-suite, slowest-test and failure tables for the JUnit report."""
+    parts = []
+    suites = junit.get("suites") or []
+    if suites:
+        rows = "".join(
+            f"<tr><td>{escape(s['name'])}</td><td>{s['tests']}</td><td>{s['failures']}</td>"
+            f"<td>{s['errors']}</td><td>{s['skipped']}</td><td>{s['time']:.3f}s</td></tr>"
+            for s in suites
+        )
+        parts.append("<h2>Suites</h2>\n<table><tr><th>Suite</th><th>Tests</th><th>Failures</th>"
+                     f"<th>Errors</th><th>Skipped</th><th>Time</th></tr>{rows}</table>")
+    slowest = junit.get("slowest") or []
+    if slowest:
+        rows = "".join(f"<tr><td><code>{escape(t['id'])}</code></td><td>{t['time']:.3f}s</td></tr>" for t in slowest)
+        parts.append(f"<h2>Slowest tests</h2>\n<table><tr><th>Test</th><th>Time</th></tr>{rows}</table>")
+    failures = junit.get("failure_details") or []
+    if failures:
+        rows = "".join(
+            f"<tr><td><code>{escape(f['id'])}</code></td><td class=\"failed\">{f['kind']}</td>"
+            f"<td><pre>{escape(f['message'])}</pre></td></tr>"
+            for f in failures
+        )
+        parts.append(f"<h2>Failures</h2>\n<table><tr><th>Test</th><th>Kind</th><th>Message</th></tr>{rows}</table>")
+    return "\n".join(parts)
+
+
 def generate_junit_html():
     """Generate JUnit results HTML report."""
     reports_dir = Path("reports-html/junit")
     reports_dir.mkdir(parents=True, exist_ok=True)
     
-    junit_path = Path("junit.xml")
-    if junit_path.exists():
-        try:
-            root = ET.parse(junit_path).getroot()
-            suites = list(root) if root.tag == "testsuites" else [root]
-            
-            tests = failures = errors = skipped = 0
-            for suite in suites:
-                tests += int(suite.attrib.get("tests", 0) or 0)
-                failures += int(suite.attrib.get("failures", 0) or 0)
-                errors += int(suite.attrib.get("errors", 0) or 0)
-                skipped += int(suite.attrib.get("skipped", 0) or 0)
-            
-            passed = max(tests - failures - errors - skipped, 0)
-            pass_rate = (passed / tests * 100) if tests > 0 else 0
-            
-            html = f"""<!doctype html>
+    junit = load_snapshot().get("junit")
+    if junit and "error" not in junit:
+        tests, passed = junit["tests"], junit["passed"]
+        failures, errors, skipped = junit["failures"], junit["errors"], junit["skipped"]
+        pass_rate = (passed / tests * 100) if tests > 0 else 0
+        
+        html = f"""<!doctype html>
 <html><head>
 <meta charset="utf-8">
 <title>JUnit Results</title>
@@ -159,6 +146,9 @@ body {{ font-family: system-ui, sans-serif; margin: 2rem; }}
 .passed {{ color: #22c55e; }}
 .failed {{ color: #ef4444; }}
 .skipped {{ color: #f59e0b; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; }}
+th, td {{ border: 1px solid #e5e7eb; padding: 0.25rem 0.5rem; text-align: left; vertical-align: top; }}
+pre {{ margin: 0; white-space: pre-wrap; }}
 </style>
 </head><body>
 <h1>📋 JUnit Results</h1>
@@ -168,15 +158,15 @@ body {{ font-family: system-ui, sans-serif; margin: 2rem; }}
 {f', <span class="failed">{errors} errors</span>' if errors > 0 else ''}
 {f', <span class="skipped">{skipped} skipped</span>' if skipped > 0 else ''}
 </p>
-<p>Pass rate: <strong>{pass_rate:.1f}%</strong></p>
-<p><em>Source: junit.xml</em></p>
+<p>Pass rate: <strong>{pass_rate:.1f}%</strong> in {junit['time']:.2f}s</p>
+{junit_tables(junit)}
+<p><em>Source: {junit['source']}</em></p>
 </body></html>"""
-            
-        except Exception as e:
-            html = f"""<!doctype html>
+    elif junit:
+        html = f"""<!doctype html>
 <html><head><meta charset="utf-8"><title>JUnit Results</title></head><body>
 <h1>📋 JUnit Results</h1>
-<p>Error parsing junit.xml: {e}</p>
+<p>Error parsing {junit['source']}: {junit['error']}</p>
 </body></html>"""
     else:
         html = """<!doctype html>
@@ -1,117 +1,153 @@
 #!/usr/bin/env python3
 """
-Roll up signals/*.json into docs/digests/YYYY-WW.md (ISO week).
+Roll up signals into docs/digests/YYYY-WW.md (ISO week).
 - Computes counts, total weight, top signals, tag histogram
+- Reads only the week's segment (signals/segments/YYYY-WW.jsonl) plus any
+  loose signals/*.json not yet ingested (see scripts/signal_store.py)
 - Includes records whose timestamp is within the target ISO week
 - If timestamp missing, uses file mtime
 
+- Adds rolling weighted means and week-over-week trend deltas per tag and
+  scope (scripts/signal_aggregates.py, needs numpy) and, with --write, a
+  docs/digests/YYYY-WW.json aggregate artifact
+- Streams records into per-week summaries (scripts/signal_stream.py): a
+  heapq top-K plus tag counters, so memory is O(K + distinct tags) per week;
+  --sketch space-saving|count-min bounds tag state on very large weeks
+- --stats reports record counts, per-phase timings and peak RSS on stderr
+- Backfills (--from/--to, --all) load signals once and render every week in
+  one pass; digests whose rendered content is unchanged are not rewritten
+
 Usage:
   python scripts/generate_weekly_digest.py --week 2025-39 --write
+  python scripts/generate_weekly_digest.py --from 2025-27 --to 2025-39 --write
+  python scripts/generate_weekly_digest.py --all --write
 """
 import argparse
 import json
 import os
 import sys
-from glob import glob
-from datetime import datetime, timezone
-from collections import Counter
+import time
+from datetime import datetime, timedelta, timezone
+
+from signal_stream import SKETCHES, WeekSummary, summarize
+from signal_store import (
+    SegmentStore,
+    iso_year_week,
+    loose_signal_files,
+    signal_timestamp,
+)
 
 
 DIGEST_DIR = 'docs/digests'
 
 
-def iso_year_week(dt):
-    """Get ISO year-week string (YYYY-WW) from datetime."""
-    iso = dt.isocalendar()  # (year, week, weekday)
-    return f"{iso[0]}-{iso[1]:02d}"
+def history_weeks(targets, window):
+    """Target weeks plus ``window - 1`` preceding weeks each (trend history)."""
+    needed = set()
+    for label in targets:
+        monday = parse_week(label)
+        needed.update(iso_year_week(monday - timedelta(weeks=back)) for back in range(max(window, 1)))
+    return needed
 
 
-def within_week(dt, target):
-    """Check if datetime is within target ISO week."""
-    return iso_year_week(dt) == target
+def parse_week(value):
+    """Monday of ISO week ``YYYY-WW``."""
+    try:
+        year, week = value.split('-', 1)
+        return datetime.fromisocalendar(int(year), int(week), 1).date()
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid ISO week {value!r} (expected YYYY-WW)") from e
 
 
-def coerce_datetime(value, default=None):
-    """Convert string to datetime, return default if failed."""
-    if not value:
-        return default
-    
-    try:
-        # Try dateutil parser for flexible parsing
-        from dateutil import parser as date_parser
-        return date_parser.parse(value)
-    except ImportError:
-        # Fallback to basic ISO format parsing
-        try:
-            return datetime.fromisoformat(value.replace('Z', '+00:00'))
-        except Exception:
-            return default
-    except Exception:
-        return default
+def week_range(start, end):
+    """ISO week labels from ``start`` to ``end`` inclusive."""
+    day, stop = parse_week(start), parse_week(end)
+    weeks = []
+    while day <= stop:
+        weeks.append(iso_year_week(day))
+        day += timedelta(days=7)
+    return weeks
 
 
-def main():
-    """Generate weekly digest from signals."""
-    parser = argparse.ArgumentParser(description="Generate weekly signals digest")
-    parser.add_argument('--week', help='YYYY-WW, defaults to current week')
-    parser.add_argument('--write', action='store_true', help='Write to file')
-    parser.add_argument('--top', type=int, default=10, help='Number of top signals')
-    args = parser.parse_args()
+def iter_signals(weeks=None, store=None):
+    """Yield (week, record, source) for the requested weeks, one record at a time.
 
-    # Determine target week
-    now = datetime.now(timezone.utc)
-    target_week = args.week or iso_year_week(now)
-    
-    # Ensure digest directory exists
-    os.makedirs(DIGEST_DIR, exist_ok=True)
+    Segment records already belong to their partition's week; loose files
+    pay for a single timestamp parse + isocalendar each. ``weeks=None``
+    reads every partition.
+    """
+    store = store or SegmentStore()
+    wanted = None if weeks is None else set(weeks)
+    for week in (store.weeks() if wanted is None else sorted(wanted)):
+        source = store.segment_path(week)
+        for obj in store.iter_week(week):
+            if isinstance(obj, dict):
+                yield week, obj, source
 
-    # Process signal files
-    files = sorted(glob('signals/*.json'))
-    items = []
-    
-    for filepath in files:
+    for filepath in loose_signal_files():
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 obj = json.load(f)
         except Exception:
             continue
-        
-        # Get timestamp (from object or file mtime)
-        timestamp = coerce_datetime(obj.get('timestamp'), None)
-        if not timestamp:
-            mtime = os.path.getmtime(filepath)
-            timestamp = datetime.fromtimestamp(mtime, tz=timezone.utc)
-        
-        # Skip if not in target week
-        if not within_week(timestamp, target_week):
+        if not isinstance(obj, dict):
             continue
-        
-        # Extract signal data
-        weight = obj.get('weight', 1)
-        title = (obj.get('title') or 
-                obj.get('summary') or 
-                obj.get('id') or 
-                os.path.basename(filepath))
-        tags = obj.get('tags') or []
-        
-        items.append({
-            'id': obj.get('id', '(no-id)'),
-            'title': title,
-            'weight': float(weight),
-            'tags': tags
-        })
-
-    # Calculate metrics
-    count = len(items)
-    total_weight = sum(item['weight'] for item in items)
-    
-    # Get top signals by weight
-    top_signals = sorted(items, key=lambda x: (-x['weight'], x['title']))[:args.top]
-    
-    # Tag frequency analysis
-    tag_counter = Counter(tag for item in items for tag in (item['tags'] or []))
-    top_tags = tag_counter.most_common(12)
+        week = iso_year_week(signal_timestamp(obj, filepath))
+        if wanted is None or week in wanted:
+            yield week, obj, filepath
+
+
+def week_trends(summaries, week, window=8, half_life=2.0):
+    """Trend report for ``week`` from per-week summaries, or None without numpy.
+
+    Only the ``window`` weeks up to and including ``week`` contribute, so a
+    single-week run and a backfill render the same tables.
+    """
+    try:
+        from signal_aggregates import from_totals
+        from signal_columns import week_index
+    except ImportError:
+        return None
+    end = week_index(week)
+    first = end - window + 1
+    tag_totals, scope_totals = {}, {}
+    for label, summary in summaries.items():
+        index = week_index(label)
+        if first <= index <= end:
+            tag_totals[index] = (summary.tags, summary.tag_weights)
+            scope_totals[index] = (summary.scopes, summary.scope_weights)
+    return {
+        'week': week,
+        'half_life_weeks': half_life,
+        'tags': from_totals(tag_totals, first, window, half_life).for_week(week),
+        'scopes': from_totals(scope_totals, first, window, half_life).for_week(week),
+    }
+
+
+def render_trends(report, limit=12):
+    """Markdown trend tables from a signal_aggregates week report."""
+    lines = []
+    for title, rows in (("Tag Trends", report['tags']), ("Scope Trends", report['scopes'])):
+        if not rows:
+            continue
+        lines.append(f"## {title} (half-life {report['half_life_weeks']:g}w)\n")
+        lines.append("| key | signals | weight | rolling mean | Δ weight | Δ mean |")
+        lines.append("|---|---:|---:|---:|---:|---:|")
+        for row in rows[:limit]:
+            lines.append(
+                f"| {row['key']} | {row['count']} | {row['weight']:.2f} | {row['rolling_mean']:.2f} "
+                f"| {row['weight_delta']:+.2f} | {row['mean_delta']:+.2f} |"
+            )
+        lines.append("")
+    return lines
+
 
+def render_summary(target_week, count, total_weight, top_signals, top_tags, trends=None):
+    """Render the digest markdown from precomputed week totals.
+
+    ``top_signals`` must already be ordered by (-weight, title); the ingest
+    watcher (scripts/signal_watch.py) feeds this from running aggregates.
+    """
     # Build digest content
     content_lines = []
     content_lines.append(f"# Weekly Digest — {target_week}\n")
@@ -134,25 +170,150 @@ def main():
             content_lines.append(f"- {tag}: {count}")
         content_lines.append("")
 
+    if trends:
+        content_lines.extend(render_trends(trends))
+
     content_lines.append("---")
     content_lines.append("<sub>Generated by VaultMesh Signals • Solve et Coagula</sub>")
     
     # Generate final content
-    content = "\n".join(content_lines) + "\n"
-    
-    # Output or write
-    output_path = os.path.join(DIGEST_DIR, f"{target_week}.md")
-    
-    if args.write:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Wrote {output_path}")
-    else:
-        print(content)
+    return "\n".join(content_lines) + "\n"
+
+
+def write_digest(target_week, content, suffix='.md', directory=DIGEST_DIR):
+    """Write the digest unless the file already holds identical content."""
+    output_path = os.path.join(directory, f"{target_week}{suffix}")
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return output_path, False
+    except FileNotFoundError:
+        pass
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return output_path, True
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process in MiB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def print_stats(stats, weeks):
+    """--stats report (stderr, so stdout stays the digest)."""
+    total = sum(seconds for _, seconds in stats['timings'])
+    rate = stats['records'] / stats['timings'][0][1] if stats['timings'][0][1] else 0
+    print(f"[digest] {stats['records']} record(s) streamed into {stats['summaries']} week summary(ies), "
+          f"{weeks} digest(s) rendered", file=sys.stderr)
+    for phase, seconds in stats['timings']:
+        print(f"[digest]   {phase:<8} {seconds * 1000:9.1f} ms", file=sys.stderr)
+    print(f"[digest]   {'total':<8} {total * 1000:9.1f} ms ({rate:,.0f} records/s)", file=sys.stderr)
+    peak = peak_rss_mib()
+    if peak is not None:
+        print(f"[digest]   peak RSS {peak:.1f} MiB", file=sys.stderr)
+
+
+def main():
+    """Generate weekly digest(s) from signals."""
+    parser = argparse.ArgumentParser(description="Generate weekly signals digest")
+    parser.add_argument('--week', help='YYYY-WW, defaults to current week')
+    parser.add_argument('--from', dest='from_week', type=str, help='First week of a backfill (YYYY-WW)')
+    parser.add_argument('--to', dest='to_week', type=str, help='Last week of a backfill (YYYY-WW, default: current)')
+    parser.add_argument('--all', action='store_true', help='Render every week that has signals')
+    parser.add_argument('--write', action='store_true', help='Write to file')
+    parser.add_argument('--top', type=int, default=10, help='Number of top signals')
+    parser.add_argument('--half-life', type=float, default=2.0, help='Trend decay half-life in weeks')
+    parser.add_argument('--window', type=int, default=8, help='Weeks of history loaded for trends')
+    parser.add_argument('--no-trends', action='store_true', help='Skip rolling trend aggregates')
+    parser.add_argument('--sketch', choices=SKETCHES, default='exact',
+                        help='Tag counting: exact, or a bounded sketch for very large weeks')
+    parser.add_argument('--sketch-capacity', type=int, default=256, help='Counters kept per sketch')
+    parser.add_argument('--stats', action='store_true', help='Report timings and peak memory on stderr')
+    args = parser.parse_args()
+
+    # Determine target week(s)
+    now = datetime.now(timezone.utc)
+    if args.all and (args.week or args.from_week or args.to_week):
+        parser.error('--all cannot be combined with --week/--from/--to')
+    if args.week and (args.from_week or args.to_week):
+        parser.error('--week cannot be combined with --from/--to')
+    try:
+        if args.all:
+            needed = None
+        else:
+            if args.from_week or args.to_week:
+                target_weeks = week_range(args.from_week or args.to_week, args.to_week or iso_year_week(now))
+            else:
+                target_weeks = [args.week or iso_year_week(now)]
+                parse_week(target_weeks[0])
+            needed = history_weeks(target_weeks, 1 if args.no_trends else args.window)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    # Stream every needed record once into bounded per-week summaries
+    stats = {'records': 0, 'timings': []}
+    started = time.perf_counter()
+
+    def counted(records):
+        for record in records:
+            stats['records'] += 1
+            yield record
+
+    summaries = summarize(counted(iter_signals(needed)), top=args.top,
+                          sketch=args.sketch, capacity=args.sketch_capacity)
+    stats['summaries'] = len(summaries)
+    stats['timings'].append(('stream', time.perf_counter() - started))
+    if args.all:
+        target_weeks = sorted(summaries)
+
+    # Ensure digest directory exists
+    os.makedirs(DIGEST_DIR, exist_ok=True)
+
+    trend_time = render_time = write_time = 0.0
+    written = unchanged = 0
+    for target_week in target_weeks:
+        mark = time.perf_counter()
+        trends = None if args.no_trends else week_trends(summaries, target_week, args.window, args.half_life)
+        if trends is None and not args.no_trends:
+            print("⚠️ numpy not available, skipping trend aggregates", file=sys.stderr)
+            args.no_trends = True
+        summary = summaries.get(target_week) or WeekSummary(top=args.top)
+        trend_time += time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        content = render_summary(target_week, summary.count, summary.weight, summary.top_signals(),
+                                 summary.top_tags(12), trends)
+        render_time += time.perf_counter() - mark
+
+        # Output or write
+        mark = time.perf_counter()
+        if args.write:
+            if trends is not None:
+                write_digest(target_week, json.dumps(trends, indent=2) + "\n", suffix='.json')
+            output_path, changed = write_digest(target_week, content)
+            if changed:
+                written += 1
+                print(f"✅ Wrote {output_path}")
+            else:
+                unchanged += 1
+                print(f"[digest] unchanged {output_path}")
+        else:
+            print(content)
+        write_time += time.perf_counter() - mark
+
+    if args.write and len(target_weeks) > 1:
+        print(f"[digest] {len(target_weeks)} week(s): {written} written, {unchanged} unchanged")
+    if args.stats:
+        stats['timings'] += [('trends', trend_time), ('render', render_time), ('output', write_time)]
+        print_stats(stats, len(target_weeks))
     
     return 0
 
 
 if __name__ == '__main__':
     sys.exit(main())
-
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Pooled GitHub REST client with conditional requests and rate-limit backoff.
+
+One ``requests.Session`` per token keeps TLS connections alive across the
+paginated calls of a run. GET responses that carry an ``ETag`` are stored
+under ``.cache/github/`` and replayed with ``If-None-Match``; a ``304 Not
+Modified`` is served from disk and does not count against the rate limit.
+
+Failed requests are retried with exponential backoff: idempotent methods on
+connection errors and 5xx, every method when GitHub rejects the call for
+rate limiting (429, or 403 with ``X-RateLimit-Remaining: 0``). Waits follow
+``Retry-After`` / ``X-RateLimit-Reset`` and are capped by ``max_wait``. The
+last seen ``X-RateLimit-*`` values are kept, and an exhausted budget is waited
+out before the next call instead of spending a request on a 403.
+
+List endpoints are read with :meth:`GitHubClient.paginate`, which takes the
+page count from the first response's ``Link`` header and fetches the rest
+concurrently.
+
+``GITHUB_API_URL`` overrides the API root (GitHub Enterprise, or a local
+stand-in server in tests).
+
+Used by pr_summary.py and set_branch_protection.py.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
+
+API_ROOT = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+CACHE_DIR = Path(".cache/github")
+DEFAULT_TIMEOUT = 15.0
+IDEMPOTENT = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"})
+PER_PAGE = 100
+PAGE_WORKERS = 8
+
+
+class GitHubError(RuntimeError):
+    """Non-success response from the GitHub API."""
+
+    def __init__(self, status: int, text: str) -> None:
+        super().__init__(f"GitHub API error {status}: {text}")
+        self.status = status
+
+
+class ApiResponse(NamedTuple):
+    status: int
+    data: Any
+    headers: Mapping[str, str]
+    cached: bool = False
+
+
+class ETagCache:
+    """One JSON file per request key: ``{"etag", "link", "body"}``."""
+
+    def __init__(self, root: Path = CACHE_DIR) -> None:
+        self.root = root
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and entry.get("etag") else None
+
+    def put(self, key: str, etag: str, body: str, link: Optional[str]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"etag": etag, "link": link, "body": body}), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def _decode(text: str) -> Any:
+    return json.loads(text) if text else {}
+
+
+def last_page(link: Optional[str]) -> int:
+    """Page number of the ``rel="last"`` entry of a Link header (1 when absent)."""
+
+    for entry in parse_header_links(link or ""):
+        if entry.get("rel") == "last":
+            query = entry.get("url", "").partition("?")[2]
+            for pair in query.split("&"):
+                name, _, value = pair.partition("=")
+                if name == "page" and value.isdigit():
+                    return int(value)
+    return 1
+
+
+class GitHubClient:
+    """Keep-alive session for one token."""
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        api_root: str = API_ROOT,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_wait: float = 300.0,
+        pool_size: int = 8,
+        cache: Optional[ETagCache] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.api_root = api_root.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.cache = cache
+        self.sleep = sleep
+        self.rate_limit: Dict[str, int] = {}
+        self._identity = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        # Nested thread pools (PRs × pages) share one cap: never more calls in
+        # flight than pooled connections, and a full pool blocks instead of
+        # opening throwaway connections.
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json",
+        })
+
+    def url(self, path: str) -> str:
+        return path if path.startswith(("http://", "https://")) else f"{self.api_root}{path}"
+
+    def _cache_key(self, url: str, params: Optional[dict]) -> str:
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{self._identity} {url} {query}"
+
+    def _track(self, response: requests.Response) -> None:
+        for name in ("limit", "remaining", "reset"):
+            value = response.headers.get(f"X-RateLimit-{name.capitalize()}")
+            if value is not None and value.isdigit():
+                self.rate_limit[name] = int(value)
+
+    def _rate_limit_wait(self, response: requests.Response) -> Optional[float]:
+        """Seconds to wait when ``response`` is a rate-limit rejection, else None."""
+
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code == 429 or (response.status_code == 403 and (
+                retry_after or response.headers.get("X-RateLimit-Remaining") == "0")):
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+            reset = response.headers.get("X-RateLimit-Reset")
+            if reset and reset.isdigit():
+                return max(int(reset) - time.time(), 0.0) + 1.0
+            return self.backoff
+        return None
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > self.max_wait:
+            raise GitHubError(403, f"rate limited for {seconds:.0f}s (over max_wait {self.max_wait:.0f}s)")
+        if seconds > 0:
+            print(f"[github] rate limited; waiting {seconds:.0f}s")
+            self.sleep(seconds)
+
+    def _await_budget(self) -> None:
+        if self.rate_limit.get("remaining") == 0 and "reset" in self.rate_limit:
+            self._wait(self.rate_limit["reset"] - time.time() + 1.0)
+            self.rate_limit.pop("remaining", None)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Optional[dict] = None,
+        params: Optional[dict] = None,
+    ) -> ApiResponse:
+        method = method.upper()
+        url = self.url(path)
+        key = entry = None
+        headers: Dict[str, str] = {}
+        if method == "GET" and self.cache is not None:
+            key = self._cache_key(url, params)
+            entry = self.cache.get(key)
+            if entry:
+                headers["If-None-Match"] = entry["etag"]
+
+        attempt = 0
+        while True:
+            self._await_budget()
+            try:
+                with self._slots:
+                    response = self.session.request(method, url, headers=headers, json=json_body,
+                                                    params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if method not in IDEMPOTENT or attempt >= self.retries:
+                    raise GitHubError(0, str(exc)) from exc
+                self.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+                continue
+            self._track(response)
+            wait = self._rate_limit_wait(response)
+            retryable = wait is not None or (response.status_code >= 500 and method in IDEMPOTENT)
+            if retryable and attempt < self.retries:
+                if wait is not None:
+                    self._wait(wait)
+                else:
+                    self.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+                continue
+            break
+
+        if response.status_code == 304 and entry:
+            cached_headers = dict(response.headers)
+            if entry.get("link"):
+                cached_headers["Link"] = entry["link"]
+            return ApiResponse(200, _decode(entry["body"]), cached_headers, cached=True)
+        if response.status_code >= 400:
+            raise GitHubError(response.status_code, response.text)
+        etag = response.headers.get("ETag")
+        if key is not None and etag and response.status_code == 200:
+            self.cache.put(key, etag, response.text, response.headers.get("Link"))
+        return ApiResponse(response.status_code, _decode(response.text), response.headers)
+
+    def json(self, method: str, path: str, **kwargs: Any) -> Any:
+        return self.request(method, path, **kwargs).data
+
+    def paginate(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        *,
+        per_page: int = PER_PAGE,
+        max_workers: int = PAGE_WORKERS,
+    ) -> list:
+        """All items of a paginated list endpoint, in page order.
+
+        The first response's Link header names the last page, so the rest
+        are fetched concurrently (at most ``max_workers`` in flight) without
+        probing for a trailing empty page.
+        """
+
+        query = dict(params or {}, per_page=per_page)
+        first = self.request("GET", path, params=dict(query, page=1))
+        items = list(first.data or [])
+        pages = last_page(first.headers.get("Link"))
+        if pages <= 1:
+            return items
+
+        def fetch(page: int) -> list:
+            return self.json("GET", path, params=dict(query, page=page)) or []
+
+        with ThreadPoolExecutor(max(1, min(max_workers, pages - 1))) as pool:
+            for chunk in pool.map(fetch, range(2, pages + 1)):
+                items.extend(chunk)
+        return items
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_CLIENTS: Dict[str, GitHubClient] = {}
+
+
+def shared_client(token: str, **options: Any) -> GitHubClient:
+    """Process-wide client for ``token`` with the on-disk ETag cache."""
+
+    client = _CLIENTS.get(token)
+    if client is None:
+        options.setdefault("cache", ETagCache())
+        options.setdefault("pool_size", PAGE_WORKERS)
+        client = _CLIENTS[token] = GitHubClient(token, **options)
+    return client
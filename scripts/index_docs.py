@@ -1,19 +1,40 @@
 #!/usr/bin/env python3
 """
 Generate docs/index.md listing major docs (excluding digests index).
+
+Usage:
+  python scripts/index_docs.py [--changed-only] [--since GIT_REF]
 """
+import argparse
 import os
 import sys
-from glob import glob
+
+from fix_manifest import FixManifest, add_incremental_args, changed_since, content_hash
+from vault_catalog import open_catalog
 
 
 def main():
     """Generate documentation index."""
-    # Find all markdown files in docs
-    docs_files = sorted([
-        path for path in glob('docs/**/*.md', recursive=True)
-        if os.path.basename(path) != 'index.md'
-    ])
+    parser = argparse.ArgumentParser(description="Generate docs/index.md")
+    parser.add_argument('--write', action='store_true',
+                        help="Write the index (default behaviour; accepted for Makefile.vm)")
+    add_incremental_args(parser)
+    args = parser.parse_args()
+
+    output_path = 'docs/index.md'
+    manifest = FixManifest('index_docs')
+
+    # The index only lists paths, so a diff without docs/ changes cannot alter it
+    if args.since and not any(p.startswith('docs/') for p in changed_since(args.since)):
+        print(f"[docs] no docs changes since {args.since}; {output_path} unchanged")
+        return 0
+
+    # Query markdown files in docs from the (incrementally refreshed) catalog
+    with open_catalog() as catalog:
+        docs_files = [
+            row['path'] for row in catalog.documents('docs/')
+            if os.path.basename(row['path']) != 'index.md'
+        ]
     
     # Build index content
     lines = ["# Documentation Index\n"]
@@ -27,12 +48,19 @@ def main():
         relative_path = path.split('/', 1)[1]  # Remove 'docs/' prefix
         lines.append(f"- [{relative_path}]({path})")
     
+    content = "\n".join(lines) + "\n"
+    if (args.changed_only and manifest.is_current(output_path)
+            and manifest.output_hash(output_path) == content_hash(content)):
+        print(f"[docs] {output_path} already current")
+        return 0
+
     # Write index file
-    output_path = 'docs/index.md'
     os.makedirs('docs', exist_ok=True)
     
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines) + "\n")
+        f.write(content)
+    manifest.record(output_path, content)
+    manifest.save()
     
     print(f"✅ Wrote {output_path}")
     return 0
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Streaming JUnit XML reader with per-suite and per-test timings.
+
+``ElementTree.iterparse`` walks the file once. Each ``<testcase>`` is
+removed from its parent as soon as it has been folded in, so memory stays
+flat however large the report is. Only three things are kept: per-suite
+totals, a heap of the N slowest tests, and the first ``max_failures``
+failures and errors (all failures are still counted).
+
+Suite counts come from the test cases. A suite without test cases falls
+back to its own ``tests``/``failures``/``errors``/``skipped`` attributes,
+unless it only wraps nested suites. A suite's ``time`` attribute wins over
+the sum of its cases when present.
+
+Used by eval_snapshot.py, which feeds the PR summary and the HTML report.
+
+Usage:
+  python scripts/junit_reader.py junit.xml [--slowest 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import Element, iterparse
+
+SLOWEST = 10
+MAX_FAILURES = 50
+MESSAGE_LIMIT = 500
+COUNTS = ("tests", "failures", "errors", "skipped")
+
+
+def _int(value: Optional[str]) -> int:
+    try:
+        return int(float(value or 0))
+    except ValueError:
+        return 0
+
+
+def _float(value: Optional[str]) -> float:
+    try:
+        return float(value or 0)
+    except ValueError:
+        return 0.0
+
+
+def test_id(case: Element) -> str:
+    classname = case.get("classname") or ""
+    name = case.get("name") or "<unnamed>"
+    return f"{classname}::{name}" if classname else name
+
+
+class _Suite:
+    __slots__ = ("name", "counts", "time", "cases", "nested")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.counts = dict.fromkeys(COUNTS, 0)
+        self.time = 0.0
+        self.cases = 0
+        self.nested = False
+
+
+def read_junit(path: Path | str, slowest: int = SLOWEST, max_failures: int = MAX_FAILURES) -> Dict[str, Any]:
+    """Totals, per-suite rows, the ``slowest`` tests and the first failures of a JUnit file."""
+
+    suites: List[Dict[str, Any]] = []
+    heap: List[Tuple[float, int, str]] = []
+    failures: List[Dict[str, str]] = []
+    stack: List[Element] = []
+    open_suites: List[_Suite] = []
+    seq = 0
+
+    for event, elem in iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "testsuite":
+                if open_suites:
+                    open_suites[-1].nested = True
+                open_suites.append(_Suite(elem.get("name") or f"suite-{len(suites) + 1}"))
+            continue
+
+        stack.pop()
+        if elem.tag == "testcase":
+            seq += 1
+            duration = _float(elem.get("time"))
+            outcome = "passed"
+            for child in elem:
+                if child.tag in ("failure", "error", "skipped"):
+                    outcome = child.tag
+                    break
+            suite = open_suites[-1] if open_suites else None
+            if suite is None:
+                suite = _Suite("<root>")
+                open_suites.append(suite)
+            suite.cases += 1
+            suite.time += duration
+            suite.counts["tests"] += 1
+            if outcome == "failure":
+                suite.counts["failures"] += 1
+            elif outcome == "error":
+                suite.counts["errors"] += 1
+            elif outcome == "skipped":
+                suite.counts["skipped"] += 1
+            ident = test_id(elem)
+            if outcome in ("failure", "error") and len(failures) < max_failures:
+                detail = elem.find(outcome)
+                message = (detail.get("message") or (detail.text or "").strip()) if detail is not None else ""
+                failures.append({"id": ident, "kind": outcome, "message": message[:MESSAGE_LIMIT]})
+            if slowest > 0:
+                entry = (duration, -seq, ident)  # equal times: earlier test ranks first
+                if len(heap) < slowest:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            elem.clear()
+            if stack:
+                del stack[-1][-1]  # the finished case is always its parent's last child
+        elif elem.tag == "testsuite":
+            suite = open_suites.pop()
+            if not suite.cases and not suite.nested:
+                suite.counts = {key: _int(elem.get(key)) for key in COUNTS}
+            if elem.get("time") is not None:  # includes fixture setup the cases do not
+                suite.time = _float(elem.get("time"))
+            if suite.cases or not suite.nested:
+                suites.append({"name": suite.name, **suite.counts, "time": round(suite.time, 3)})
+            elem.clear()
+            if stack:
+                del stack[-1][-1]
+
+    for suite in open_suites:  # test cases directly under <testsuites>
+        suites.append({"name": suite.name, **suite.counts, "time": round(suite.time, 3)})
+
+    totals = {key: sum(s[key] for s in suites) for key in COUNTS}
+    totals["passed"] = max(totals["tests"] - totals["failures"] - totals["errors"] - totals["skipped"], 0)
+    totals["time"] = round(sum(s["time"] for s in suites), 3)
+    ranked = sorted(heap, reverse=True)
+    return {
+        **totals,
+        "suites": suites,
+        "slowest": [{"id": ident, "time": round(duration, 3)} for duration, _, ident in ranked],
+        "failure_details": failures,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize a JUnit XML file in one streaming pass")
+    parser.add_argument("path", help="JUnit XML file")
+    parser.add_argument("--slowest", type=int, default=SLOWEST, help="How many slow tests to list")
+    args = parser.parse_args(argv)
+    json.dump(read_junit(args.path, args.slowest), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
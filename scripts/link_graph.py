@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Vault-wide link graph with file and anchor validation.
+
+Every markdown link and Obsidian ``[[wikilink]]`` recorded in the docs catalog
+is resolved to a repo-relative file plus an optional heading slug (using the
+``slugify`` rule from ``mcp_knowledge_summon``). Resolution is a dictionary
+lookup per link, so building the graph and reporting broken links and anchors
+is a single linear pass; forward and reverse (backlink) maps are kept for O(1)
+impact queries.
+
+Usage:
+  python scripts/link_graph.py             # report broken links/anchors
+  python scripts/link_graph.py --strict    # exit 1 when anything is broken
+  python scripts/link_graph.py --backlinks docs/SIGNALS.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import posixpath
+import re
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from urllib.parse import unquote
+
+from file_inventory import inventory
+from mcp_knowledge_summon import slugify
+from vault_catalog import VaultCatalog, open_catalog
+
+SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*:", re.I)
+TITLE_RE = re.compile(r"\s+(\"[^\"]*\"|'[^']*')$")
+IMPLICIT_ANCHORS = frozenset({"top"})
+EXPLICIT_ID_RE = re.compile(r"\s*\{#([^}\s]+)\}\s*$")
+
+
+class LinkIssue(NamedTuple):
+    source: str
+    line: int
+    target: str
+    reason: str
+
+
+class Resolved(NamedTuple):
+    path: str
+    anchor: Optional[str]
+
+
+def anchor_set(headings: Iterable[str]) -> Set[str]:
+    """Slugs for ``headings``, including ``-1``/``-2`` suffixes for duplicates.
+
+    Explicit ``{#custom-id}`` heading attributes are honoured as well.
+    """
+
+    anchors: Set[str] = set()
+    seen: Dict[str, int] = {}
+    for heading in headings:
+        explicit = EXPLICIT_ID_RE.search(heading)
+        if explicit:
+            anchors.add(explicit.group(1).lower())
+            heading = heading[: explicit.start()]
+        slug = slugify(heading)
+        count = seen.get(slug, 0)
+        anchors.add(slug if count == 0 else f"{slug}-{count}")
+        seen[slug] = count + 1
+    return anchors
+
+
+def resolve_target(source: str, raw: str) -> Optional[Resolved]:
+    """Resolve a markdown link ``raw`` written in ``source`` (None for external URLs).
+
+    ``source`` is the repo-relative path of the linking file; pass ``""`` for
+    links that are already relative to the repository root.
+    """
+
+    target = raw.strip()
+    if target.startswith("<") and ">" in target:
+        target = target[1 : target.index(">")]
+    else:
+        target = TITLE_RE.sub("", target)
+    if not target or SCHEME_RE.match(target):
+        return None
+
+    path_part, _, anchor = target.partition("#")
+    path_part = unquote(path_part)
+    if not path_part:
+        resolved = source
+    elif path_part.startswith("/"):
+        resolved = posixpath.normpath(path_part.lstrip("/"))
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path_part))
+    return Resolved(resolved, unquote(anchor).lower() if anchor else None)
+
+
+class LinkGraph:
+    """Resolved link edges plus per-file anchor sets and reverse lookups."""
+
+    def __init__(self, files: Iterable[str], headings: Iterable[Tuple[str, int, str]]) -> None:
+        self.files: Set[str] = set(files)
+        self.dirs: Set[str] = set()
+        for path in self.files:
+            parent = posixpath.dirname(path)
+            while parent and parent not in self.dirs:
+                self.dirs.add(parent)
+                parent = posixpath.dirname(parent)
+
+        grouped: Dict[str, List[str]] = {}
+        for path, _level, text in headings:
+            grouped.setdefault(path, []).append(text)
+        self.anchors: Dict[str, Set[str]] = {path: anchor_set(texts) for path, texts in grouped.items()}
+
+        # Obsidian resolves [[Note]] case-insensitively by vault path or bare note name.
+        self._wiki: Dict[str, str] = {}
+        for path in sorted(self.files):
+            lowered = path.lower()
+            stem = lowered[:-3] if lowered.endswith(".md") else lowered
+            for key in (lowered, stem, posixpath.basename(stem), posixpath.basename(lowered)):
+                self._wiki.setdefault(key, path)
+
+        self.forward: Dict[str, List[Resolved]] = {}
+        self.backlinks: Dict[str, Set[str]] = {}
+        self.broken: List[LinkIssue] = []
+
+    def _resolve_wiki(self, source: str, raw: str) -> Optional[Resolved]:
+        name, _, heading = raw.partition("#")
+        name = name.strip().rstrip("/")
+        anchor = slugify(heading) if heading.strip() else None
+        if not name:
+            return Resolved(source, anchor)
+        path = self._wiki.get(name.lower())
+        return Resolved(path if path else name, anchor)
+
+    def check(self, target: Resolved) -> Optional[str]:
+        """Return a reason string when ``target`` does not resolve, else None."""
+
+        if target.path not in self.files and target.path not in self.dirs:
+            return "missing file"
+        if target.anchor and target.anchor not in IMPLICIT_ANCHORS:
+            anchors = self.anchors.get(target.path)
+            if anchors is not None and target.anchor not in anchors:
+                return "missing anchor"
+            if anchors is None and target.path.endswith(".md"):
+                return "missing anchor"
+        return None
+
+    def add(self, source: str, line: int, kind: str, raw: str) -> None:
+        resolved = self._resolve_wiki(source, raw) if kind == "wiki" else resolve_target(source, raw)
+        if resolved is None:
+            return
+        self.forward.setdefault(source, []).append(resolved)
+        reason = self.check(resolved)
+        if reason:
+            self.broken.append(LinkIssue(source, line, raw, reason))
+            return
+        if resolved.path != source:
+            self.backlinks.setdefault(resolved.path, set()).add(source)
+
+    def linked_from(self, path: str) -> Set[str]:
+        return self.backlinks.get(path, set())
+
+
+def build_graph(catalog: Optional[VaultCatalog] = None) -> LinkGraph:
+    """Build the graph from the docs catalog (refreshing it when not supplied)."""
+
+    owned = catalog is None
+    if catalog is None:
+        catalog = open_catalog()
+    try:
+        graph = LinkGraph(inventory().paths, catalog.all_headings())
+        for source, line, kind, raw, in_code in catalog.all_links():
+            if not in_code:
+                graph.add(source, line, kind, raw)
+    finally:
+        if owned:
+            catalog.close()
+    return graph
+
+
+def prompt_doc_index(entries: Sequence[dict]) -> Dict[str, Set[str]]:
+    """Map each repo-relative doc path to the prompt ids whose ``links`` reference it."""
+
+    index: Dict[str, Set[str]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        ident = entry.get("id") or entry.get("title")
+        if not ident:
+            continue
+        for link in entry.get("links", []) or []:
+            if not isinstance(link, str):
+                continue
+            resolved = resolve_target("", link)
+            if resolved and resolved.path != ".":
+                index.setdefault(resolved.path, set()).add(str(ident))
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VaultMesh link graph")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when broken links are found")
+    parser.add_argument("--backlinks", metavar="PATH", help="List documents linking to PATH")
+    args = parser.parse_args()
+
+    graph = build_graph()
+    if args.backlinks:
+        for source in sorted(graph.linked_from(args.backlinks)):
+            print(source)
+        return 0
+
+    for issue in graph.broken:
+        print(f"[links] {issue.reason}: {issue.source}:{issue.line} -> {issue.target}")
+    edges = sum(len(targets) for targets in graph.forward.values())
+    print(f"[links] {edges} links across {len(graph.forward)} docs · {len(graph.broken)} broken")
+    return 1 if graph.broken and args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable, List, Sequence, Tuple
 
+from file_inventory import inventory
+from timestamps import parse_date
+from vault_catalog import VaultCatalog, open_catalog
+
 CONFIG_PATH = Path("templates/mcp-summon.config.json")
 OUTPUT_PATH = Path("docs/summon.md")
 RECENT_WINDOW_DAYS = 7
@@ -40,50 +44,45 @@ def gather_source_files(config: dict) -> List[Path]:
     if not includes:
         includes = ["docs/**/*.md", "guides/**/*.md", "prompts/**/*.md"]
 
+    inv = inventory()
+    excluded = set(inv.glob(*excludes)) if excludes else set()
     files: List[Path] = []
-    seen: set[Path] = set()
-    for pattern in includes:
-        for match in Path().glob(pattern):
-            if match.is_dir():
-                continue
-            if any(match.match(ex) for ex in excludes):
-                continue
-            if match.suffix.lower() not in {".md", ".txt"}:
-                continue
-            normalized = match.resolve()
-            if normalized in seen:
-                continue
-            seen.add(normalized)
-            files.append(normalized)
+    for match in inv.glob(*includes):
+        if match in excluded:
+            continue
+        if match.suffix.lower() not in {".md", ".txt"}:
+            continue
+        files.append(match.resolve())
     return sorted(files)
 
 
 def slugify(heading: str) -> str:
     slug = heading.strip().lower()
     slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-    slug = re.sub(r"\s+", "-", slug)
+    slug = re.sub(r"\s", "-", slug)
     return slug
 
 
-def extract_headings_and_links(files: Sequence[Path]) -> Tuple[List[Tuple[Path, str]], List[Tuple[str, str, Path]]]:
+def relative_keys(files: Sequence[Path]) -> List[str]:
+    cwd = Path.cwd()
+    return [path.relative_to(cwd).as_posix() for path in files]
+
+
+def extract_headings_and_links(
+    files: Sequence[Path], catalog: VaultCatalog
+) -> Tuple[List[Tuple[Path, str]], List[Tuple[str, str, Path]]]:
     heading_entries: List[Tuple[Path, str]] = []
     link_entries: List[Tuple[str, str, Path]] = []
-    link_pattern = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
 
-    for path in files:
-        try:
-            text = path.read_text(encoding="utf-8")
-        except OSError:
-            continue
-        rel_path = path.relative_to(Path.cwd())
-        for line in text.splitlines():
-            if line.startswith("#"):
-                heading = line.lstrip("#").strip()
-                if heading:
-                    heading_entries.append((rel_path, heading))
-            for match in link_pattern.finditer(line):
-                link_text, target = match.groups()
-                link_entries.append((link_text.strip(), target.strip(), rel_path))
+    keys = relative_keys(files)
+    headings = catalog.headings(keys)
+    links = catalog.links(keys)
+    for key in keys:
+        rel_path = Path(key)
+        for _line, _level, heading in headings[key]:
+            heading_entries.append((rel_path, heading))
+        for _line, link_text, target in links[key]:
+            link_entries.append((link_text, target, rel_path))
     return heading_entries, link_entries
 
 
@@ -103,20 +102,15 @@ def git_shortlog(days: int) -> str:
     return output or "No commits in the selected window."
 
 
-def gather_todos(files: Sequence[Path], limit: int = 30) -> List[Tuple[Path, int, str]]:
-    todo_re = re.compile(r"\b(TODO|FIXME)\b", re.IGNORECASE)
+def gather_todos(files: Sequence[Path], catalog: VaultCatalog, limit: int = 30) -> List[Tuple[Path, int, str]]:
     results: List[Tuple[Path, int, str]] = []
-    for path in files:
-        try:
-            text = path.read_text(encoding="utf-8")
-        except OSError:
-            continue
-        for idx, line in enumerate(text.splitlines(), start=1):
-            if todo_re.search(line):
-                snippet = line.strip()
-                results.append((path.relative_to(Path.cwd()), idx, snippet))
-                if len(results) >= limit:
-                    return results
+    keys = relative_keys(files)
+    todos = catalog.todos(keys)
+    for key in keys:
+        for idx, snippet in todos[key]:
+            results.append((Path(key), idx, snippet))
+            if len(results) >= limit:
+                return results
     return results
 
 
@@ -149,9 +143,8 @@ def analyze_prompts(stale_after_days: int) -> Tuple[int, List[Tuple[str, str]],
             missing_summary.append((ident, str(prompt.get("path", ""))))
         last_reviewed = prompt.get("last_reviewed")
         if isinstance(last_reviewed, str):
-            try:
-                reviewed_date = datetime.strptime(last_reviewed, "%Y-%m-%d").date()
-            except ValueError:
+            reviewed_date = parse_date(last_reviewed)
+            if reviewed_date is None:
                 stale_review.append((ident, last_reviewed))
                 continue
             if today - reviewed_date > stale_delta:
@@ -255,9 +248,10 @@ def build_report(
 def main() -> int:
     config = load_config(CONFIG_PATH)
     files = gather_source_files(config)
-    headings, links = extract_headings_and_links(files)
+    with open_catalog(relative_keys(files)) as catalog:
+        headings, links = extract_headings_and_links(files, catalog)
+        todos = gather_todos(files, catalog)
     shortlog = git_shortlog(RECENT_WINDOW_DAYS)
-    todos = gather_todos(files)
     prompt_stats = analyze_prompts(STALE_AFTER_DAYS)
     generated_at = datetime.utcnow()
 
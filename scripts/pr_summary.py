@@ -1,30 +1,37 @@
 #!/usr/bin/env python3
-"""Create or update the VaultMesh PR summary comment with rich impact details."""
+"""Create or update the VaultMesh PR summary comment with rich impact details.
+
+Importable: ``load_context`` reads prompts, eval results and JUnit once,
+``summarize_pr`` renders and upserts one PR's comment with a shared
+``GitHubClient``, and ``main(argv)`` is the CLI (``--all-open`` refreshes
+every open PR of the repository concurrently in one process).
+"""
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
 import os
 import re
+import subprocess
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
-from xml.etree import ElementTree as ET
+from typing import AbstractSet, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from urllib.parse import quote
 
-import requests
+from diff_coverage import LineCoverage, diff_coverage, format_ranges, split_patches
+from eval_snapshot import load_snapshot
+from github_client import GitHubClient, GitHubError, shared_client
+from prompt_index import PromptIndex, PromptRecord, changed_prompts, load_prompt_index, make_record, read_revision
 
-API_ROOT = "https://api.github.com"
 SUMMARY_TAG = "<!-- vaultmesh-pr-summary -->"
-EVAL_RESULTS_DIR = Path("eval-results")
-PROMPT_INDEX_PATH = Path("prompts/index.json")
+VOLATILE_PREFIXES = ("<!-- head:", "<!-- digest:", "- Actions run:")
 MAX_DIFFSTAT_ROWS = 10
 MAX_SECTION_ITEMS = 15
-
-
-PARSER = argparse.ArgumentParser(description="VaultMesh PR summary generator")
-PARSER.add_argument("--no-post", action="store_true", help="Preview only; do not post comment or labels")
-CLI_ARGS = PARSER.parse_args()
+BATCH_WORKERS = 4
 
 
 def cov_badge(pct: Optional[float]) -> str:
@@ -49,20 +56,6 @@ def require_env(name: str) -> str:
     return value
 
 
-def github_request(method: str, path: str, *, token: str, json_body: Optional[dict] = None, params: Optional[dict] = None) -> dict | list:
-    url = f"{API_ROOT}{path}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json",
-    }
-    response = requests.request(method, url, headers=headers, json=json_body, params=params)
-    if response.status_code >= 400:
-        raise RuntimeError(f"GitHub API error {response.status_code}: {response.text}")
-    if response.text:
-        return response.json()
-    return {}
-
-
 def resolve_pr_number() -> str:
     if pr := os.environ.get("PR_NUMBER"):
         return pr
@@ -78,21 +71,96 @@ def resolve_pr_number() -> str:
     sys.exit(1)
 
 
-def fetch_changed_files(repo: str, pr_number: str, token: str) -> List[Dict]:
-    files: List[Dict] = []
-    page = 1
-    while True:
-        chunk = github_request(
-            "GET",
-            f"/repos/{repo}/pulls/{pr_number}/files",
-            token=token,
-            params={"per_page": 100, "page": page},
-        )
-        if not chunk:
-            break
-        files.extend(chunk)
-        page += 1
-    return files
+def fetch_changed_files(client: GitHubClient, repo: str, pr_number: str) -> List[Dict]:
+    return client.paginate(f"/repos/{repo}/pulls/{pr_number}/files")
+
+
+GIT_STATUS = {"A": "added", "M": "modified", "D": "removed", "R": "renamed", "C": "copied", "T": "changed"}
+
+
+def git_diff(*args: str) -> bytes:
+    try:
+        result = subprocess.run(["git", "diff", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        stderr = getattr(exc, "stderr", b"") or b""
+        print(f"[pr-summary] git diff failed: {stderr.decode('utf-8', 'replace').strip() or exc}", file=sys.stderr)
+        sys.exit(1)
+    return result.stdout
+
+
+def _split_z(output: bytes) -> List[str]:
+    return output.decode("utf-8", "surrogateescape").split("\0")
+
+
+def needs_patch(path: str) -> bool:
+    """Only prompt index diffs are read line by line (for changed prompt ids)."""
+
+    return path.startswith("prompts/") and path.endswith("index.json")
+
+
+def git_patches(revisions: str, paths: Sequence[str]) -> Dict[str, str]:
+    """Hunks per file from one streamed ``git diff``, without headers (as the API reports them)."""
+
+    if not paths:
+        return {}
+    with subprocess.Popen(["git", "-c", "core.quotePath=false", "diff", "--no-color", "-M", revisions, "--", *paths],
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, errors="surrogateescape") as proc:
+        assert proc.stdout is not None
+        return split_patches(proc.stdout)
+
+
+def local_changed_files(
+    base: str,
+    head: str = "HEAD",
+    wants_patch: Callable[[str], bool] = needs_patch,
+) -> List[Dict]:
+    """``changed`` records for ``base...head`` from git, shaped like the API's PR files.
+
+    Only files accepted by ``wants_patch`` carry a ``patch``.
+    """
+
+    revisions = f"{base}...{head}"
+    statuses: Dict[str, Tuple[str, Optional[str]]] = {}
+    fields = _split_z(git_diff("--name-status", "-z", "-M", revisions))
+    i = 0
+    while i < len(fields) and fields[i]:
+        code = fields[i][0]
+        if code in "RC":
+            statuses[fields[i + 2]] = (GIT_STATUS[code], fields[i + 1])
+            i += 3
+        else:
+            statuses[fields[i + 1]] = (GIT_STATUS.get(code, "modified"), None)
+            i += 2
+
+    changed: List[Dict] = []
+    fields = _split_z(git_diff("--numstat", "-z", "-M", revisions))
+    i = 0
+    while i < len(fields) and fields[i]:
+        added, deleted, path = fields[i].split("\t", 2)
+        i += 1
+        if not path:  # rename: "added\tdeleted\t" NUL old NUL new
+            path = fields[i + 1]
+            i += 2
+        additions = int(added) if added.isdigit() else 0  # "-" for binary files
+        deletions = int(deleted) if deleted.isdigit() else 0
+        status, previous = statuses.get(path, ("modified", None))
+        record = {
+            "filename": path,
+            "status": status,
+            "additions": additions,
+            "deletions": deletions,
+            "changes": additions + deletions,
+            "sha": None,
+            "patch": None,
+        }
+        if previous:
+            record["previous_filename"] = previous
+        changed.append(record)
+
+    patches = git_patches(revisions, [r["filename"] for r in changed if r["status"] != "removed" and wants_patch(r["filename"])])
+    for record in changed:
+        record["patch"] = patches.get(record["filename"], record["patch"])
+    return changed
 
 
 def collect_area_impacts(changed: Sequence[Dict]) -> Tuple[Dict[str, List[str]], set[str]]:
@@ -115,54 +183,28 @@ def collect_area_impacts(changed: Sequence[Dict]) -> Tuple[Dict[str, List[str]],
     return impacts, labels
 
 
-def load_eval_metrics() -> Tuple[Optional[float], Optional[str], Optional[Dict]]:
+def load_eval_metrics(snapshot: Optional[dict] = None) -> Tuple[Optional[float], Optional[str], Optional[Dict]]:
+    snapshot = snapshot if snapshot is not None else load_snapshot()
     coverage_pct: Optional[float] = None
     coverage_note: Optional[str] = None
     adversarial_summary: Optional[Dict] = None
 
-    for candidate in [EVAL_RESULTS_DIR / "coverage-results.json", EVAL_RESULTS_DIR / "coverage.json"]:
-        if not candidate.exists():
-            continue
-        try:
-            data = json.loads(candidate.read_text())
-        except Exception as exc:  # noqa: BLE001
-            coverage_note = f"Failed to parse {candidate.name}: {exc}"
-            break
-        if isinstance(data, dict):
-            total = data.get("total") or {}
-            lines = total.get("lines") if isinstance(total, dict) else {}
-            if isinstance(lines, dict) and isinstance(lines.get("pct"), (int, float)):
-                coverage_pct = float(lines["pct"])
-            if coverage_pct is None and isinstance(data.get("coverage"), (int, float)):
-                val = float(data["coverage"])
-                coverage_pct = val * 100 if val <= 1.0 else val
-            if coverage_pct is None and isinstance(data.get("line_rate"), (int, float)):
-                val = float(data["line_rate"])
-                coverage_pct = val * 100 if val <= 1.0 else val
-            if coverage_pct is None and isinstance(data.get("summary"), dict):
-                summary = data["summary"]
-                if isinstance(summary.get("coverage_percentage"), (int, float)):
-                    coverage_pct = float(summary["coverage_percentage"])
-        elif isinstance(data, (int, float)):
-            coverage_pct = float(data) * 100 if data <= 1.0 else float(data)
-        coverage_note = str(candidate)
-        break
-
-    for path in EVAL_RESULTS_DIR.glob("adversarial*.json"):
-        try:
-            data = json.loads(path.read_text())
-        except Exception:  # noqa: BLE001
-            continue
-        passed = data.get("passed") or data.get("ok") or 0
-        failed = data.get("failed") or data.get("errors") or 0
-        total = data.get("total") or (passed + failed)
+    coverage = snapshot.get("coverage")
+    if coverage:
+        if "error" in coverage:
+            coverage_note = f"Failed to parse {Path(coverage['source']).name}: {coverage['error']}"
+        else:
+            coverage_pct = coverage.get("pct")
+            coverage_note = coverage["source"]
+
+    adversarial = snapshot.get("adversarial")
+    if adversarial and "error" not in adversarial:
         adversarial_summary = {
-            "file": str(path),
-            "passed": passed,
-            "failed": failed,
-            "total": total,
+            "file": adversarial["source"],
+            "passed": adversarial["passed"],
+            "failed": adversarial["failed"],
+            "total": adversarial["total"],
         }
-        break
 
     return coverage_pct, coverage_note, adversarial_summary
 
@@ -209,33 +251,12 @@ def inline_list(items: Sequence[str]) -> str:
     return "- " + ", ".join(sorted(items))
 
 
-def load_prompt_entries() -> List[dict]:
-    if not PROMPT_INDEX_PATH.exists():
-        return []
-    try:
-        data = json.loads(PROMPT_INDEX_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return []
-    prompts = data.get("prompts")
-    return prompts if isinstance(prompts, list) else []
-
-
 def slugify_label(value: str) -> str:
     slug = re.sub(r"[^a-z0-9]+", "-", value.lower())
     slug = slug.strip("-")
     return slug or "unknown"
 
 
-def prompts_by_id(entries: Sequence[dict]) -> Dict[str, dict]:
-    mapping: Dict[str, dict] = {}
-    for entry in entries:
-        if isinstance(entry, dict):
-            ident = entry.get("id") or entry.get("title")
-            if ident:
-                mapping[str(ident)] = entry
-    return mapping
-
-
 def extract_ids_from_patch(patch: Optional[str]) -> set[str]:
     if not patch:
         return set()
@@ -249,31 +270,88 @@ def extract_ids_from_patch(patch: Optional[str]) -> set[str]:
     return ids
 
 
-def collect_prompt_impacts(changed: Sequence[Dict], prompt_entries: Sequence[dict]) -> Tuple[set[str], set[str], set[str], List[Tuple[str, List[str]]]]:
-    prompt_map = prompts_by_id(prompt_entries)
-    impacted_ids: set[str] = set()
-    impacted_owners: set[str] = set()
-    impacted_domains: set[str] = set()
+def attach_prompt_changes(
+    changed: Sequence[Dict],
+    index: PromptIndex,
+    read_file: Callable[[str, bool], Optional[str]],
+) -> None:
+    """Set ``prompt_changes`` on changed prompt index records by diffing both versions structurally.
+
+    ``read_file(path, head)`` returns a file's text at the base or head
+    revision, or None when it cannot be read (the patch is used instead).
+    """
+
+    for item in changed:
+        if not needs_patch(item["filename"]):
+            continue
+        old = "" if item["status"] == "added" else read_file(item.get("previous_filename") or item["filename"], False)
+        new = "" if item["status"] == "removed" else read_file(item["filename"], True)
+        if old is None or new is None:
+            continue
+        item["prompt_changes"] = changed_prompts(PromptIndex.from_text(old, index), PromptIndex.from_text(new, index))
+
+
+def local_file_reader(base: str, head: str = "HEAD") -> Callable[[str, bool], Optional[str]]:
+    """``read_file`` for ``base...head``: the base side is the merge base, as in the diff."""
+
+    merge_base = git_diff_base(base, head)
+
+    def read(path: str, at_head: bool) -> Optional[str]:
+        rev = head if at_head else merge_base
+        return read_revision(rev, path) if rev else None
+
+    return read
+
+
+def git_diff_base(base: str, head: str) -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "merge-base", base, head], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def api_file_reader(client: GitHubClient, repo: str, pr_number: str) -> Callable[[str, bool], Optional[str]]:
+    """``read_file`` through the contents API at the PR's base and head commits (fetched on first use)."""
+
+    pull: Dict[str, dict] = {}
+
+    def read(path: str, at_head: bool) -> Optional[str]:
+        if not pull:
+            pull.update(client.json("GET", f"/repos/{repo}/pulls/{pr_number}"))
+        ref = (pull.get("head" if at_head else "base") or {}).get("sha")
+        if not ref:
+            return None
+        try:
+            data = client.json("GET", f"/repos/{repo}/contents/{path}", params={"ref": ref})
+        except GitHubError as exc:
+            return "" if exc.status == 404 else None
+        if not isinstance(data, dict) or data.get("encoding") != "base64":  # over 1 MB: no inline content
+            return None
+        return base64.b64decode(data.get("content") or "").decode("utf-8", "replace")
+
+    return read
+
+
+def collect_prompt_impacts(
+    changed: Sequence[Dict],
+    index: PromptIndex,
+) -> Tuple[Dict[str, PromptRecord], set[str], set[str], List[Tuple[str, List[str]]]]:
+    """Impacted prompts (id → record), owners, domains and doc → prompt links, in O(changed files)."""
+
+    impacted: Dict[str, PromptRecord] = {}
 
     for item in changed:
         path = item["filename"]
         if not path.startswith("prompts/"):
             continue
         if path.endswith("index.json"):
-            ids = extract_ids_from_patch(item.get("patch"))
-            if not ids:
-                ids = set(prompt_map.keys())
-            for ident in ids:
-                entry = prompt_map.get(ident)
-                if not entry:
-                    continue
-                impacted_ids.add(ident)
-                owner = entry.get("owner")
-                domain = entry.get("domain")
-                if owner:
-                    impacted_owners.add(str(owner))
-                if domain:
-                    impacted_domains.add(str(domain))
+            changes = item.get("prompt_changes")
+            if changes is None:  # versions unavailable: ids named on the patch's changed lines
+                changes = {ident: record for ident in extract_ids_from_patch(item.get("patch"))
+                           if (record := index.get(ident)) is not None}
+            impacted.update(changes)
             continue
 
         if not path.endswith(".json") or path.endswith(".schema.json"):
@@ -286,52 +364,20 @@ def collect_prompt_impacts(changed: Sequence[Dict], prompt_entries: Sequence[dic
             metadata = json.loads(file_path.read_text(encoding="utf-8"))
         except json.JSONDecodeError:
             continue
+        if isinstance(metadata, dict):
+            impacted[str(metadata.get("id") or metadata.get("title") or file_path.stem)] = make_record(metadata)
 
-        ident = metadata.get("id") or metadata.get("title") or file_path.stem
-        owner = metadata.get("owner")
-        domain = metadata.get("domain")
-        if ident:
-            impacted_ids.add(str(ident))
-        if owner:
-            impacted_owners.add(str(owner))
-        if domain:
-            impacted_domains.add(str(domain))
-
-    doc_link_map: Dict[str, set[str]] = {}
-    for entry in prompt_entries:
-        if not isinstance(entry, dict):
-            continue
-        ident = entry.get("id") or entry.get("title")
-        if not ident:
-            continue
-        for link in entry.get("links", []) or []:
-            if not isinstance(link, str):
-                continue
-            target = link.split("#", 1)[0]
-            variations = {
-                target,
-                target.lstrip("./"),
-                target.lstrip("../"),
-            }
-            for candidate in variations:
-                if candidate:
-                    doc_link_map.setdefault(candidate, set()).add(str(ident))
+    impacted_owners = {record.owner for record in impacted.values() if record.owner}
+    impacted_domains = {record.domain for record in impacted.values() if record.domain}
 
     related_doc_prompts: List[Tuple[str, List[str]]] = []
-    docs_changed = [item["filename"] for item in changed if item["filename"].startswith("docs/")]
-    for doc_path in docs_changed:
-        matches: set[str] = set()
-        variations = {
-            doc_path,
-            doc_path.lstrip("./"),
-            doc_path.lstrip("../"),
-        }
-        for candidate in variations:
-            matches.update(doc_link_map.get(candidate, set()))
-        if matches:
-            related_doc_prompts.append((doc_path, sorted(matches)))
+    for item in changed:
+        if item["filename"].startswith("docs/"):
+            matches = index.prompts_for_doc(item["filename"])
+            if matches:
+                related_doc_prompts.append((item["filename"], sorted(matches)))
 
-    return impacted_ids, impacted_owners, impacted_domains, related_doc_prompts
+    return impacted, impacted_owners, impacted_domains, related_doc_prompts
 
 
 def format_related_prompts(related: Sequence[Tuple[str, Sequence[str]]]) -> str:
@@ -343,41 +389,74 @@ def format_related_prompts(related: Sequence[Tuple[str, Sequence[str]]]) -> str:
     return "\n".join(lines)
 
 
-def format_impacted_prompts(impacted_ids: Sequence[str], prompt_map: Dict[str, dict]) -> str:
-    if not impacted_ids:
+def format_impacted_prompts(impacted: Dict[str, PromptRecord]) -> str:
+    if not impacted:
         return "- _none_"
     lines: List[str] = []
-    for ident in sorted(impacted_ids):
-        meta = prompt_map.get(ident, {})
-        owner = meta.get("owner", "n/a")
-        domain = meta.get("domain", "n/a")
-        lines.append(f"- `{ident}` — owner: {owner}, domain: {domain}")
+    for ident, record in sorted(impacted.items()):
+        lines.append(f"- `{ident}` — owner: {record.owner or 'n/a'}, domain: {record.domain or 'n/a'}")
     return "\n".join(lines)
 
 
-def collect_junit_summary() -> str:
-    for path in Path(".").rglob("junit*.xml"):
-        try:
-            root = ET.parse(path).getroot()
-        except Exception:  # noqa: BLE001
-            continue
-
-        suites = list(root) if root.tag == "testsuites" else [root]
-        tests = failures = errors = skipped = 0
-        for suite in suites:
-            tests += int(suite.attrib.get("tests", 0) or 0)
-            failures += int(suite.attrib.get("failures", 0) or 0)
-            errors += int(suite.attrib.get("errors", 0) or 0)
-            skipped += int(suite.attrib.get("skipped", 0) or 0)
-
-        if tests == 0:
-            passed = tests
-        else:
-            passed = max(tests - failures - errors - skipped, 0)
+def collect_junit_summary(snapshot: Optional[dict] = None) -> str:
+    snapshot = snapshot if snapshot is not None else load_snapshot()
+    junit = snapshot.get("junit")
+    if not junit or "error" in junit:
+        return "N/A"
+    return (
+        f"{junit['passed']}/{junit['tests']} passed, {junit['failures']} failed, "
+        f"{junit['errors']} errors, {junit['skipped']} skipped  _(source: {junit['source']})_"
+    )
 
-        return f"{passed}/{tests} passed, {failures} failed, {errors} errors, {skipped} skipped  _(source: {path})_"
 
-    return "N/A"
+def format_junit_details(snapshot: Optional[dict] = None, limit: int = 5) -> str:
+    """Collapsible slowest-test and failure lists from the JUnit section of the snapshot."""
+
+    snapshot = snapshot if snapshot is not None else load_snapshot()
+    junit = snapshot.get("junit")
+    if not junit or "error" in junit:
+        return ""
+    blocks: List[str] = []
+    failures = junit.get("failure_details") or []
+    if failures:
+        lines = []
+        for failure in failures[:MAX_SECTION_ITEMS]:
+            first = failure["message"].splitlines()[0] if failure["message"] else ""
+            lines.append(f"- `{failure['id']}` ({failure['kind']})" + (f": {first}" if first else ""))
+        more = junit["failures"] + junit["errors"] - len(lines)
+        if more > 0:
+            lines.append(f"- … and {more} more")
+        blocks.append(f"<details><summary>Failing tests ({junit['failures'] + junit['errors']})</summary>\n\n"
+                      + "\n".join(lines) + "\n\n</details>")
+    slowest = (junit.get("slowest") or [])[:limit]
+    if slowest:
+        lines = [f"- `{t['id']}` — {t['time']:.3f}s" for t in slowest]
+        blocks.append(f"<details><summary>Slowest tests ({len(slowest)})</summary>\n\n"
+                      + "\n".join(lines) + "\n\n</details>")
+    return "\n\n".join(blocks)
+
+
+def format_diff_coverage(report: Optional[dict]) -> Tuple[Optional[str], str]:
+    """Quality-signal line and collapsible per-file table for a diff coverage report."""
+
+    if report is None:
+        return None, ""
+    total = report["covered"] + report["uncovered"]
+    if not total:
+        return f"no executable lines changed  _(source: {report['source']})_", ""
+    line = f"{cov_badge(report['pct'])} ({report['covered']}/{total} changed lines)  _(source: {report['source']})_"
+    rows = [
+        f"| `{f['path']}` | {f['covered']}/{f['covered'] + f['uncovered']} | {format_ranges(f['uncovered_ranges']) or '—'} |"
+        for f in report["files"][:MAX_SECTION_ITEMS]
+    ]
+    if len(report["files"]) > MAX_SECTION_ITEMS:
+        rows.append(f"| … and {len(report['files']) - MAX_SECTION_ITEMS} more | | |")
+    details = (
+        f"<details><summary>Diff coverage by file ({len(report['files'])})</summary>\n\n"
+        "| File | Covered | Uncovered lines |\n|------|---------|-----------------|\n"
+        + "\n".join(rows) + "\n\n</details>"
+    )
+    return line, details
 
 
 def build_summary_body(
@@ -392,6 +471,11 @@ def build_summary_body(
     related_docs_md: str,
     impacted_prompts_md: str,
     junit_md: str,
+    artifacts_md: str,
+    head_tag: str,
+    junit_details_md: str = "",
+    diff_coverage_line: Optional[str] = None,
+    diff_coverage_details: str = "",
 ) -> str:
     added = sum(1 for f in changed if f["status"] == "added")
     modified = sum(1 for f in changed if f["status"] == "modified")
@@ -419,9 +503,13 @@ def build_summary_body(
     quality_block = (
         "**Quality Signals**  \n"
         f"- Coverage: {coverage_line}  \n"
-        f"- Adversarial: {adversarial_md}  \n"
+        + (f"- Diff coverage: {diff_coverage_line}  \n" if diff_coverage_line else "")
+        + f"- Adversarial: {adversarial_md}  \n"
         f"- Tests: {junit_md}"
     )
+    for details in (diff_coverage_details, junit_details_md):
+        if details:
+            quality_block += f"\n\n{details}"
 
     return (
         f"{SUMMARY_TAG}\n"
@@ -448,70 +536,51 @@ def build_summary_body(
     )
 
 
-def upsert_comment(
-    repo: str,
-    pr_number: str,
-    body: str,
-    token: str,
-    labels: Sequence[str],
-    head_sha: Optional[str],
-) -> None:
-    comments = github_request("GET", f"/repos/{repo}/issues/{pr_number}/comments", token=token)
-    prev_comment = None
-    same_head = False
+def tag_value(body: str, name: str) -> Optional[str]:
+    """Value of a ``<!-- name:value -->`` marker in a comment body."""
+
+    match = re.search(rf"<!-- {name}:(\S+) -->", body or "")
+    return match.group(1) if match else None
+
+
+def body_digest(body: str, labels: Sequence[str]) -> str:
+    """Hash of the summary content and labels, ignoring per-run lines (head tag, run link)."""
 
+    stable = [line for line in body.splitlines() if not line.startswith(VOLATILE_PREFIXES)]
+    payload = "\n".join(stable) + "\0" + "\n".join(sorted(set(labels)))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def find_summary_comment(client: GitHubClient, repo: str, pr_number: str) -> Optional[dict]:
+    comments = client.paginate(f"/repos/{repo}/issues/{pr_number}/comments")
     for comment in comments:
-        existing_body = comment.get("body", "")
-        if existing_body.startswith(SUMMARY_TAG):
-            prev_comment = comment
-            if head_sha and f"<!-- head:{head_sha} -->" in existing_body:
-                same_head = True
-            break
-
-    if same_head:
-        print("[pr-summary] No-op: same HEAD SHA, skipping comment update.")
-        return
+        if (comment.get("body") or "").startswith(SUMMARY_TAG):
+            return comment
+    return None
 
-    if prev_comment:
-        github_request(
-            "PATCH",
-            f"/repos/{repo}/issues/comments/{prev_comment['id']}",
-            token=token,
-            json_body={"body": body},
-        )
-        print("[pr-summary] Updated existing summary comment.")
-    else:
-        github_request(
-            "POST",
-            f"/repos/{repo}/issues/{pr_number}/comments",
-            token=token,
-            json_body={"body": body},
-        )
-        print("[pr-summary] Posted new summary comment.")
-
-    if labels:
-        github_request(
-            "POST",
-            f"/repos/{repo}/issues/{pr_number}/labels",
-            token=token,
-            json_body={"labels": sorted(set(labels))},
-        )
-        print("[pr-summary] Applied labels: ", ", ".join(sorted(set(labels))))
-    else:
-        print("[pr-summary] No labels inferred.")
 
+def fetch_current_labels(client: GitHubClient, repo: str, pr_number: str) -> Set[str]:
+    return {label["name"] for label in client.paginate(f"/repos/{repo}/issues/{pr_number}/labels")}
 
-def main() -> int:
-    repo = require_env("GITHUB_REPOSITORY")
-    token = require_env("GITHUB_TOKEN")
-    pr_number = resolve_pr_number()
 
-    raw_files = fetch_changed_files(repo, pr_number, token)
-    if not raw_files:
-        print("[pr-summary] No file changes detected.")
-        return 0
+def fetch_pr_state(client: GitHubClient, repo: str, pr_number: str) -> Tuple[Optional[dict], Set[str]]:
+    """The summary comment and the PR's current labels, looked up concurrently."""
+
+    with ThreadPoolExecutor(2) as pool:
+        labels = pool.submit(fetch_current_labels, client, repo, pr_number)
+        existing = find_summary_comment(client, repo, pr_number)
+        return existing, labels.result()
+
+
+def applied_labels(body: Optional[str]) -> Set[str]:
+    """Labels a previous summary applied (from its ``<!-- labels:... -->`` marker)."""
+
+    value = tag_value(body or "", "labels")
+    return set(value.split(",")) if value else set()
 
-    changed = [
+
+def normalize_files(raw_files: Iterable[Dict]) -> List[Dict]:
+    return [
         {
             "filename": f["filename"],
             "status": f["status"],
@@ -524,14 +593,57 @@ def main() -> int:
         for f in raw_files
     ]
 
+
+class SummaryContext(NamedTuple):
+    """Inputs shared by every PR summarized in one process."""
+
+    prompt_index: PromptIndex
+    coverage_pct: Optional[float]
+    coverage_note: Optional[str]
+    adversarial_summary: Optional[Dict]
+    junit_md: str
+    junit_details_md: str
+    line_coverage: Optional[LineCoverage] = None
+
+
+def load_context() -> SummaryContext:
+    snapshot = load_snapshot()
+    coverage_pct, coverage_note, adversarial_summary = load_eval_metrics(snapshot)
+    return SummaryContext(
+        load_prompt_index(),
+        coverage_pct,
+        coverage_note,
+        adversarial_summary,
+        collect_junit_summary(snapshot),
+        format_junit_details(snapshot),
+        LineCoverage.load(),
+    )
+
+
+def patch_filter(context: SummaryContext) -> Callable[[str], bool]:
+    """Files whose local diff is needed: prompt indexes, plus anything with line coverage."""
+
+    coverage = context.line_coverage
+    if coverage is None:
+        return needs_patch
+    return lambda path: needs_patch(path) or path in coverage
+
+
+def render_summary(
+    changed: Sequence[Dict],
+    repo: str,
+    head_sha: Optional[str],
+    context: Optional[SummaryContext] = None,
+) -> Tuple[str, List[str]]:
+    """Summary comment body (ending in its digest tag) and the inferred labels."""
+
+    context = context or load_context()
     impacts, labels = collect_area_impacts(changed)
-    coverage_pct, coverage_note, adversarial_summary = load_eval_metrics()
     diffstat_md = build_diffstat(changed)
-    junit_md = collect_junit_summary()
 
-    prompt_entries = load_prompt_entries()
-    impacted_ids, impacted_owners, impacted_domains, related_doc_prompts = collect_prompt_impacts(changed, prompt_entries)
-    prompt_map = prompts_by_id(prompt_entries)
+    impacted, impacted_owners, impacted_domains, related_doc_prompts = collect_prompt_impacts(
+        changed, context.prompt_index
+    )
 
     owner_labels = {f"owner:{slugify_label(owner)}" for owner in impacted_owners}
     domain_labels = {f"domain:{slugify_label(domain)}" for domain in impacted_domains}
@@ -540,22 +652,24 @@ def main() -> int:
 
     related_docs_md = format_related_prompts(related_doc_prompts)
 
-    impacted_prompts_md = format_impacted_prompts(sorted(impacted_ids), prompt_map)
+    impacted_prompts_md = format_impacted_prompts(impacted)
+
+    coverage_report = diff_coverage(changed, context.line_coverage) if context.line_coverage else None
+    diff_coverage_line, diff_coverage_details = format_diff_coverage(coverage_report)
 
     run_id = os.environ.get("GITHUB_RUN_ID")
     run_url = f"https://github.com/{repo}/actions/runs/{run_id}" if run_id else None
     
-    # GitHub Pages base URL for reports
-    pages_base = f"https://{repo.split('/')[0].lower()}.github.io/{repo.split('/')[1]}"
-    
     artifact_lines: List[str] = []
     if run_url:
         artifact_lines.append(f"- Actions run: {run_url}")
     
-    # Add GitHub Pages links for HTML reports
-    artifact_lines.append(f"- 📊 [Coverage Report]({pages_base}/coverage/)")
-    artifact_lines.append(f"- 🛡️ [Adversarial Analysis]({pages_base}/adversarial/)")
-    artifact_lines.append(f"- 📋 [JUnit Results]({pages_base}/junit/)")
+    # Add GitHub Pages links for HTML reports (unknown repo in local --base mode)
+    if "/" in repo:
+        pages_base = f"https://{repo.split('/')[0].lower()}.github.io/{repo.split('/')[1]}"
+        artifact_lines.append(f"- 📊 [Coverage Report]({pages_base}/coverage/)")
+        artifact_lines.append(f"- 🛡️ [Adversarial Analysis]({pages_base}/adversarial/)")
+        artifact_lines.append(f"- 📋 [JUnit Results]({pages_base}/junit/)")
     
     # Legacy artifact detection
     for candidate in [
@@ -569,30 +683,240 @@ def main() -> int:
     
     artifacts_md = "\n".join(artifact_lines) if artifact_lines else "- _none detected_"
 
-    head_sha = os.environ.get("GITHUB_SHA")
     head_tag = f"<!-- head:{head_sha} -->" if head_sha else ""
 
     body = build_summary_body(
         changed,
         impacts,
-        coverage_pct,
-        coverage_note,
-        adversarial_summary,
+        context.coverage_pct,
+        context.coverage_note,
+        context.adversarial_summary,
         diffstat_md,
         sorted(impacted_owners),
         sorted(impacted_domains),
         related_docs_md,
         impacted_prompts_md,
-        junit_md,
+        context.junit_md,
         artifacts_md,
         head_tag,
+        context.junit_details_md,
+        diff_coverage_line,
+        diff_coverage_details,
     )
+    labels_sorted = sorted(labels)
+    if labels_sorted:
+        body += f"\n<!-- labels:{','.join(labels_sorted)} -->"
+    return f"{body}\n<!-- digest:{body_digest(body, labels_sorted)} -->", labels_sorted
+
+
+def log_status(message: str) -> None:
+    print(f"[pr-summary] {message}")
+
+
+def upsert_comment(
+    client: GitHubClient,
+    repo: str,
+    pr_number: str,
+    body: str,
+    labels: Sequence[str],
+    existing: Optional[dict],
+    log: Callable[[str], None] = log_status,
+    current_labels: Optional[AbstractSet[str]] = None,
+) -> None:
+    """Send only what changed: the comment when its digest or head tag differs, and the label delta.
+
+    A comment whose digest matches but whose head tag is stale is still
+    rewritten, so the next run at the same head short-circuits. Labels
+    missing from ``current_labels`` are added in one POST. Labels a
+    previous summary applied that are no longer inferred are deleted;
+    labels added by people are never removed. The writes run concurrently.
+    """
+
+    wanted = set(labels)
+    current = set(current_labels) if current_labels is not None else set()
+    to_add = sorted(wanted - current)
+    to_remove = sorted((applied_labels(existing and existing.get("body")) & current) - wanted)
+    previous = existing.get("body", "") if existing else ""
+    content_changed = not existing or tag_value(previous, "digest") != tag_value(body, "digest")
+    comment_changed = content_changed or tag_value(previous, "head") != tag_value(body, "head")
+
+    if not comment_changed and not to_add and not to_remove:
+        log("No-op: summary and labels unchanged, skipping comment update.")
+        return
+
+    def write_comment() -> None:
+        if existing:
+            client.request(
+                "PATCH",
+                f"/repos/{repo}/issues/comments/{existing['id']}",
+                json_body={"body": body},
+            )
+            log("Updated existing summary comment." if content_changed else "Moved summary head tag.")
+        else:
+            client.request(
+                "POST",
+                f"/repos/{repo}/issues/{pr_number}/comments",
+                json_body={"body": body},
+            )
+            log("Posted new summary comment.")
+
+    def add_labels() -> None:
+        client.request("POST", f"/repos/{repo}/issues/{pr_number}/labels", json_body={"labels": to_add})
+        log("Applied labels: " + ", ".join(to_add))
+
+    def remove_label(name: str) -> None:
+        try:
+            client.request("DELETE", f"/repos/{repo}/issues/{pr_number}/labels/{quote(name, safe='')}")
+        except GitHubError as exc:
+            if exc.status != 404:  # already gone
+                raise
+        log(f"Removed label: {name}")
+
+    writes: List[Tuple[Callable[..., None], Tuple[str, ...]]] = []
+    if comment_changed:
+        writes.append((write_comment, ()))
+    if to_add:
+        writes.append((add_labels, ()))
+    writes.extend((remove_label, (name,)) for name in to_remove)
+    if not wanted and not to_remove:
+        log("No labels inferred.")
+
+    with ThreadPoolExecutor(len(writes)) as pool:
+        for future in [pool.submit(fn, *args) for fn, args in writes]:
+            future.result()
+
+
+def summarize_pr(
+    client: GitHubClient,
+    repo: str,
+    pr_number: str,
+    head_sha: Optional[str],
+    context: Optional[SummaryContext] = None,
+    *,
+    post: bool = True,
+    changed: Optional[Sequence[Dict]] = None,
+    log: Callable[[str], None] = log_status,
+) -> Optional[str]:
+    """Render and (unless ``post`` is False) upsert one PR's summary; returns the body.
+
+    Cheapest checks first: an existing comment already tagged with
+    ``head_sha`` ends the call before any file listing or rendering.
+    ``changed`` skips the API file listing (local ``--base`` mode).
+    """
+
+    existing, current_labels = None, set()
+    if post:
+        existing, current_labels = fetch_pr_state(client, repo, pr_number)
+        if head_sha and existing and tag_value(existing.get("body", ""), "head") == head_sha:
+            log("No-op: same HEAD SHA, skipping comment update.")
+            return None
+
+    if changed is None:
+        changed = normalize_files(fetch_changed_files(client, repo, pr_number))
+        if changed:
+            context = context or load_context()
+            attach_prompt_changes(changed, context.prompt_index, api_file_reader(client, repo, pr_number))
+    if not changed:
+        log("No file changes detected.")
+        return None
+
+    body, labels = render_summary(changed, repo, head_sha, context)
+    if post:
+        upsert_comment(client, repo, pr_number, body, labels, existing, log, current_labels)
+    return body
+
+
+def list_open_prs(client: GitHubClient, repo: str) -> List[dict]:
+    return client.paginate(f"/repos/{repo}/pulls", {"state": "open"})
+
+
+def summarize_open_prs(
+    client: GitHubClient,
+    repo: str,
+    context: Optional[SummaryContext] = None,
+    *,
+    post: bool = True,
+    workers: int = BATCH_WORKERS,
+) -> Dict[str, Optional[str]]:
+    """Summarize every open PR concurrently over one session and one loaded context."""
+
+    context = context or load_context()
+    pulls = list_open_prs(client, repo)
 
-    if CLI_ARGS.no_post:
+    def run(pr: dict) -> Optional[str]:
+        number = str(pr["number"])
+
+        def log(message: str) -> None:
+            print(f"[pr-summary] #{number}: {message}")
+
+        try:
+            return summarize_pr(client, repo, number, (pr.get("head") or {}).get("sha"), context, post=post, log=log)
+        except Exception as exc:  # noqa: BLE001 - one failing PR must not stop the batch
+            log(f"FAILED: {exc}")
+            raise
+
+    results: Dict[str, Optional[str]] = {}
+    failures = 0
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        futures = [(str(pr["number"]), pool.submit(run, pr)) for pr in pulls]
+        for number, future in futures:
+            try:
+                results[number] = future.result()
+            except Exception:  # noqa: BLE001
+                failures += 1
+    if failures:
+        raise RuntimeError(f"{failures} of {len(pulls)} PR summaries failed")
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="VaultMesh PR summary generator")
+    parser.add_argument("--no-post", action="store_true", help="Preview only; do not post comment or labels")
+    parser.add_argument("--base", help="Summarize the local git diff BASE...HEAD instead of asking the API")
+    parser.add_argument("--head", default="HEAD", help="Head revision for --base (default: HEAD)")
+    parser.add_argument("--all-open", action="store_true", help="Refresh the summary of every open PR")
+    parser.add_argument("--jobs", type=int, default=BATCH_WORKERS, help="Concurrent PRs for --all-open")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    posting = not args.no_post
+
+    if args.all_open:
+        repo = require_env("GITHUB_REPOSITORY")
+        client = shared_client(require_env("GITHUB_TOKEN"))
+        try:
+            bodies = summarize_open_prs(client, repo, post=posting, workers=args.jobs)
+        except RuntimeError as exc:
+            print(f"[pr-summary] {exc}", file=sys.stderr)
+            return 1
+        if not posting:
+            for number, body in sorted(bodies.items(), key=lambda item: int(item[0])):
+                if body:
+                    print(f"<!-- PR #{number} -->\n{body}\n")
+        return 0
+
+    context = changed = None  # API mode loads the context only once past the head-SHA check
+    if args.base:
+        context = load_context()
+        changed = local_changed_files(args.base, args.head, patch_filter(context))
+        attach_prompt_changes(changed, context.prompt_index, local_file_reader(args.base, args.head))
+    if not posting and changed is not None:  # offline preview: no token, no network
+        if not changed:
+            log_status("No file changes detected.")
+            return 0
+        body, _ = render_summary(changed, os.environ.get("GITHUB_REPOSITORY", ""), os.environ.get("GITHUB_SHA"), context)
         print(body)
         return 0
 
-    upsert_comment(repo, pr_number, body, token, sorted(labels), head_sha)
+    repo = require_env("GITHUB_REPOSITORY")
+    client = shared_client(require_env("GITHUB_TOKEN"))
+    pr_number = resolve_pr_number()
+    body = summarize_pr(client, repo, pr_number, os.environ.get("GITHUB_SHA"), context,
+                        post=posting, changed=changed)
+    if not posting and body:
+        print(body)
     return 0
 
 
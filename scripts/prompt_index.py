@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Persistent prompt reverse-dependency index for impact analysis.
+
+``prompts/index.json`` is folded into three maps: prompt id → (owner,
+domain, linked doc paths), doc path → prompt ids and owner → prompt ids.
+The result is kept in ``.cache/prompt-index.json`` under the sha256 of
+index.json, so it is rebuilt only when that file changes, and a rebuild
+reuses the record of every prompt whose entry is unchanged.
+
+Two versions of index.json are compared structurally, by a digest of each
+prompt's entry, so any edited field is attributed to exactly that prompt
+and pure formatting changes impact nothing.
+
+Usage:
+  python scripts/prompt_index.py --doc docs/SIGNALS.md
+  python scripts/prompt_index.py --owner maintainers
+  python scripts/prompt_index.py --diff origin/main     # prompts changed since REV
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from link_graph import resolve_target
+
+PROMPT_INDEX_PATH = Path("prompts/index.json")
+CACHE_PATH = Path(".cache/prompt-index.json")
+CACHE_VERSION = 3  # 3: links resolved lexically against prompts/index.json
+
+
+class PromptRecord(NamedTuple):
+    owner: Optional[str]
+    domain: Optional[str]
+    links: Tuple[str, ...]
+    digest: str
+
+
+def entry_digest(entry: dict) -> str:
+    canonical = json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def prompt_id(entry: dict) -> Optional[str]:
+    ident = entry.get("id") or entry.get("title")
+    return str(ident) if ident else None
+
+
+def resolve_link(link: str) -> Optional[str]:
+    """Repo-relative path of a prompt link, resolved against ``prompts/index.json``.
+
+    ``../docs/X.md`` is ``docs/X.md`` and ``/docs/X.md`` is repo-absolute.
+    Resolution is purely lexical, so cached records never depend on which
+    files exist. External URLs and paths outside the repository give None.
+    """
+
+    resolved = resolve_target(PROMPT_INDEX_PATH.as_posix(), link)
+    if resolved is None or resolved.path == ".." or resolved.path.startswith("../"):
+        return None
+    return resolved.path
+
+
+def doc_links(entry: dict) -> Tuple[str, ...]:
+    """Repo-relative doc paths referenced by an entry's ``links``."""
+
+    skip = {".", PROMPT_INDEX_PATH.parent.as_posix(), PROMPT_INDEX_PATH.as_posix()}  # bare anchors, "./"
+    paths: List[str] = []
+    for link in entry.get("links") or []:
+        if not isinstance(link, str):
+            continue
+        path = resolve_link(link)
+        if path and path not in skip and path not in paths:
+            paths.append(path)
+    return tuple(paths)
+
+
+def make_record(entry: dict, digest: Optional[str] = None) -> PromptRecord:
+    owner, domain = entry.get("owner"), entry.get("domain")
+    return PromptRecord(
+        str(owner) if owner else None,
+        str(domain) if domain else None,
+        doc_links(entry),
+        digest or entry_digest(entry),
+    )
+
+
+def parse_entries(text: str) -> List[dict]:
+    try:
+        data = json.loads(text) if text.strip() else {}
+    except json.JSONDecodeError:
+        return []
+    prompts = data.get("prompts") if isinstance(data, dict) else None
+    return [entry for entry in prompts if isinstance(entry, dict)] if isinstance(prompts, list) else []
+
+
+class PromptIndex:
+    """Prompt records plus doc → prompts and owner → prompts lookups."""
+
+    def __init__(self, sha256: str, prompts: Dict[str, PromptRecord]) -> None:
+        self.sha256 = sha256
+        self.prompts = prompts
+        self.docs: Dict[str, Set[str]] = {}
+        self.owners: Dict[str, Set[str]] = {}
+        for ident, record in prompts.items():
+            for path in record.links:
+                self.docs.setdefault(path, set()).add(ident)
+            if record.owner:
+                self.owners.setdefault(record.owner, set()).add(ident)
+
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[dict],
+        sha256: str = "",
+        previous: Optional["PromptIndex"] = None,
+    ) -> "PromptIndex":
+        """Index ``entries``, reusing ``previous`` records whose entry digest is unchanged."""
+
+        known = previous.prompts if previous is not None else {}
+        prompts: Dict[str, PromptRecord] = {}
+        for entry in entries:
+            ident = prompt_id(entry)
+            if not ident:
+                continue
+            digest = entry_digest(entry)
+            old = known.get(ident)
+            prompts[ident] = old if old is not None and old.digest == digest else make_record(entry, digest)
+        return cls(sha256, prompts)
+
+    @classmethod
+    def from_text(cls, text: str, previous: Optional["PromptIndex"] = None) -> "PromptIndex":
+        sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if previous is not None and previous.sha256 == sha256:
+            return previous
+        return cls.from_entries(parse_entries(text), sha256, previous)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PromptIndex":
+        prompts = {
+            ident: PromptRecord(item.get("owner"), item.get("domain"), tuple(item.get("links") or ()), item["digest"])
+            for ident, item in (data.get("prompts") or {}).items()
+        }
+        return cls(data.get("sha256", ""), prompts)
+
+    def to_json(self) -> dict:
+        return {
+            "version": CACHE_VERSION,
+            "sha256": self.sha256,
+            "prompts": {ident: {**record._asdict(), "links": list(record.links)} for ident, record in sorted(self.prompts.items())},
+            "docs": {path: sorted(ids) for path, ids in sorted(self.docs.items())},
+            "owners": {owner: sorted(ids) for owner, ids in sorted(self.owners.items())},
+        }
+
+    def get(self, ident: str) -> Optional[PromptRecord]:
+        return self.prompts.get(ident)
+
+    def prompts_for_doc(self, path: str) -> Set[str]:
+        return self.docs.get(path, set())
+
+    def prompts_for_owner(self, owner: str) -> Set[str]:
+        return self.owners.get(owner, set())
+
+
+def changed_prompts(old: PromptIndex, new: PromptIndex) -> Dict[str, PromptRecord]:
+    """Prompts added, removed or edited between two index versions (removed ones keep their old record)."""
+
+    changes: Dict[str, PromptRecord] = {}
+    for ident, record in new.prompts.items():
+        before = old.prompts.get(ident)
+        if before is None or before.digest != record.digest:
+            changes[ident] = record
+    for ident, record in old.prompts.items():
+        if ident not in new.prompts:
+            changes[ident] = record
+    return changes
+
+
+def load_prompt_index(
+    path: Path = PROMPT_INDEX_PATH,
+    cache_path: Path = CACHE_PATH,
+    *,
+    write: bool = True,
+) -> PromptIndex:
+    """Index of the current ``path``, from the cache unless the file changed since it was built."""
+
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        raw = b""
+    sha256 = hashlib.sha256(raw).hexdigest()
+
+    cached: Optional[PromptIndex] = None
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            cached = PromptIndex.from_json(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        cached = None
+    if cached is not None and cached.sha256 == sha256:
+        return cached
+
+    index = PromptIndex.from_entries(parse_entries(raw.decode("utf-8", "replace")), sha256, cached)
+    if write:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index.to_json(), indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, cache_path)
+    return index
+
+
+def read_revision(rev: str, path: str) -> Optional[str]:
+    """``path`` as of git revision ``rev`` (None if git cannot show it)."""
+
+    try:
+        result = subprocess.run(["git", "show", f"{rev}:{path}"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.decode("utf-8", "replace")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the persistent prompt index")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--doc", help="Prompts linking to this doc path")
+    group.add_argument("--owner", help="Prompts owned by this owner")
+    group.add_argument("--diff", metavar="REV", help="Prompts changed between REV and the working tree")
+    args = parser.parse_args(argv)
+
+    index = load_prompt_index()
+    if args.doc or args.owner:
+        ids = index.prompts_for_doc(args.doc) if args.doc else index.prompts_for_owner(args.owner)
+        for ident in sorted(ids):
+            print(ident)
+        return 0
+    if args.diff:
+        text = read_revision(args.diff, PROMPT_INDEX_PATH.as_posix())
+        if text is None:
+            print(f"[prompt-index] cannot read {PROMPT_INDEX_PATH} at {args.diff}", file=sys.stderr)
+            return 1
+        old = PromptIndex.from_text(text, index)
+        for ident, record in sorted(changed_prompts(old, index).items()):
+            state = "removed" if ident not in index.prompts else "added" if ident not in old.prompts else "changed"
+            print(f"{ident}\t{state}\towner={record.owner or 'n/a'}\tdomain={record.domain or 'n/a'}")
+        return 0
+
+    print(f"[prompt-index] {len(index.prompts)} prompts · {len(index.docs)} linked docs · "
+          f"{len(index.owners)} owners ({CACHE_PATH})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
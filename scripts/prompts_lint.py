@@ -5,25 +5,31 @@ from __future__ import annotations
 
 import json
 import re
-from datetime import datetime
 from pathlib import Path
 
+from link_graph import LinkGraph, build_graph, resolve_target
+from timestamps import parse_date
+from vault_catalog import open_catalog
+
 REQUIRED_FIELDS = ["owner", "domain", "eval_tag", "summary", "last_reviewed", "links"]
 DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 
-def validate_links(root: Path, ident: str, links: list[str]) -> list[str]:
+def validate_links(root: Path, ident: str, links: list[str], graph: LinkGraph) -> list[str]:
     errors: list[str] = []
     for target in links:
         if not isinstance(target, str):
             errors.append(f"{ident} link entry must be string (got {type(target).__name__})")
             continue
-        if "://" in target:
+        resolved = resolve_target("", target)
+        if resolved is None or not resolved.path:
             continue
-        candidate = target.split("#", 1)[0]
-        if not candidate:
+        reason = graph.check(resolved)
+        if reason == "missing file" and (root / resolved.path).exists():
             continue
-        if not (root / candidate).exists():
+        if reason == "missing anchor":
+            errors.append(f"{ident} link anchor not found: {target}")
+        elif reason:
             errors.append(f"{ident} link target not found: {target}")
     return errors
 
@@ -47,6 +53,9 @@ def main() -> int:
         return 0
 
     errors: list[str] = []
+    with open_catalog() as catalog:
+        documents = {row["path"] for row in catalog.documents()}
+        graph = build_graph(catalog)
 
     for item in prompts:
         if not isinstance(item, dict):
@@ -54,7 +63,7 @@ def main() -> int:
             continue
         ident = item.get("id") or item.get("title") or "<unknown>"
         path_value = item.get("path")
-        if path_value:
+        if path_value and path_value not in documents:
             if not (root / path_value).exists():
                 errors.append(f"{ident} references missing path {path_value}")
         for field in REQUIRED_FIELDS:
@@ -68,16 +77,13 @@ def main() -> int:
             elif field == "last_reviewed":
                 if not isinstance(value, str) or not DATE_PATTERN.match(value.strip()):
                     errors.append(f"{ident} last_reviewed must be YYYY-MM-DD (got {value!r})")
-                else:
-                    try:
-                        datetime.strptime(value.strip(), "%Y-%m-%d")
-                    except ValueError:
-                        errors.append(f"{ident} last_reviewed is not a valid date ({value})")
+                elif parse_date(value) is None:
+                    errors.append(f"{ident} last_reviewed is not a valid date ({value})")
             elif field == "links":
                 if not isinstance(value, list):
                     errors.append(f"{ident} links must be a list")
                 else:
-                    errors.extend(validate_links(root, ident, value))
+                    errors.extend(validate_links(root, ident, value, graph))
 
     if errors:
         print("[prompts] FAILED with the following issues:")
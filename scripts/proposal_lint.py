@@ -12,11 +12,14 @@ Usage:
   python scripts/proposal_lint.py --schema docs/schemas/proposal.schema.json --strict
 """
 import argparse
+import contextlib
 import json
 import os
 import re
 import sys
-from glob import glob
+
+from file_inventory import glob as inventory_glob
+from schema_engine import Issue, PassCache, Result, ValidationEngine, add_output_args, write_report
 
 
 ID_PATTERNS = [
@@ -56,14 +59,6 @@ def load_schema(schema_path):
         return json.load(f)
 
 
-def validate_schema(obj, schema):
-    """Validate object against JSON schema."""
-    from jsonschema import Draft202012Validator
-    validator = Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(obj), key=lambda e: e.path)
-    return errors
-
-
 def find_id(obj, default=''):
     """Extract proposal ID from object."""
     if isinstance(obj, dict):
@@ -92,40 +87,69 @@ def main():
     parser = argparse.ArgumentParser(description="VaultMesh proposal linter")
     parser.add_argument('--schema', required=True, help="Path to proposal schema")
     parser.add_argument('--strict', action='store_true', help='Fail on warnings')
+    add_output_args(parser)
     args = parser.parse_args()
 
+    if args.format == 'text' or args.output:
+        code, report = lint(args)
+    else:
+        # Keep stdout clean for the machine-readable report
+        with contextlib.redirect_stdout(sys.stderr):
+            code, report = lint(args)
+    write_report(report, args, 'proposal_lint', args.schema)
+    return code
+
+
+def lint(args):
+    """Lint every proposal; returns (exit code, per-file results)."""
+
     # Find all proposal files
-    files = sorted([
-        *glob('proposals/*.yml'), 
-        *glob('proposals/*.yaml'),
-        *glob('proposals/*.json'), 
-        *glob('proposals/*.md')
-    ])
+    files = [
+        str(path) for path in inventory_glob(
+            'proposals/*.yml',
+            'proposals/*.yaml',
+            'proposals/*.json',
+            'proposals/*.md',
+        )
+    ]
 
     if not files:
         print("No proposals found under proposals/. OK.")
-        return 0
+        return 0, []
 
     # Load schema
     try:
         schema = load_schema(args.schema)
     except FileNotFoundError:
         print(f"❌ Schema file not found: {args.schema}")
-        return 1
+        return 1, []
     except Exception as e:
         print(f"❌ Error loading schema: {e}")
-        return 1
+        return 1, []
 
     failures = 0
     warnings = 0
     valid_proposals = []
+    report = []
 
-    # Validate each proposal
+    parsed = {}
     for filepath in files:
         try:
-            obj = load_yaml_or_json(filepath)
+            parsed[filepath] = load_yaml_or_json(filepath)
         except Exception as e:
-            print(f"❌ {filepath}: cannot parse ({e})")
+            parsed[filepath] = e
+    with ValidationEngine(schema, jobs=args.jobs, cache=None if args.no_cache else PassCache()) as engine:
+        checked = dict(zip(
+            [path for path, obj in parsed.items() if not isinstance(obj, Exception)],
+            engine.validate_many([(path, obj) for path, obj in parsed.items() if not isinstance(obj, Exception)]),
+        ))
+
+    # Validate each proposal
+    for filepath in files:
+        obj = parsed[filepath]
+        if isinstance(obj, Exception):
+            print(f"❌ {filepath}: cannot parse ({obj})")
+            report.append(Result(filepath, False, (Issue('$', f"cannot parse ({obj})", 'parse'),)))
             failures += 1
             continue
 
@@ -144,14 +168,11 @@ def main():
                       f"recommend P-YYYY-NNN or YYYY-NNN")
         
         # Schema validation
-        schema_errors = validate_schema(obj, schema)
-        if schema_errors:
-            for error in schema_errors:
-                path = "$" + "".join([
-                    f"[{repr(p)}]" if isinstance(p, int) else f".{p}" 
-                    for p in error.path
-                ])
-                errors.append(f"{path}: {error.message}")
+        report.append(Result(filepath, not errors and checked[filepath].ok,
+                             tuple(Issue('$', error, 'lint') for error in errors) + checked[filepath].issues,
+                             checked[filepath].cached))
+        for issue in checked[filepath].issues:
+            errors.append(f"{issue.path}: {issue.message}")
 
         # Report results
         if errors:
@@ -174,10 +195,10 @@ def main():
     if failures or (warnings and args.strict):
         result = 'FAIL' if failures else 'WARN(strict)'
         print(f"\nResult: {result} — failures={failures} warnings={warnings}")
-        return 1
+        return 1, report
     
     print(f"\nResult: PASS — failures={failures} warnings={warnings}")
-    return 0
+    return 0, report
 
 
 if __name__ == '__main__':
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Batch JSON Schema validation with compiled validators and a pass cache.
+
+Each schema is compiled once per process, keyed by the sha256 of its
+canonical JSON, and large batches fan out over a process pool that lives as
+long as the engine (workers compile the schema once in their initializer;
+close the engine, or use it as a context manager, to shut the pool down and
+save the cache). Documents that already passed a given schema are remembered
+in ``.cache/validation.json`` under ``<schema hash>:<document hash>`` (the
+newest CACHE_LIMIT keys) and skipped on later runs. Results can be emitted
+as JSON or SARIF 2.1.0 for CI annotations.
+
+Used by signal_validate.py, proposal_lint.py and validate_json.py.
+
+Usage:
+  python scripts/schema_engine.py docs/schemas/signal.schema.json signals/*.json --format sarif
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+CACHE_PATH = Path(".cache/validation.json")
+PARALLEL_THRESHOLD = 512  # below this, pool start-up costs more than it saves
+CHUNK_SIZE = 256
+CACHE_LIMIT = 100_000  # pass-cache keys kept; the oldest are dropped on save
+
+
+class Issue(NamedTuple):
+    path: str
+    message: str
+    keyword: str
+
+
+class Result(NamedTuple):
+    label: str
+    ok: bool
+    issues: Tuple[Issue, ...]
+    cached: bool = False
+
+
+def canonical_hash(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def json_path(parts: Iterable[Any]) -> str:
+    """``$.a[0].b`` style location for a jsonschema error path."""
+
+    return "$" + "".join(f"[{p!r}]" if isinstance(p, int) else f".{p}" for p in parts)
+
+
+def schema_key(schema: dict, draft: Optional[type] = None) -> str:
+    """Hash of a schema together with the draft class it is validated under."""
+
+    return canonical_hash([schema, draft.__name__ if draft else None])
+
+
+_COMPILED: Dict[str, Any] = {}
+
+
+def compile_schema(schema: dict, draft: Optional[type] = None):
+    """Validator for ``schema``, built once per process per schema hash.
+
+    The draft follows the schema's ``$schema`` unless ``draft`` is given.
+    Raises ImportError when jsonschema is not installed.
+    """
+
+    key = schema_key(schema, draft)
+    validator = _COMPILED.get(key)
+    if validator is None:
+        from jsonschema.validators import Draft202012Validator, validator_for
+
+        cls = draft or validator_for(schema, default=Draft202012Validator)
+        validator = _COMPILED[key] = cls(schema)
+    return validator
+
+
+def check(validator, doc: Any) -> Tuple[Issue, ...]:
+    errors = sorted(validator.iter_errors(doc), key=lambda e: [str(p) for p in e.path])
+    return tuple(Issue(json_path(e.path), e.message, str(e.validator)) for e in errors)
+
+
+_WORKER_VALIDATOR = None
+
+
+def _init_worker(schema: dict, draft: Optional[type]) -> None:
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = compile_schema(schema, draft)
+
+
+def _check_chunk(docs: Sequence[Any]) -> List[Tuple[Issue, ...]]:
+    return [check(_WORKER_VALIDATOR, doc) for doc in docs]
+
+
+class PassCache:
+    """``schema_hash:doc_hash`` keys that validated cleanly, oldest first, bounded by ``limit``."""
+
+    def __init__(self, path: Path = CACHE_PATH, limit: int = CACHE_LIMIT) -> None:
+        self.path = path
+        self.limit = limit
+        try:
+            self.keys: Dict[str, None] = dict.fromkeys(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            self.keys = {}
+        self._dirty = False
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def add(self, key: str) -> None:
+        if key not in self.keys:
+            self.keys[key] = None
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        keys = list(self.keys)[-self.limit:]
+        self.keys = dict.fromkeys(keys)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(keys), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+class ValidationEngine:
+    """Validate many documents against one schema; ``close()`` ends the pool and saves the cache."""
+
+    def __init__(
+        self,
+        schema: dict,
+        *,
+        draft: Optional[type] = None,
+        jobs: Optional[int] = None,
+        cache: Optional[PassCache] = None,
+    ) -> None:
+        self.schema = schema
+        self.draft = draft
+        self.schema_hash = schema_key(schema, draft)
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ValidationEngine":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.cache is not None:
+            self.cache.save()
+
+    def _workers(self) -> ProcessPoolExecutor:
+        """The engine's process pool, started on first use and reused by later batches."""
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.jobs, initializer=_init_worker, initargs=(self.schema, self.draft))
+        return self._pool
+
+    def validate(self, label: str, doc: Any) -> Result:
+        return self.validate_many([(label, doc)])[0]
+
+    def validate_many(self, items: Iterable[Tuple[str, Any]]) -> List[Result]:
+        """Results in input order; cached passes are not re-validated."""
+
+        items = list(items)
+        results: List[Optional[Result]] = [None] * len(items)
+        pending: List[int] = []
+        keys: List[Optional[str]] = [None] * len(items)
+        for i, (label, doc) in enumerate(items):
+            if self.cache is not None:
+                keys[i] = f"{self.schema_hash}:{canonical_hash(doc)}"
+                if keys[i] in self.cache:
+                    results[i] = Result(label, True, (), cached=True)
+                    continue
+            pending.append(i)
+
+        docs = [items[i][1] for i in pending]
+        if self.jobs > 1 and len(docs) >= PARALLEL_THRESHOLD:
+            chunks = [docs[n:n + CHUNK_SIZE] for n in range(0, len(docs), CHUNK_SIZE)]
+            outcomes = [issues for chunk in self._workers().map(_check_chunk, chunks) for issues in chunk]
+        else:
+            validator = compile_schema(self.schema, self.draft)
+            outcomes = [check(validator, doc) for doc in docs]
+
+        for i, issues in zip(pending, outcomes):
+            results[i] = Result(items[i][0], not issues, issues)
+            if not issues and self.cache is not None:
+                self.cache.add(keys[i])
+        return results  # type: ignore[return-value]
+
+
+def split_label(label: str) -> Tuple[str, Optional[int]]:
+    """``path:lineno`` labels (segment records) → (path, line)."""
+
+    path, sep, line = label.rpartition(":")
+    if sep and line.isdigit():
+        return path, int(line)
+    return label, None
+
+
+def summarize(results: Sequence[Result]) -> Dict[str, int]:
+    return {
+        "documents": len(results),
+        "failures": sum(1 for r in results if not r.ok),
+        "cached": sum(1 for r in results if r.cached),
+    }
+
+
+def to_json(results: Sequence[Result], schema_path: str = "", summary: Optional[Dict[str, int]] = None) -> dict:
+    """JSON report; pass ``summary`` when ``results`` holds only some of the documents (e.g. failures)."""
+
+    return {
+        "schema": schema_path,
+        "summary": summary or summarize(results),
+        "results": [
+            {
+                "document": r.label,
+                "ok": r.ok,
+                "cached": r.cached,
+                "errors": [issue._asdict() for issue in r.issues],
+            }
+            for r in results
+        ],
+    }
+
+
+def to_sarif(results: Sequence[Result], tool: str, schema_path: str = "") -> dict:
+    findings = []
+    for r in results:
+        path, line = split_label(r.label)
+        location: Dict[str, Any] = {"artifactLocation": {"uri": Path(path).as_posix()}}
+        if line is not None:
+            location["region"] = {"startLine": line}
+        for issue in r.issues:
+            findings.append({
+                "ruleId": f"schema/{issue.keyword}",
+                "level": "error",
+                "message": {"text": f"{issue.path}: {issue.message}"},
+                "locations": [{"physicalLocation": location}],
+            })
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": tool, "rules": []}},
+            "properties": {"schema": schema_path},
+            "results": findings,
+        }],
+    }
+
+
+def add_output_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--format", choices=("text", "json", "sarif"), default="text", help="Report format")
+    parser.add_argument("--output", help="Write the JSON/SARIF report here instead of stdout")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-validate documents that passed before")
+
+
+def write_report(
+    results: Sequence[Result],
+    args: argparse.Namespace,
+    tool: str,
+    schema_path: str,
+    summary: Optional[Dict[str, int]] = None,
+) -> None:
+    """Emit ``results`` as JSON/SARIF per ``--format``/``--output`` (no-op for text)."""
+
+    if args.format == "text":
+        return
+    if args.format == "sarif":
+        payload = to_sarif(results, tool, schema_path)
+    else:
+        payload = to_json(results, schema_path, summary)
+    text = json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate JSON documents against a schema")
+    parser.add_argument("schema", help="Schema file")
+    parser.add_argument("documents", nargs="+", help="JSON documents")
+    add_output_args(parser)
+    args = parser.parse_args()
+
+    schema = json.loads(Path(args.schema).read_text(encoding="utf-8"))
+    items = []
+    for path in args.documents:
+        try:
+            items.append((path, json.loads(Path(path).read_text(encoding="utf-8"))))
+        except (OSError, ValueError) as exc:
+            print(f"[schema] ERROR {path} :: cannot parse ({exc})", file=sys.stderr)
+            return 1
+    with ValidationEngine(schema, jobs=args.jobs, cache=None if args.no_cache else PassCache()) as engine:
+        results = engine.validate_many(items)
+    if args.format == "text":
+        for r in results:
+            if r.ok:
+                print(f"[schema] OK {r.label}")
+            for issue in r.issues:
+                print(f"[schema] ERROR {r.label} :: {issue.path} :: {issue.message}")
+    write_report(results, args, "schema_engine", args.schema)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,9 +7,8 @@ import json
 import os
 import sys
 
-import requests
+from github_client import GitHubClient, GitHubError
 
-API_ROOT = "https://api.github.com"
 REPO = os.environ.get("GITHUB_REPOSITORY")
 TOKEN = os.environ.get("GITHUB_TOKEN")
 BRANCH = os.environ.get("BRANCH", "main")
@@ -18,11 +17,6 @@ if not REPO or not TOKEN:
     print("[protect] Missing GITHUB_REPOSITORY or GITHUB_TOKEN", file=sys.stderr)
     sys.exit(1)
 
-HEADERS = {
-    "Authorization": f"token {TOKEN}",
-    "Accept": "application/vnd.github+json",
-}
-
 BODY = {
     "required_status_checks": {
         "strict": False,
@@ -35,11 +29,11 @@ BODY = {
     "restrictions": None,
 }
 
-url = f"{API_ROOT}/repos/{REPO}/branches/{BRANCH}/protection"
-response = requests.put(url, headers=HEADERS, json=BODY, timeout=15)
-
-if response.status_code >= 400:
-    print("[protect] Failed to update branch protection:", response.status_code, response.text, file=sys.stderr)
+client = GitHubClient(TOKEN)
+try:
+    client.request("PUT", f"/repos/{REPO}/branches/{BRANCH}/protection", json_body=BODY)
+except GitHubError as exc:
+    print("[protect] Failed to update branch protection:", exc, file=sys.stderr)
     sys.exit(1)
 
 print(f"[protect] Branch protection updated for {REPO}:{BRANCH}")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Vectorized rolling weighted signal aggregates per tag and scope.
+
+Implements the aggregation step from docs/SIGNALS.md: signal weights (already
+reputation × verification) are combined with an exponential recency decay
+into rolling weighted means, plus week-over-week trend deltas, per tag and
+per scope. Signals arrive as NumPy views over SignalColumns; weekly totals come from
+one ``np.bincount`` grouped reduction per dimension and the decay is a
+recurrence over the week axis vectorized across every tag/scope at once.
+
+Usage:
+  python scripts/signal_aggregates.py --week 2025-39
+  python scripts/signal_aggregates.py --all --out eval-results/signal-aggregates.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from signal_columns import SignalColumns, week_index, week_label
+
+DEFAULT_HALF_LIFE_WEEKS = 2.0
+DEFAULT_WINDOW_WEEKS = 8
+
+
+class SignalTable:
+    """Columnar signal arrays: one row per signal plus exploded (signal, tag) pairs."""
+
+    def __init__(
+        self,
+        week: np.ndarray,
+        weight: np.ndarray,
+        scope: np.ndarray,
+        pair_signal: np.ndarray,
+        pair_tag: np.ndarray,
+        tags: List[str],
+        scopes: List[str],
+    ) -> None:
+        self.week = week
+        self.weight = weight
+        self.scope = scope
+        self.pair_signal = pair_signal
+        self.pair_tag = pair_tag
+        self.tags = tags
+        self.scopes = scopes
+
+    def __len__(self) -> int:
+        return int(self.week.shape[0])
+
+    @classmethod
+    def from_columns(cls, columns: SignalColumns) -> "SignalTable":
+        """Wrap SignalColumns without copying; tags expand via the CSR offsets."""
+
+        views = columns.numpy()
+        per_signal = np.diff(views["tag_offsets"])
+        return cls(
+            views["week"],
+            views["weight"],
+            views["scope"],
+            np.repeat(np.arange(len(columns), dtype=np.int64), per_signal),
+            views["tag"],
+            list(columns.tags.values),
+            list(columns.scopes.values),
+        )
+
+
+class Aggregates:
+    """Per-key weekly matrices (keys × weeks) for one dimension."""
+
+    def __init__(self, keys: List[str], first_week: int, counts: np.ndarray, sums: np.ndarray, half_life: float) -> None:
+        self.keys = keys
+        self.first_week = first_week
+        self.counts = counts
+        self.sums = sums
+        alpha = 0.5 ** (1.0 / half_life)
+        decayed_sum = np.empty_like(sums)
+        decayed_count = np.empty_like(sums)
+        running_sum = np.zeros(len(keys))
+        running_count = np.zeros(len(keys))
+        for col in range(sums.shape[1]):
+            running_sum = alpha * running_sum + sums[:, col]
+            running_count = alpha * running_count + counts[:, col]
+            decayed_sum[:, col] = running_sum
+            decayed_count[:, col] = running_count
+        self.decayed_weight = decayed_sum
+        self.rolling_mean = np.divide(
+            decayed_sum, decayed_count, out=np.zeros_like(decayed_sum), where=decayed_count > 0
+        )
+        self.weight_delta = np.diff(sums, axis=1, prepend=0.0)
+        self.mean_delta = np.diff(self.rolling_mean, axis=1, prepend=0.0)
+
+    def for_week(self, label: str, limit: Optional[int] = None) -> List[dict]:
+        """Rows for ``label`` ordered by decayed weight (keys with no history are omitted)."""
+
+        col = week_index(label) - self.first_week
+        if col < 0 or col >= self.sums.shape[1]:
+            return []
+        decayed = self.decayed_weight[:, col]
+        live = np.nonzero(decayed > 0)[0]
+        order = sorted(live.tolist(), key=lambda k: (-decayed[k], self.keys[k]))
+        if limit is not None:
+            order = order[:limit]
+        return [
+            {
+                "key": self.keys[k],
+                "count": int(self.counts[k, col]),
+                "weight": round(float(self.sums[k, col]), 6),
+                "decayed_weight": round(float(self.decayed_weight[k, col]), 6),
+                "rolling_mean": round(float(self.rolling_mean[k, col]), 6),
+                "weight_delta": round(float(self.weight_delta[k, col]), 6),
+                "mean_delta": round(float(self.mean_delta[k, col]), 6),
+            }
+            for k in order
+        ]
+
+
+def _grouped(keys: List[str], key_ids: np.ndarray, weeks: np.ndarray, weights: np.ndarray,
+             first_week: int, span: int, half_life: float) -> Aggregates:
+    flat = key_ids.astype(np.int64) * span + (weeks - first_week)
+    size = len(keys) * span
+    counts = np.bincount(flat, minlength=size).astype(np.float64).reshape(len(keys), span)
+    sums = np.bincount(flat, weights=weights, minlength=size).reshape(len(keys), span)
+    return Aggregates(keys, first_week, counts, sums, half_life)
+
+
+def aggregate(table: SignalTable, half_life: float = DEFAULT_HALF_LIFE_WEEKS) -> Dict[str, Aggregates]:
+    """Compute tag and scope aggregates over the table's full week span."""
+
+    if len(table) == 0:
+        empty = np.zeros((0, 1))
+        return {
+            "tags": Aggregates([], 0, empty, empty, half_life),
+            "scopes": Aggregates([], 0, empty, empty, half_life),
+        }
+    first_week = int(table.week.min())
+    span = int(table.week.max()) - first_week + 1
+    pair_week = table.week[table.pair_signal]
+    pair_weight = table.weight[table.pair_signal]
+    return {
+        "tags": _grouped(table.tags, table.pair_tag, pair_week, pair_weight, first_week, span, half_life),
+        "scopes": _grouped(table.scopes, table.scope, table.week, table.weight, first_week, span, half_life),
+    }
+
+
+def from_totals(
+    totals: Mapping[int, "tuple[Mapping[str, float], Mapping[str, float]]"],
+    first_week: int,
+    span: int,
+    half_life: float = DEFAULT_HALF_LIFE_WEEKS,
+) -> Aggregates:
+    """Aggregates from per-week ``(counts, weight sums)`` keyed by week index.
+
+    Used by callers that already keep running weekly totals (the ingest
+    watcher) instead of a full SignalTable.
+    """
+
+    keys = sorted({key for pair in totals.values() for mapping in pair for key, _ in mapping.items()})
+    position = {key: row for row, key in enumerate(keys)}
+    counts = np.zeros((len(keys), span))
+    sums = np.zeros((len(keys), span))
+    for week, (week_counts, week_sums) in totals.items():
+        col = week - first_week
+        if not 0 <= col < span:
+            continue
+        for key, value in week_counts.items():
+            counts[position[key], col] = value
+        for key, value in week_sums.items():
+            sums[position[key], col] = value
+    return Aggregates(keys, first_week, counts, sums, half_life)
+
+
+def window_weeks(targets: Iterable[str], window: int = DEFAULT_WINDOW_WEEKS) -> List[str]:
+    """Target weeks plus the ``window - 1`` weeks of history each one needs."""
+
+    needed = set()
+    for label in targets:
+        index = week_index(label)
+        needed.update(week_label(i) for i in range(index - window + 1, index + 1))
+    return sorted(needed)
+
+
+def week_report(aggregates: Mapping[str, Aggregates], label: str, half_life: float, limit: Optional[int] = None) -> dict:
+    """JSON-ready aggregate artifact for one week."""
+
+    return {
+        "week": label,
+        "half_life_weeks": half_life,
+        "tags": aggregates["tags"].for_week(label, limit),
+        "scopes": aggregates["scopes"].for_week(label, limit),
+    }
+
+
+def load_signals(weeks: Optional[Iterable[str]] = None, store=None) -> SignalColumns:
+    """Load signals once into a SignalColumns table (for vectorized aggregation)."""
+
+    from generate_weekly_digest import iter_signals  # the digest imports this module lazily too
+
+    columns = SignalColumns()
+    for week, obj, source in iter_signals(weeks, store):
+        columns.append(obj, week, source)
+    return columns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VaultMesh rolling signal aggregates")
+    parser.add_argument("--week", help="YYYY-WW to report (default: every week with signals)")
+    parser.add_argument("--all", action="store_true", help="Report every week with signals")
+    parser.add_argument("--half-life", type=float, default=DEFAULT_HALF_LIFE_WEEKS, help="Decay half-life in weeks")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_WEEKS, help="Weeks of history per target week")
+    parser.add_argument("--out", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    columns = load_signals(None if args.all or not args.week else window_weeks([args.week], args.window))
+    targets = [args.week] if args.week else columns.weeks()
+    aggregates = aggregate(SignalTable.from_columns(columns), args.half_life)
+    payload = [week_report(aggregates, label, args.half_life) for label in targets]
+    text = json.dumps(payload[0] if args.week else payload, indent=2) + "\n"
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[aggregates] wrote {args.out}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Compact columnar in-memory signal representation.
+
+A ``json.load`` dict per signal (plus a digest row dict) costs well over a
+kilobyte once keys, tag lists and repeated tag strings are counted. Here
+signals live in typed ``array`` columns instead: ids, titles, scopes, tags
+and sources are interned into string pools and stored as integer codes,
+tags use a CSR layout (offsets + codes), and rows are read back through a
+``__slots__`` view that also supports ``row['weight']`` item access so
+existing digest code works unchanged. Columns expose zero-copy NumPy views
+for vectorized aggregation when NumPy is installed.
+
+Usage:
+  python scripts/signal_columns.py --bench 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence
+
+UNSCOPED = "unscoped"
+NO_ID = "(no-id)"
+_WEEK_ZERO = date(1970, 1, 5)  # first ISO Monday of the epoch
+
+
+def week_index(label: str) -> int:
+    """Consecutive integer for ISO week ``YYYY-WW`` (Monday-anchored)."""
+
+    year, week = label.split("-", 1)
+    monday = date.fromisocalendar(int(year), int(week), 1)
+    return (monday - _WEEK_ZERO).days // 7
+
+
+def week_label(index: int) -> str:
+    iso = (_WEEK_ZERO + timedelta(weeks=int(index))).isocalendar()
+    return f"{iso[0]}-{iso[1]:02d}"
+
+
+class StringPool:
+    """Interned strings addressed by dense integer codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(sys.intern(value))
+        return code
+
+
+class SignalRow:
+    """Read-only view of one row; ``row.weight`` and ``row['weight']`` both work."""
+
+    __slots__ = ("_cols", "_index")
+
+    def __init__(self, cols: "SignalColumns", index: int) -> None:
+        self._cols = cols
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._cols.ids.values[self._cols.id_code[self._index]]
+
+    @property
+    def title(self) -> str:
+        return self._cols.titles.values[self._cols.title_code[self._index]]
+
+    @property
+    def weight(self) -> float:
+        return self._cols.weight[self._index]
+
+    @property
+    def week(self) -> str:
+        return week_label(self._cols.week[self._index])
+
+    @property
+    def scope(self) -> str:
+        return self._cols.scopes.values[self._cols.scope_code[self._index]]
+
+    @property
+    def source(self) -> str:
+        return self._cols.sources.values[self._cols.source_code[self._index]]
+
+    @property
+    def tags(self) -> List[str]:
+        cols = self._cols
+        start, stop = cols.tag_offsets[self._index], cols.tag_offsets[self._index + 1]
+        return [cols.tags.values[code] for code in cols.tag_code[start:stop]]
+
+    def __getitem__(self, name: str):
+        if name not in _ROW_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        return self[name] if name in _ROW_FIELDS else default
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in _ROW_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"SignalRow(id={self.id!r}, week={self.week!r}, weight={self.weight!r})"
+
+
+_ROW_FIELDS = ("id", "title", "weight", "tags", "scope", "week", "source")
+
+
+class SignalColumns:
+    """Append-only columnar signal store (one row per signal)."""
+
+    def __init__(self) -> None:
+        self.ids = StringPool()
+        self.titles = StringPool()
+        self.scopes = StringPool()
+        self.tags = StringPool()
+        self.sources = StringPool()
+        self.id_code = array("l")
+        self.title_code = array("l")
+        self.week = array("l")
+        self.weight = array("d")
+        self.scope_code = array("l")
+        self.source_code = array("l")
+        self.tag_offsets = array("l", [0])
+        self.tag_code = array("l")
+
+    def __len__(self) -> int:
+        return len(self.week)
+
+    def __iter__(self) -> Iterator[SignalRow]:
+        return (SignalRow(self, i) for i in range(len(self)))
+
+    def row(self, index: int) -> SignalRow:
+        return SignalRow(self, index)
+
+    def append(self, obj: Mapping, week: str, source: str = "") -> int:
+        """Add one signal record for ISO ``week``; returns its row index."""
+
+        ident = obj.get("id") or NO_ID
+        title = obj.get("title") or obj.get("summary") or obj.get("id") or os.path.basename(source)
+        self.id_code.append(self.ids.code(str(ident)))
+        self.title_code.append(self.titles.code(str(title)))
+        self.week.append(week_index(week))
+        self.weight.append(float(obj.get("weight", 1)))
+        self.scope_code.append(self.scopes.code(str(obj.get("scope") or UNSCOPED)))
+        self.source_code.append(self.sources.code(source))
+        for tag in obj.get("tags") or []:
+            self.tag_code.append(self.tags.code(str(tag)))
+        self.tag_offsets.append(len(self.tag_code))
+        return len(self.week) - 1
+
+    def extend(self, records: Iterable[Mapping], week: str, source: str = "") -> None:
+        for obj in records:
+            if isinstance(obj, dict):
+                self.append(obj, week, source)
+
+    def duplicate_ids(self) -> int:
+        """Rows reusing a real id already seen (rows without an id never count)."""
+
+        missing = self.ids._codes.get(NO_ID)
+        anonymous = self.id_code.count(missing) if missing is not None else 0
+        distinct = len(self.ids) - (missing is not None)
+        return len(self) - anonymous - distinct
+
+    def weeks(self) -> List[str]:
+        return [week_label(index) for index in sorted(set(self.week))]
+
+    def by_week(self) -> Dict[str, List[int]]:
+        """Row indices grouped by ISO week label."""
+
+        groups: Dict[int, List[int]] = {}
+        for row, index in enumerate(self.week):
+            groups.setdefault(index, []).append(row)
+        return {week_label(index): rows for index, rows in sorted(groups.items())}
+
+    def rows(self, indices: Sequence[int]) -> List[SignalRow]:
+        return [SignalRow(self, i) for i in indices]
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the numeric columns (pools excluded)."""
+
+        columns = (
+            self.id_code, self.title_code, self.week, self.weight, self.scope_code,
+            self.source_code, self.tag_offsets, self.tag_code,
+        )
+        return sum(col.itemsize * len(col) for col in columns)
+
+    def numpy(self) -> Dict[str, "object"]:
+        """Zero-copy NumPy views of the numeric columns (requires numpy).
+
+        The views pin the underlying buffers: drop them before appending rows.
+        """
+
+        import numpy as np
+
+        def view(col: array):
+            return np.frombuffer(col, dtype=np.dtype(col.typecode)) if len(col) else np.zeros(0, dtype=col.typecode)
+
+        return {
+            "week": view(self.week),
+            "weight": view(self.weight),
+            "scope": view(self.scope_code),
+            "tag_offsets": view(self.tag_offsets),
+            "tag": view(self.tag_code),
+        }
+
+
+def synthetic_records(count: int) -> Iterator[dict]:
+    """Deterministic signal-shaped dicts for benchmarks."""
+
+    tags = ["governance", "signals", "ci", "docs", "security", "federation", "tem", "ops"]
+    for i in range(count):
+        yield {
+            "id": f"sig-{i:08d}",
+            "title": f"Signal {i % 5000}",
+            "weight": float(i % 17) / 4,
+            "timestamp": "2025-09-22T10:00:00Z",
+            "tags": [tags[i % 8], tags[(i * 3) % 8]],
+            "scope": ("ops", "docs", "mesh")[i % 3],
+        }
+
+
+def measure(count: int) -> Dict[str, float]:
+    """Per-signal traced allocation for list-of-dicts vs. columnar storage."""
+
+    def traced(build):
+        gc.collect()
+        tracemalloc.start()
+        held = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del held
+        return size
+
+    as_dicts = traced(lambda: [json.loads(json.dumps(obj)) for obj in synthetic_records(count)])
+
+    def columnar():
+        cols = SignalColumns()
+        for obj in synthetic_records(count):
+            cols.append(json.loads(json.dumps(obj)), "2025-39", "signals/segments/2025-39.jsonl")
+        return cols
+
+    as_columns = traced(columnar)
+    return {
+        "signals": count,
+        "dict_bytes_per_signal": as_dicts / count,
+        "columnar_bytes_per_signal": as_columns / count,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Columnar signal memory benchmark")
+    parser.add_argument("--bench", type=int, default=100_000, metavar="N", help="Synthetic signals to load")
+    args = parser.parse_args()
+    result = measure(args.bench)
+    print(f"[columns] {result['signals']} signal(s)")
+    print(f"[columns] list of dicts: {result['dict_bytes_per_signal']:.0f} B/signal")
+    print(f"[columns] columnar:      {result['columnar_bytes_per_signal']:.0f} B/signal")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Persisted query index over signal segments and loose signal files.
+
+The index (.cache/signals/index.db, SQLite) keeps one row per signal with just
+the fields queries filter on (id, timestamp, weight, week, scope) plus a
+locator (source path, byte offset), a row → tag table, and three access paths
+as B-tree indexes:
+
+- (ts, row), for range lookups (--from/--to)
+- (tag, row), the posting lists (--tag, all given tags must match)
+- (weight, row), for threshold lookups and top-K (--min/--max-weight)
+
+A query is one SQL statement; SQLite starts from the most selective index and
+checks the remaining filters on the matching rows only, so neither the corpus
+nor the access paths are loaded into memory. Only result rows are read back
+from their source (for the title). Segments are append-only, so an update
+reads each segment from its last indexed byte offset; a rewritten segment
+(new inode) or changed loose file is re-indexed, and rows of vanished sources
+are deleted.
+
+Usage:
+  python scripts/signal_index.py update
+  python scripts/signal_index.py query --tag governance --min-weight 2 --from 2025-07-01 --to 2025-09-30
+  python scripts/signal_index.py query --top 5 --format csv
+  python scripts/signal_index.py query --group-by tag
+  python scripts/signal_store.py query --count          # same command via the store CLI
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+
+from signal_store import SIGNALS_DIR, SegmentStore, iso_year_week, signal_timestamp
+from timestamps import epoch_seconds as epoch, parse_timestamp
+
+
+INDEX_PATH = os.path.join('.cache', 'signals', 'index.db')
+INDEX_VERSION = 2
+GROUP_FIELDS = ('tag', 'week', 'scope', 'source')
+MAX_BIND = 500  # rows per IN (...) lookup, well under SQLite's bind-parameter limit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    weight REAL NOT NULL,
+    week TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    source TEXT NOT NULL,
+    offset INTEGER
+);
+CREATE TABLE IF NOT EXISTS tags (
+    row INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    ino INTEGER,
+    size INTEGER,
+    stamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_ts ON signals(ts, row);
+CREATE INDEX IF NOT EXISTS idx_signals_weight ON signals(weight, row);
+CREATE INDEX IF NOT EXISTS idx_signals_source ON signals(source);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag, row);
+CREATE INDEX IF NOT EXISTS idx_tags_row ON tags(row);
+"""
+
+
+def parse_bound(value, end=False):
+    """Epoch seconds for a --from/--to value; a bare date as --to covers the whole day."""
+    dt = parse_timestamp(value)
+    if dt is None:
+        raise argparse.ArgumentTypeError(f"invalid date/time {value!r}")
+    if end and len(value) == 10:
+        dt += timedelta(days=1) - timedelta(microseconds=1)
+    return epoch(dt)
+
+
+def where(tags=(), start=None, end=None, min_weight=None, max_weight=None, scope=None):
+    """SQL condition on ``signals s`` and its parameters for the query filters."""
+    clauses, params = [], []
+    for column, op, value in (('ts', '>=', start), ('ts', '<=', end),
+                              ('weight', '>=', min_weight), ('weight', '<=', max_weight), ('scope', '=', scope)):
+        if value is not None:
+            clauses.append(f"s.{column} {op} ?")
+            params.append(value)
+    for tag in dict.fromkeys(tags):
+        clauses.append("s.row IN (SELECT row FROM tags WHERE tag = ?)")
+        params.append(tag)
+    return ' AND '.join(clauses) or '1', params
+
+
+class SignalIndex:
+    """Signal rows, tags and their access paths in one SQLite database."""
+
+    def __init__(self, path=INDEX_PATH, store=None, signals_dir=SIGNALS_DIR):
+        self.path = path
+        self.store = store or SegmentStore(os.path.join(signals_dir, 'segments'))
+        self.signals_dir = signals_dir
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            for table in ('signals', 'tags', 'sources'):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version={INDEX_VERSION}")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT count(*) FROM signals").fetchone()[0]
+
+    # -- maintenance -----------------------------------------------------
+
+    def _add(self, obj, week, source, offset, timestamp):
+        cur = self.conn.execute(
+            "INSERT INTO signals (id, ts, weight, week, scope, source, offset) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (obj.get('id') or '(no-id)', epoch(timestamp), float(obj.get('weight', 1)), week,
+             obj.get('scope') or 'unscoped', source, offset),
+        )
+        tags = dict.fromkeys(str(tag) for tag in obj.get('tags') or [])
+        self.conn.executemany("INSERT INTO tags VALUES (?, ?)", ((cur.lastrowid, tag) for tag in tags))
+
+    def _drop(self, source):
+        """Delete the rows of ``source``; returns how many were retired."""
+        self.conn.execute("DELETE FROM tags WHERE row IN (SELECT row FROM signals WHERE source = ?)", (source,))
+        retired = self.conn.execute("DELETE FROM signals WHERE source = ?", (source,)).rowcount
+        self.conn.execute("DELETE FROM sources WHERE path = ?", (source,))
+        return retired
+
+    def _index_segment(self, week, known):
+        """Index new lines of one segment; returns (rows added, rows retired)."""
+        path = self.store.segment_path(week)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 0, 0
+        entry = known.get(path)
+        retired = 0
+        if entry and entry[0] == st.st_ino and st.st_size >= entry[1]:
+            if st.st_size == entry[1]:
+                return 0, 0
+            start = entry[1]
+        else:
+            retired = self._drop(path)
+            start = 0
+        added = 0
+        with open(path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                line_offset, offset = offset, offset + len(raw)
+                if not raw.endswith(b'\n'):
+                    offset = line_offset  # partial trailing write; pick it up next time
+                    break
+                try:
+                    obj = json.loads(raw)
+                except ValueError:
+                    continue
+                if not isinstance(obj, dict):
+                    continue
+                timestamp = signal_timestamp(obj) or datetime.fromisocalendar(
+                    int(week[:4]), int(week[5:]), 1).replace(tzinfo=timezone.utc)
+                self._add(obj, week, path, line_offset, timestamp)
+                added += 1
+        self.conn.execute("INSERT OR REPLACE INTO sources (path, ino, size) VALUES (?, ?, ?)",
+                          (path, st.st_ino, offset))
+        return added, retired
+
+    def _index_loose(self, path, known):
+        st = os.stat(path)
+        stamp = json.dumps([st.st_ino, st.st_size, st.st_mtime_ns])
+        entry = known.get(path)
+        if entry and entry[2] == stamp:
+            return 0, 0
+        retired = self._drop(path)
+        self.conn.execute("INSERT INTO sources (path, stamp) VALUES (?, ?)", (path, stamp))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            return 0, retired
+        if not isinstance(obj, dict):
+            return 0, retired
+        timestamp = signal_timestamp(obj, path)
+        self._add(obj, iso_year_week(timestamp), path, None, timestamp)
+        return 1, retired
+
+    def update(self):
+        """Bring the index up to date; returns (rows added, rows retired)."""
+        known = {path: (ino, size, stamp) for path, ino, size, stamp in self.conn.execute("SELECT * FROM sources")}
+        added = retired = 0
+        live = set()
+        with self.conn:
+            for week in self.store.weeks():
+                live.add(self.store.segment_path(week))
+                a, r = self._index_segment(week, known)
+                added, retired = added + a, retired + r
+            try:
+                with os.scandir(self.signals_dir) as it:
+                    loose = sorted(e.path for e in it if e.name.endswith('.json') and e.is_file())
+            except FileNotFoundError:
+                loose = []
+            for path in loose:
+                live.add(path)
+                a, r = self._index_loose(path, known)
+                added, retired = added + a, retired + r
+            for source in [s for s in known if s not in live]:
+                retired += self._drop(source)
+        return added, retired
+
+    # -- queries ---------------------------------------------------------
+
+    def query(self, tags=(), start=None, end=None, min_weight=None, max_weight=None, scope=None):
+        """Row ids matching every given filter, in timestamp order."""
+        condition, params = where(tags, start, end, min_weight, max_weight, scope)
+        sql = f"SELECT s.row FROM signals s WHERE {condition} ORDER BY s.ts, s.row"
+        return [row for row, in self.conn.execute(sql, params)]
+
+    def top(self, k, **filters):
+        """Row ids of the ``k`` heaviest matches (ties by id), via the weight index."""
+        condition, params = where(**filters)
+        sql = f"SELECT s.row FROM signals s WHERE {condition} ORDER BY s.weight DESC, s.id LIMIT ?"
+        return [row for row, in self.conn.execute(sql, params + [k])]
+
+    def count(self, **filters):
+        """(matches, summed weight)."""
+        condition, params = where(**filters)
+        count, weight = self.conn.execute(f"SELECT count(*), total(s.weight) FROM signals s WHERE {condition}",
+                                          params).fetchone()
+        return count, round(weight, 6)
+
+    def group(self, field, **filters):
+        """Count and summed weight of the matches per ``field`` value (most frequent first)."""
+        if field not in GROUP_FIELDS:
+            raise ValueError(f"cannot group by {field!r}")
+        condition, params = where(**filters)
+        if field == 'tag':
+            source, key = "signals s JOIN tags t ON t.row = s.row", "t.tag"
+        else:
+            source, key = "signals s", f"s.{field}"
+        sql = (f"SELECT {key}, count(*) AS n, total(s.weight) FROM {source} WHERE {condition} "
+               f"GROUP BY {key} ORDER BY n DESC, {key}")
+        return [
+            {'key': value, 'count': count, 'weight': round(weight, 6)}
+            for value, count, weight in self.conn.execute(sql, params)
+        ]
+
+    def _select_in(self, query, rows):
+        """Rows of ``query`` (with an ``IN ({})`` slot) for ``rows``, in chunks of ``MAX_BIND``."""
+        for start in range(0, len(rows), MAX_BIND):
+            chunk = rows[start:start + MAX_BIND]
+            yield from self.conn.execute(query.format(', '.join('?' * len(chunk))), chunk)
+
+    def describe(self, rows):
+        """Result records for ``rows`` (in the given order); only these rows are loaded."""
+        rows = list(rows)
+        tags = {row: [] for row in rows}
+        for row, tag in self._select_in("SELECT row, tag FROM tags WHERE row IN ({}) ORDER BY rowid", rows):
+            tags[row].append(tag)
+        found = {
+            found[0]: found for found in self._select_in(
+                "SELECT row, id, ts, weight, week, scope, source, offset FROM signals WHERE row IN ({})", rows)
+        }
+        result = []
+        for row in rows:
+            _, ident, ts, weight, week, scope, source, offset = found[row]
+            obj = read_record(source, offset)
+            result.append({
+                'id': ident,
+                'timestamp': datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'week': week,
+                'weight': weight,
+                'scope': scope,
+                'tags': tags[row],
+                'title': obj.get('title') or obj.get('summary') or '',
+                'source': source,
+            })
+        return result
+
+
+def read_record(source, offset):
+    """Read one signal back from its source (segment line or loose file)."""
+    try:
+        with open(source, 'rb') as f:
+            if offset is None:
+                return json.load(f)
+            f.seek(offset)
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return {}
+
+
+def add_query_args(parser):
+    parser.add_argument('--tag', action='append', default=[], help='Require tag (repeatable; all must match)')
+    parser.add_argument('--scope', help='Require scope')
+    parser.add_argument('--from', dest='start', help='Earliest timestamp or date (inclusive)')
+    parser.add_argument('--to', dest='end', help='Latest timestamp or date (inclusive)')
+    parser.add_argument('--min-weight', type=float, help='Minimum weight (inclusive)')
+    parser.add_argument('--max-weight', type=float, help='Maximum weight (inclusive)')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--top', type=int, metavar='K', help='Only the K heaviest matches')
+    output.add_argument('--count', action='store_true', help='Only count matches (and sum weight)')
+    output.add_argument('--group-by', choices=GROUP_FIELDS, help='Count/sum matches per key')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json', help='Output format')
+    parser.add_argument('--index', default=INDEX_PATH, help='Index file')
+    parser.add_argument('--no-update', action='store_true', help='Query the index as persisted')
+
+
+def emit(records, fmt, out=sys.stdout):
+    if fmt == 'json':
+        out.write(json.dumps(records, indent=2, ensure_ascii=False) + '\n')
+        return
+    records = records if isinstance(records, list) else [records]
+    if not records:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(records[0]), lineterminator='\n')
+    writer.writeheader()
+    for record in records:
+        writer.writerow({k: ';'.join(v) if isinstance(v, list) else v for k, v in record.items()})
+
+
+def run_query(args, parser):
+    try:
+        start = parse_bound(args.start) if args.start else None
+        end = parse_bound(args.end, end=True) if args.end else None
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    filters = dict(tags=args.tag, start=start, end=end, min_weight=args.min_weight,
+                   max_weight=args.max_weight, scope=args.scope)
+    with SignalIndex(args.index) as index:
+        if not args.no_update:
+            index.update()
+        if args.count:
+            count, weight = index.count(**filters)
+            emit({'count': count, 'weight': weight}, args.format)
+        elif args.group_by:
+            emit(index.group(args.group_by, **filters), args.format)
+        else:
+            rows = index.top(args.top, **filters) if args.top is not None else index.query(**filters)
+            emit(index.describe(rows), args.format)
+    return 0
+
+
+def main():
+    """Signal index CLI."""
+    parser = argparse.ArgumentParser(description="VaultMesh signal query index")
+    sub = parser.add_subparsers(dest='command', required=True)
+    update_cmd = sub.add_parser('update', help='Index new/changed signals')
+    update_cmd.add_argument('--index', default=INDEX_PATH, help='Index file')
+    query_cmd = sub.add_parser('query', help='Filter, rank or group signals')
+    add_query_args(query_cmd)
+    args = parser.parse_args()
+
+    if args.command == 'update':
+        with SignalIndex(args.index) as index:
+            added, retired = index.update()
+            print(f"[index] +{added} row(s), -{retired} retired, {len(index)} live")
+        return 0
+    return run_query(args, query_cmd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
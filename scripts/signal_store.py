@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Append-only signal segments partitioned by ISO week.
+
+Loose signal files (signals/*.json) are ingested into
+signals/segments/YYYY-WW.jsonl (one JSON record per line) and removed, and
+signals/segments/manifest.json keeps per-segment counts so readers can tell
+which partitions exist without listing or opening them. A weekly digest then
+only has to read the one segment for its week.
+
+Usage:
+  python scripts/signal_store.py ingest [--dry-run]
+  python scripts/signal_store.py stats
+  python scripts/signal_store.py query [filters]   (see scripts/signal_index.py)
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+from file_inventory import glob as inventory_glob
+from timestamps import format_timestamp, parse_timestamp
+
+
+SIGNALS_DIR = 'signals'
+SEGMENTS_DIR = os.path.join(SIGNALS_DIR, 'segments')
+MANIFEST_NAME = 'manifest.json'
+WEEK_RE = re.compile(r'[0-9]{4}-[0-9]{2}')
+
+
+def iso_year_week(dt):
+    """Get ISO year-week string (YYYY-WW) from datetime."""
+    iso = dt.isocalendar()  # (year, week, weekday)
+    return f"{iso[0]}-{iso[1]:02d}"
+
+
+def signal_timestamp(obj, filepath=None):
+    """Timestamp of a signal record, falling back to the source file mtime."""
+    timestamp = parse_timestamp(obj.get('timestamp'))
+    if not timestamp and filepath:
+        mtime = os.path.getmtime(filepath)
+        timestamp = datetime.fromtimestamp(mtime, tz=timezone.utc)
+    return timestamp
+
+
+def encode_record(obj):
+    """Canonical single-line JSON encoding used for segment records."""
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+class SegmentStore:
+    """Week-partitioned JSONL segments plus a small manifest."""
+
+    def __init__(self, root=SEGMENTS_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault('version', 1)
+        data.setdefault('segments', {})
+        return data
+
+    def save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, self.manifest_path)
+
+    def segment_path(self, week):
+        """Segment file for ISO week ``YYYY-WW``; anything else is rejected (no path escapes)."""
+        if not isinstance(week, str) or not WEEK_RE.fullmatch(week):
+            raise ValueError(f"invalid week {week!r} (expected YYYY-WW)")
+        return os.path.join(self.root, f"{week}.jsonl")
+
+    def weeks(self):
+        """Weeks that have a segment (manifest entries plus segment files on disk)."""
+        weeks = set(self.manifest['segments'])
+        try:
+            weeks.update(name[:-len('.jsonl')] for name in os.listdir(self.root) if name.endswith('.jsonl'))
+        except FileNotFoundError:
+            pass
+        return sorted(week for week in weeks if WEEK_RE.fullmatch(week))
+
+    def iter_week(self, week):
+        """Yield the signal records stored in the segment for ``week``."""
+        if week not in self.manifest['segments'] and not os.path.exists(self.segment_path(week)):
+            return
+        try:
+            f = open(self.segment_path(week), 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def segment_info(self, week):
+        """Manifest entry for ``week``; a segment missing from the manifest is counted from disk."""
+        entry = self.manifest['segments'].get(week)
+        if entry is not None:
+            return entry
+        try:
+            size = os.path.getsize(self.segment_path(week))
+        except OSError:
+            size = 0
+        return {'count': sum(1 for _ in self.iter_week(week)), 'bytes': size}
+
+    def ids_in_week(self, week):
+        return {obj.get('id') for obj in self.iter_week(week) if obj.get('id')}
+
+    def rewrite(self, week, records):
+        """Atomically replace the week's segment with ``records`` (sync conflicts)."""
+        os.makedirs(self.root, exist_ok=True)
+        path = self.segment_path(week)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for obj in records:
+                f.write(encode_record(obj) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self.manifest['segments'][week] = {'count': len(records), 'bytes': os.path.getsize(path)}
+        return len(records)
+
+    def append(self, week, records):
+        """Append ``records`` to the week's segment; returns the number written."""
+        if not records:
+            return 0
+        os.makedirs(self.root, exist_ok=True)
+        path = self.segment_path(week)
+        with open(path, 'a', encoding='utf-8') as f:
+            for obj in records:
+                f.write(encode_record(obj) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        entry = self.manifest['segments'].setdefault(week, {'count': 0})
+        entry['count'] = entry.get('count', 0) + len(records)
+        entry['bytes'] = os.path.getsize(path)
+        return len(records)
+
+
+def loose_signal_files():
+    """Signal files not yet ingested into a segment."""
+    return [str(path) for path in inventory_glob(f'{SIGNALS_DIR}/*.json')]
+
+
+def ingest(store, files, dry_run=False):
+    """Move loose signal files into their week segment; returns (moved, skipped)."""
+    by_week = {}
+    sources = {}
+    skipped = 0
+    for filepath in files:
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                obj = json.load(f)
+        except Exception as e:
+            print(f"⚠️ {filepath}: not ingested ({e})")
+            skipped += 1
+            continue
+        if not isinstance(obj, dict):
+            print(f"⚠️ {filepath}: not ingested (not an object)")
+            skipped += 1
+            continue
+        timestamp = signal_timestamp(obj, filepath)
+        if parse_timestamp(obj.get('timestamp')) is None:
+            # Persist the mtime fallback; the source file disappears after ingest
+            obj['timestamp'] = timestamp.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        else:
+            # Store the RFC 3339 form so segment readers never take the slow parse path
+            obj['timestamp'] = format_timestamp(timestamp)
+        week = iso_year_week(timestamp)
+        by_week.setdefault(week, []).append(obj)
+        sources.setdefault(week, []).append(filepath)
+
+    moved = 0
+    for week in sorted(by_week):
+        existing = store.ids_in_week(week)
+        fresh = []
+        for obj in by_week[week]:
+            ident = obj.get('id')
+            if ident and ident in existing:
+                continue
+            if ident:
+                existing.add(ident)
+            fresh.append(obj)
+        if dry_run:
+            print(f"[segments] would append {len(fresh)} record(s) to {store.segment_path(week)}")
+            continue
+        store.append(week, fresh)
+        for filepath in sources[week]:
+            os.remove(filepath)
+        moved += len(sources[week])
+        print(f"[segments] {week}: +{len(fresh)} record(s) from {len(sources[week])} file(s)")
+
+    if not dry_run and moved:
+        store.save_manifest()
+    return moved, skipped
+
+
+def main():
+    """Segment store CLI."""
+    parser = argparse.ArgumentParser(description="VaultMesh signal segment store")
+    sub = parser.add_subparsers(dest='command', required=True)
+    ingest_cmd = sub.add_parser('ingest', help='Move loose signals/*.json into week segments')
+    ingest_cmd.add_argument('--dry-run', action='store_true', help='Report without writing')
+    sub.add_parser('stats', help='Show per-week segment counts')
+    query_cmd = sub.add_parser('query', help='Query signals through the persisted index')
+    from signal_index import add_query_args, run_query
+    add_query_args(query_cmd)
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        return run_query(args, query_cmd)
+
+    store = SegmentStore()
+    if args.command == 'ingest':
+        files = loose_signal_files()
+        if not files:
+            print("No loose signals/*.json to ingest. OK.")
+            return 0
+        moved, skipped = ingest(store, files, dry_run=args.dry_run)
+        print(f"[segments] ingested {moved} file(s), skipped {skipped}")
+        return 1 if skipped else 0
+
+    for week in store.weeks():
+        entry = store.segment_info(week)
+        print(f"{week}: {entry.get('count', 0)} signal(s), {entry.get('bytes', 0)} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Bounded-memory streaming summaries for weekly signal digests.
+
+Signals are folded one at a time into a per-week :class:`WeekSummary`: a
+count and weight sum, a ``heapq`` top-K of the heaviest signals, and tag /
+scope counters. Memory is O(K + distinct tags) per week no matter how many
+signals stream past. For very large weeks the exact tag counters can be
+swapped for a sketch:
+
+- ``space-saving``: Metwally et al. heavy hitters with ``capacity`` counters;
+  every tag whose true count exceeds n / capacity is retained.
+- ``count-min``: a width × depth Count-Min sketch (estimates never under-count)
+  plus a small candidate set of the current heaviest tags.
+
+Both sketches hash with blake2b so leaderboards are stable across runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from signal_columns import UNSCOPED
+
+SKETCHES = ("exact", "space-saving", "count-min")
+
+
+class Ranked:
+    """Top-K heap entry; orders "worse" first so heap[0] is the one to evict."""
+
+    __slots__ = ("weight", "title", "id", "seq")
+
+    def __init__(self, weight: float, title: str, ident: str, seq: int) -> None:
+        self.weight = weight
+        self.title = title
+        self.id = ident
+        self.seq = seq
+
+    def __lt__(self, other: "Ranked") -> bool:
+        if self.weight != other.weight:
+            return self.weight < other.weight
+        if self.title != other.title:
+            return self.title > other.title
+        return self.seq > other.seq  # on full ties the earlier record ranks first
+
+
+class TopK:
+    """The ``k`` heaviest signals, ties broken by title then arrival (digest order)."""
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.heap: List[Ranked] = []
+        self.seen = 0
+
+    def push(self, weight: float, title: str, ident: str) -> None:
+        self.seen += 1
+        if self.k <= 0:
+            return
+        entry = Ranked(weight, title, ident, self.seen)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif self.heap[0] < entry:
+            heapq.heapreplace(self.heap, entry)
+
+    def items(self) -> List[dict]:
+        ranked = sorted(self.heap, key=lambda r: (-r.weight, r.title, r.seq))
+        return [{"id": r.id, "title": r.title, "weight": r.weight} for r in ranked]
+
+
+class ExactCounter(Counter):
+    """Plain Counter with the sketch interface."""
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self[key] += amount
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters over at most ``capacity`` keys (weighted adds)."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []  # lazy: stale entries skipped on pop
+
+    def add(self, key: str, amount: float = 1) -> None:
+        counts = self.counts
+        if key in counts:
+            counts[key] += amount
+        elif len(counts) < self.capacity:
+            counts[key] = amount
+        else:
+            while True:
+                floor, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == floor:
+                    break
+            del counts[victim]
+            counts[key] = floor + amount
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def __getitem__(self, key: str) -> float:
+        return self.counts.get(key, 0)
+
+    def items(self):
+        return self.counts.items()
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked if n is None else ranked[:n]
+
+
+class CountMinTopK:
+    """Count-Min sketch plus the ``candidates`` keys with the largest estimates."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, candidates: int = 64) -> None:
+        if depth > 8:
+            raise ValueError("depth must be <= 8")
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+        self.candidates: Dict[str, float] = {}
+        self.limit = candidates
+
+    def _cells(self, key: str) -> List[int]:
+        raw = hashlib.blake2b(key.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(raw[4 * i:4 * i + 4], "little") % self.width for i in range(self.depth)]
+
+    def add(self, key: str, amount: float = 1) -> None:
+        estimate = None
+        for row, cell in zip(self.table, self._cells(key)):
+            row[cell] += amount
+            estimate = row[cell] if estimate is None else min(estimate, row[cell])
+        if key in self.candidates or len(self.candidates) < self.limit:
+            self.candidates[key] = estimate
+            return
+        floor_key = min(self.candidates, key=self.candidates.__getitem__)
+        if estimate > self.candidates[floor_key]:
+            del self.candidates[floor_key]
+            self.candidates[key] = estimate
+
+    def __getitem__(self, key: str) -> float:
+        return min(row[cell] for row, cell in zip(self.table, self._cells(key)))
+
+    def items(self):
+        return self.candidates.items()
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        ranked = sorted(self.candidates.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked if n is None else ranked[:n]
+
+
+def make_counter(sketch: str = "exact", capacity: int = 256):
+    if sketch == "exact":
+        return ExactCounter()
+    if sketch == "space-saving":
+        return SpaceSaving(capacity)
+    if sketch == "count-min":
+        return CountMinTopK(candidates=capacity)
+    raise ValueError(f"unknown sketch {sketch!r} (expected one of {', '.join(SKETCHES)})")
+
+
+class WeekSummary:
+    """Streaming digest state for one ISO week."""
+
+    __slots__ = ("count", "weight", "top", "tags", "tag_weights", "scopes", "scope_weights", "ids")
+
+    def __init__(self, top: int = 10, sketch: str = "exact", capacity: int = 256, dedupe_ids: bool = False) -> None:
+        self.count = 0
+        self.weight = 0.0
+        self.top = TopK(top)
+        self.tags = make_counter(sketch, capacity)
+        self.tag_weights = make_counter(sketch, capacity)
+        self.scopes = ExactCounter()
+        self.scope_weights = ExactCounter()
+        self.ids = set() if dedupe_ids else None
+
+    def add(self, obj: Mapping, source: str = "") -> bool:
+        """Fold one record in; returns False for an id already counted (dedupe mode)."""
+
+        ident = obj.get("id")
+        if self.ids is not None and ident:
+            if ident in self.ids:
+                return False
+            self.ids.add(ident)
+        weight = float(obj.get("weight", 1))
+        title = obj.get("title") or obj.get("summary") or ident or os.path.basename(source)
+        self.count += 1
+        self.weight += weight
+        self.top.push(weight, str(title), ident or "(no-id)")
+        for tag in obj.get("tags") or []:
+            self.tags.add(tag)
+            self.tag_weights.add(tag, weight)
+        scope = str(obj.get("scope") or UNSCOPED)
+        self.scopes.add(scope)
+        self.scope_weights.add(scope, weight)
+        return True
+
+    def top_signals(self) -> List[dict]:
+        return self.top.items()
+
+    def top_tags(self, n: int = 12) -> List[Tuple[str, float]]:
+        return self.tags.most_common(n)
+
+
+def summarize(records: Iterable[Tuple[str, Mapping, str]], **options) -> Dict[str, WeekSummary]:
+    """Fold a ``(week, record, source)`` stream into per-week summaries."""
+
+    weeks: Dict[str, WeekSummary] = {}
+    for week, obj, source in records:
+        summary = weeks.get(week)
+        if summary is None:
+            summary = weeks[week] = WeekSummary(**options)
+        summary.add(obj, source)
+    return weeks
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Merkle-tree replication of signal segments between federation nodes.
+
+Each node's week segments (signals/segments/YYYY-WW.jsonl) are summarised as
+a three-level Merkle tree: root → ISO week → id-hash bucket (first byte of
+sha256(id)) → leaves (id → sha256 of the canonical record). Two nodes compare
+roots, then only the week and bucket hashes that differ, and finally the
+leaves of differing buckets, so a reconciliation touches O(difference) nodes
+and records rather than the whole corpus. Per-week bucket hashes are cached
+under .cache/merkle/ keyed by segment size/mtime, so an unchanged segment is
+not re-read to answer a peer.
+
+Merge rule (deterministic and symmetric, so both sides converge): records
+are matched by id within a week; for a conflict the record with the later
+timestamp wins, ties broken by the greater canonical encoding.
+
+Peers are either another segments directory on disk or a node serving the
+JSON-lines protocol over TCP (``serve``). A served node is read-only unless
+started with ``--allow-writes``, which also requires a shared secret in
+SIGNAL_SYNC_TOKEN; when the secret is set, every request must carry it.
+Records received from a peer are validated against the signal schema before
+they are merged, and week labels must be ``YYYY-WW``.
+
+Usage:
+  python scripts/signal_sync.py root
+  python scripts/signal_sync.py serve --port 8765 [--allow-writes]
+  python scripts/signal_sync.py sync ../other-node/signals/segments
+  python scripts/signal_sync.py sync 127.0.0.1:8765 [--dry-run] [--pull-only]
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from schema_engine import ValidationEngine, compile_schema
+from signal_store import SEGMENTS_DIR, SegmentStore, encode_record
+from timestamps import epoch_seconds, parse_timestamp
+
+
+CACHE_DIR = os.path.join('.cache', 'merkle')
+SCHEMA_PATH = os.path.join('docs', 'schemas', 'signal.schema.json')
+TOKEN_ENV = 'SIGNAL_SYNC_TOKEN'
+
+
+def load_validator(path=SCHEMA_PATH):
+    """Schema engine for incoming records, or None without the schema or jsonschema."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        compile_schema(schema)
+    except (OSError, ValueError, ImportError):
+        return None
+    return ValidationEngine(schema, jobs=1)
+
+
+def digest(pairs):
+    """Hash of sorted (key, child hash) pairs."""
+    h = hashlib.sha256()
+    for key, value in sorted(pairs):
+        h.update(f"{key}\0{value}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+def record_hash(obj):
+    return hashlib.sha256(encode_record(obj).encode('utf-8')).hexdigest()
+
+
+def leaf_key(obj):
+    """Leaf identity: the signal id, or the content hash for id-less records."""
+    ident = obj.get('id')
+    return str(ident) if ident else f"sha256:{record_hash(obj)}"
+
+
+def bucket_of(key):
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:2]
+
+
+def merge_key(obj):
+    timestamp = parse_timestamp(obj.get('timestamp'))
+    stamp = float('-inf') if timestamp is None else epoch_seconds(timestamp)
+    return stamp, encode_record(obj)
+
+
+def winner(a, b):
+    """Deterministic conflict resolution between two versions of one record."""
+    return a if merge_key(a) >= merge_key(b) else b
+
+
+class SegmentTree:
+    """Merkle view over a SegmentStore, serving the peer protocol locally."""
+
+    def __init__(self, store, cache_dir=CACHE_DIR, validator=None):
+        self.store = store
+        self.validator = validator
+        key = hashlib.sha1(os.path.abspath(store.root).encode('utf-8')).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"{key}.json")
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+        self._dirty = False
+
+    def _stamp(self, week):
+        try:
+            st = os.stat(self.store.segment_path(week))
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def records(self, week):
+        """id → winning record for ``week`` (duplicate ids resolved by merge rule)."""
+        merged = {}
+        for obj in self.store.iter_week(week):
+            if not isinstance(obj, dict):
+                continue
+            key = leaf_key(obj)
+            merged[key] = winner(merged[key], obj) if key in merged else obj
+        return merged
+
+    def _hashes(self, week):
+        """Cached ``{'stamp', 'buckets', 'leaves'}`` for ``week``; leaves are grouped by bucket prefix."""
+        stamp = self._stamp(week)
+        entry = self.cache.get(week)
+        if entry and stamp and entry['stamp'] == stamp and 'leaves' in entry:
+            return entry
+        leaves = {}
+        for key, obj in self.records(week).items():
+            leaves.setdefault(bucket_of(key), {})[key] = record_hash(obj)
+        entry = {
+            'stamp': stamp,
+            'buckets': {prefix: digest(pairs.items()) for prefix, pairs in leaves.items()},
+            'leaves': leaves,
+        }
+        if stamp:
+            self.cache[week] = entry
+            self._dirty = True
+        return entry
+
+    def buckets(self, week):
+        """Bucket prefix → hash for ``week`` (cached while the segment is unchanged)."""
+        return self._hashes(week)['buckets']
+
+    def weeks(self):
+        """Week → hash over its bucket hashes (empty segments omitted)."""
+        result = {}
+        for week in self.store.weeks():
+            buckets = self.buckets(week)
+            if buckets:
+                result[week] = digest(buckets.items())
+        return result
+
+    def root(self):
+        return digest(self.weeks().items())
+
+    def leaves(self, week, prefixes):
+        """Leaf hashes of the given buckets only (from the cache while the segment is unchanged)."""
+        cached = self._hashes(week)['leaves']
+        return {key: value for prefix in set(prefixes) for key, value in cached.get(prefix, {}).items()}
+
+    def fetch(self, week, keys):
+        records = self.records(week)
+        return [records[key] for key in keys if key in records]
+
+    def check(self, week, records):
+        """Reject the whole batch unless every record is an object that passes the schema."""
+        path = self.store.segment_path(week)  # raises on anything but YYYY-WW
+        for i, obj in enumerate(records):
+            if not isinstance(obj, dict):
+                raise ValueError(f"{path}: record {i} is not an object")
+        if self.validator is None:
+            return
+        for result in self.validator.validate_many((f"{week}[{i}]", obj) for i, obj in enumerate(records)):
+            if not result.ok:
+                issue = result.issues[0]
+                raise ValueError(f"invalid record {result.label}: {issue.path}: {issue.message}")
+
+    def put(self, week, records):
+        """Merge ``records`` into ``week``: append new ids, rewrite on conflicts."""
+        if not records:
+            return 0
+        self.check(week, records)
+        current = self.records(week)
+        fresh, replaced = [], False
+        for obj in records:
+            key = leaf_key(obj)
+            if key not in current:
+                current[key] = obj
+                fresh.append(obj)
+            elif record_hash(current[key]) != record_hash(obj):
+                best = winner(current[key], obj)
+                if best is obj:
+                    current[key] = obj
+                    replaced = True
+        if replaced:
+            self.store.rewrite(week, list(current.values()))
+        else:
+            self.store.append(week, fresh)
+        self.store.save_manifest()
+        return len(records)
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+        self._dirty = False
+
+
+class RemotePeer:
+    """Client for a node running ``signal_sync.py serve`` (one JSON request per line)."""
+
+    def __init__(self, host, port, timeout=30.0, token=None):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.stream = self.sock.makefile('rwb')
+        self.token = token
+
+    def _call(self, op, **args):
+        request = {'op': op, 'args': args}
+        if self.token:
+            request['token'] = self.token
+        self.stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError('peer closed the connection')
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise RuntimeError(f"peer error on {op}: {reply.get('error')}")
+        return reply['result']
+
+    def root(self):
+        return self._call('root')
+
+    def weeks(self):
+        return self._call('weeks')
+
+    def buckets(self, week):
+        return self._call('buckets', week=week)
+
+    def leaves(self, week, prefixes):
+        return self._call('leaves', week=week, prefixes=list(prefixes))
+
+    def fetch(self, week, keys):
+        return self._call('fetch', week=week, keys=list(keys))
+
+    def put(self, week, records):
+        return self._call('put', week=week, records=records)
+
+    def save(self):
+        """No-op: the serving node persists its own cache when a connection closes."""
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+READ_OPS = ('root', 'weeks', 'buckets', 'leaves', 'fetch')
+WRITE_OPS = ('put',)
+
+
+class SyncHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    op = request.get('op')
+                    if server.token and not hmac.compare_digest(str(request.get('token') or ''), server.token):
+                        raise PermissionError("unauthorized")
+                    if op in WRITE_OPS and not server.writable:
+                        raise PermissionError(f"{op} refused: read-only peer (serve --allow-writes)")
+                    if op not in READ_OPS + WRITE_OPS:
+                        raise ValueError(f"unknown op {op!r}")
+                    with server.lock:
+                        reply = {'ok': True, 'result': getattr(server.tree, op)(**request.get('args', {}))}
+                except Exception as e:
+                    reply = {'ok': False, 'error': str(e)}
+                self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        finally:
+            with server.lock:
+                server.tree.save()
+
+
+class SyncServer(socketserver.ThreadingTCPServer):
+    """Serves ``tree`` read-only unless ``writable``; ``token`` (if set) is required on every request."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, tree, writable=False, token=None):
+        if writable and not token:
+            raise ValueError("a writable sync server needs a shared token")
+        super().__init__(address, SyncHandler)
+        self.tree = tree
+        self.writable = writable
+        self.token = token
+        self.lock = threading.Lock()
+
+
+def sync(local, peer, dry_run=False, push=True):
+    """Reconcile ``local`` and ``peer`` (both ways unless ``push`` is False); returns exchange statistics."""
+    stats = {'weeks': 0, 'buckets': 0, 'leaves': 0, 'pulled': 0, 'pushed': 0, 'skipped': 0}
+    if local.root() == peer.root():
+        return stats
+    try:
+        _reconcile(local, peer, stats, dry_run, push)
+    finally:
+        local.save()
+        peer.save()
+    return stats
+
+
+def _reconcile(local, peer, stats, dry_run, push):
+    ours, theirs = local.weeks(), peer.weeks()
+    for week in sorted(set(ours) | set(theirs)):
+        if ours.get(week) == theirs.get(week):
+            continue
+        stats['weeks'] += 1
+        our_buckets = local.buckets(week) if week in ours else {}
+        their_buckets = peer.buckets(week) if week in theirs else {}
+        differing = sorted(p for p in set(our_buckets) | set(their_buckets)
+                           if our_buckets.get(p) != their_buckets.get(p))
+        stats['buckets'] += len(differing)
+        our_leaves = local.leaves(week, differing) if our_buckets else {}
+        their_leaves = peer.leaves(week, differing) if their_buckets else {}
+        stats['leaves'] += len(our_leaves) + len(their_leaves)
+
+        changed = sorted(k for k in set(our_leaves) | set(their_leaves)
+                         if our_leaves.get(k) != their_leaves.get(k))
+        if not changed:
+            continue
+        mine = {leaf_key(o): o for o in local.fetch(week, [k for k in changed if k in our_leaves])}
+        yours = {leaf_key(o): o for o in peer.fetch(week, [k for k in changed if k in their_leaves])}
+        to_local, to_peer = [], []
+        for key in changed:
+            a, b = mine.get(key), yours.get(key)
+            best = b if a is None else a if b is None else winner(a, b)
+            if a is None or record_hash(best) != record_hash(a):
+                to_local.append(best)
+            if push and (b is None or record_hash(best) != record_hash(b)):
+                to_peer.append(best)
+        for side, records, counter in ((local, to_local, 'pulled'), (peer, to_peer, 'pushed')):
+            if not records:
+                continue
+            if not dry_run:
+                try:
+                    side.put(week, records)
+                except (ValueError, RuntimeError) as e:  # invalid record, bad week, or refused by the peer
+                    print(f"⚠️ [sync] {week}: not {counter}: {e}", file=sys.stderr)
+                    stats['skipped'] += 1
+                    continue
+            stats[counter] += len(records)
+
+
+def open_peer(spec, validator=None):
+    """A directory path opens a local store; ``host:port`` connects to a server."""
+    if os.path.isdir(spec):
+        return SegmentTree(SegmentStore(spec), validator=validator)
+    host, sep, port = spec.rpartition(':')
+    if not sep or not port.isdigit():
+        raise SystemExit(f"[sync] peer must be a segments directory or host:port, got {spec!r}")
+    return RemotePeer(host or '127.0.0.1', int(port), token=os.environ.get(TOKEN_ENV))
+
+
+def main():
+    """Signal replication CLI."""
+    parser = argparse.ArgumentParser(description="VaultMesh signal Merkle sync")
+    parser.add_argument('--segments', default=SEGMENTS_DIR, help='Local segments directory')
+    parser.add_argument('--schema', default=SCHEMA_PATH, help='Schema that incoming records must pass')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('root', help='Print the local Merkle root and per-week hashes')
+    serve_cmd = sub.add_parser('serve', help='Serve the local tree to peers')
+    serve_cmd.add_argument('--host', default='127.0.0.1')
+    serve_cmd.add_argument('--port', type=int, default=8765)
+    serve_cmd.add_argument('--allow-writes', action='store_true',
+                           help=f'Accept put from peers (requires {TOKEN_ENV})')
+    sync_cmd = sub.add_parser('sync', help='Reconcile with a peer directory or host:port')
+    sync_cmd.add_argument('peer')
+    sync_cmd.add_argument('--dry-run', action='store_true', help='Report without writing either side')
+    sync_cmd.add_argument('--pull-only', action='store_true', help='Never write to the peer (read-only servers)')
+    args = parser.parse_args()
+
+    validator = load_validator(args.schema)
+    if validator is None and args.command != 'root':
+        if args.command == 'serve' and args.allow_writes:
+            print(f"[sync] cannot validate incoming records ({args.schema} or jsonschema missing)", file=sys.stderr)
+            return 1
+        print(f"⚠️ {args.schema} or jsonschema missing: incoming records are not schema-checked", file=sys.stderr)
+    local = SegmentTree(SegmentStore(args.segments), validator=validator)
+    if args.command == 'root':
+        for week, value in sorted(local.weeks().items()):
+            print(f"{week} {value}")
+        print(f"root {local.root()}")
+        local.save()
+        return 0
+
+    if args.command == 'serve':
+        token = os.environ.get(TOKEN_ENV)
+        if args.allow_writes and not token:
+            print(f"[sync] --allow-writes needs a shared secret in {TOKEN_ENV}", file=sys.stderr)
+            return 1
+        with SyncServer((args.host, args.port), local, writable=args.allow_writes, token=token) as server:
+            mode = 'read-write' if args.allow_writes else 'read-only'
+            print(f"[sync] serving {args.segments} {mode} on {args.host}:{server.server_address[1]}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("[sync] stopped")
+        return 0
+
+    peer = open_peer(args.peer, validator)
+    try:
+        stats = sync(local, peer, dry_run=args.dry_run, push=not args.pull_only)
+    finally:
+        if isinstance(peer, RemotePeer):
+            peer.close()
+    pulled, pushed = ('would pull', 'would push') if args.dry_run else ('pulled', 'pushed')
+    print(f"[sync] {stats['weeks']} week(s), {stats['buckets']} bucket(s), {stats['leaves']} leaf hash(es) compared; "
+          f"{pulled} {stats['pulled']}, {pushed} {stats['pushed']}, {stats['skipped']} week(s) skipped")
+    return 1 if stats['skipped'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
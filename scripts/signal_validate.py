@@ -1,15 +1,36 @@
 #!/usr/bin/env python3
 """
-Validate signals/*.json against docs/schemas/signal.schema.json (if present).
+Validate signals/*.json and ingested week segments (signals/segments/*.jsonl)
+against docs/schemas/signal.schema.json (if present).
 Accepts partial records; warns for missing weight/timestamp.
+Schema checks run through the shared batch engine (compiled once, pooled,
+passes cached); --format json|sarif emits a machine-readable report (the
+JSON report lists failing documents only, with counts for the whole run).
+Records stream through validation in batches of BATCH_SIZE; valid ones are
+appended to compact columns (scripts/signal_columns.py) for the closing
+per-week / duplicate-id summary, so parsed dicts never outlive their batch.
 """
 import argparse
 import json
 import os
 import sys
-from glob import glob
 from datetime import datetime, timezone
 
+from file_inventory import glob as inventory_glob
+from schema_engine import (
+    Issue,
+    PassCache,
+    Result,
+    ValidationEngine,
+    add_output_args,
+    compile_schema,
+    write_report,
+)
+from signal_columns import SignalColumns
+from signal_store import iso_year_week, signal_timestamp
+
+BATCH_SIZE = 8192  # records held as dicts at once
+
 
 def load_schema(path):
     """Load JSON schema, return None if not found."""
@@ -23,18 +44,79 @@ def load_schema(path):
         return None
 
 
-def validate_against_schema(obj, schema):
-    """Validate object against schema, return list of errors."""
+class AcceptAll:
+    """Stand-in engine without a schema or jsonschema: every record passes."""
+
+    def validate_many(self, batch):
+        return [Result(label, True, ()) for label, _ in batch]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_validator(schema, jobs=None, cache=None):
+    """Engine whose ``validate_many`` maps (label, obj) batches to results, in order.
+
+    The schema is compiled once and large batches are spread over one process
+    pool kept for the whole run (scripts/schema_engine.py); use it as a context
+    manager so the pool is shut down and the pass cache saved.
+    """
     if not schema:
-        return []
-    
+        return AcceptAll()
     try:
-        from jsonschema import Draft202012Validator
-        validator = Draft202012Validator(schema)
-        return list(validator.iter_errors(obj))
+        compile_schema(schema)
     except ImportError:
         print("⚠️ jsonschema not available, skipping schema validation")
-        return []
+        return AcceptAll()
+    return ValidationEngine(schema, jobs=jobs, cache=cache)
+
+
+def batched(items, size):
+    """Lists of up to ``size`` consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_signal_records(files, segments):
+    """Yield (label, obj, parse_error) for loose files and every segment line."""
+    for filepath in files:
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                yield filepath, json.load(f), None
+        except Exception as e:
+            yield filepath, None, e
+
+    for segment in segments:
+        with open(segment, 'r', encoding='utf-8') as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                label = f"{segment}:{lineno}"
+                try:
+                    yield label, json.loads(line), None
+                except Exception as e:
+                    yield label, None, e
+
+
+def record_week(label, obj):
+    """ISO week of a validated record: its segment's week or its timestamp."""
+    path, _, lineno = label.rpartition(':')
+    if path.endswith('.jsonl') and lineno.isdigit():
+        return os.path.basename(path)[:-len('.jsonl')]
+    timestamp = signal_timestamp(obj, label)
+    return iso_year_week(timestamp) if timestamp else None
 
 
 def main():
@@ -42,48 +124,72 @@ def main():
     parser = argparse.ArgumentParser(description="VaultMesh signals validator")
     parser.add_argument('--schema', default='docs/schemas/signal.schema.json',
                        help="Path to signal schema")
+    add_output_args(parser)
     args = parser.parse_args()
+    text = args.format == 'text'
 
     # Load schema if available
     schema = load_schema(args.schema)
     if not schema:
-        print(f"⚠️ Schema not found at {args.schema}, proceeding without validation")
+        print(f"⚠️ Schema not found at {args.schema}, proceeding without validation", file=sys.stderr)
 
     # Find signal files
-    files = sorted(glob('signals/*.json'))
-    if not files:
+    files = [str(path) for path in inventory_glob('signals/*.json')]
+    segments = [str(path) for path in inventory_glob('signals/segments/*.jsonl')]
+    if not files and not segments:
         print("No signals/*.json found. OK.")
         return 0
 
-    failures = 0
-    
-    # Validate each signal file
-    for filepath in files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                obj = json.load(f)
-        except Exception as e:
-            print(f"❌ {filepath}: parse error: {e}")
-            failures += 1
-            continue
-
-        # Schema validation
-        errors = validate_against_schema(obj, schema)
-        if errors:
-            print(f"❌ {filepath}:")
-            for error in errors:
-                path = "$" + "".join([
-                    f"[{repr(p)}]" if isinstance(p, int) else f".{p}" 
-                    for p in error.path
-                ])
-                print(f"   - {path}: {error.message}")
-            failures += 1
-        else:
-            # Show valid signal info
-            signal_id = obj.get('id') or '(no id)'
-            weight = obj.get('weight', 1)
-            timestamp = obj.get('timestamp') or '(no timestamp)'
-            print(f"✅ {filepath}: id={signal_id} weight={weight} ts={timestamp}")
+    failed = []  # only failing results are kept for the JSON/SARIF report
+    summary = {'documents': 0, 'failures': 0, 'cached': 0}
+    columns = SignalColumns()
+
+    # Validate and report batch by batch; only compact columns outlive a batch
+    with make_validator(schema, args.jobs, None if args.no_cache else PassCache()) as engine:
+        for batch in batched(iter_signal_records(files, segments), BATCH_SIZE):
+            checked = iter(engine.validate_many([(label, obj) for label, obj, error in batch if error is None]))
+            for filepath, obj, parse_error in batch:
+                if parse_error is not None:
+                    result = Result(filepath, False, (Issue('$', f"parse error: {parse_error}", 'parse'),))
+                else:
+                    result = next(checked)
+                summary['documents'] += 1
+                summary['cached'] += result.cached
+
+                if not result.ok:
+                    summary['failures'] += 1
+                    failed.append(result)
+                    if not text:
+                        continue
+                    if parse_error is not None:
+                        print(f"❌ {filepath}: {result.issues[0].message}")
+                        continue
+                    print(f"❌ {filepath}:")
+                    for issue in result.issues:
+                        print(f"   - {issue.path}: {issue.message}")
+                    continue
+
+                week = record_week(filepath, obj) if isinstance(obj, dict) else None
+                if week:
+                    columns.append(obj, week, filepath)
+                if text:
+                    # Show valid signal info
+                    signal_id = obj.get('id') or '(no id)'
+                    weight = obj.get('weight', 1)
+                    timestamp = obj.get('timestamp') or '(no timestamp)'
+                    print(f"✅ {filepath}: id={signal_id} weight={weight} ts={timestamp}")
+
+    failures = summary['failures']
+    write_report(failed, args, 'signal_validate', args.schema, summary)
+    if not text:
+        return 1 if failures else 0
+
+    if len(columns):
+        weeks = columns.weeks()
+        print(f"\n{len(columns)} valid signal(s) across {len(weeks)} week(s) ({weeks[0]} … {weeks[-1]})")
+        duplicates = columns.duplicate_ids()
+        if duplicates:
+            print(f"⚠️ {duplicates} signal(s) reuse an existing id")
 
     # Final result
     result = "FAIL" if failures else "PASS"
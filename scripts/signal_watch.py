@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Long-running signal ingest watcher that keeps weekly digests live.
+
+Watches signals/ for new *.json drops (inotify on Linux, directory polling
+elsewhere), validates each file once against docs/schemas/signal.schema.json,
+folds it into per-week running aggregates (scripts/signal_stream.py: count,
+weight sum, top-K heap, tag and scope counters) and re-renders only the
+affected docs/digests/YYYY-WW.md, which is rewritten only when its content
+changes. Between events the process sleeps in select()/sleep(), so
+steady-state CPU is near zero.
+
+Existing segments (signals/segments/*.jsonl) seed the aggregates at startup.
+Records are deduplicated by id within a week, matching signal_store.ingest;
+editing an already-counted file does not retract its earlier contribution.
+
+Usage:
+  python scripts/signal_watch.py                # watch until interrupted
+  python scripts/signal_watch.py --ingest       # also move files into segments
+  python scripts/signal_watch.py --once         # process current drops and exit
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from generate_weekly_digest import DIGEST_DIR, render_summary, week_trends, write_digest
+from signal_store import SIGNALS_DIR, SegmentStore, ingest, iso_year_week, signal_timestamp
+from signal_stream import WeekSummary
+
+
+SCHEMA_PATH = 'docs/schemas/signal.schema.json'
+TOP_TAGS = 12
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def compile_validator(schema_path):
+    """Draft 2020-12 validator built once, or None without schema/jsonschema."""
+    try:
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️ Schema not found at {schema_path}, proceeding without validation")
+        return None
+    try:
+        from jsonschema import Draft202012Validator
+    except ImportError:
+        print("⚠️ jsonschema not available, skipping schema validation")
+        return None
+    return Draft202012Validator(schema)
+
+
+def fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def json_files(directory):
+    try:
+        with os.scandir(directory) as it:
+            return sorted(e.path for e in it if e.name.endswith('.json') and e.is_file())
+    except FileNotFoundError:
+        return []
+
+
+class InotifySource:
+    """Blocks on a Linux inotify descriptor for completed writes and moves."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f'inotify_add_watch failed for {directory}')
+        self.directory = directory
+        self.fd = fd
+        self.name = 'inotify'
+
+    def _read(self, paths):
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name.endswith(b'.json'):
+                paths.setdefault(os.path.join(self.directory, os.fsdecode(name)), None)
+
+    def wait(self, timeout=None):
+        """Paths touched since the last call; bursts are drained into one batch."""
+        paths = {}
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            self._read(paths)
+            ready, _, _ = select.select([self.fd], [], [], 0.1)
+        return list(paths)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollSource:
+    """Portable fallback: rescans the directory every ``interval`` seconds."""
+
+    def __init__(self, directory, interval=2.0):
+        self.directory = directory
+        self.interval = interval
+        self.name = f'polling every {interval:g}s'
+        self.snapshot = {path: fingerprint(path) for path in json_files(directory)}
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = {path: fingerprint(path) for path in json_files(self.directory)}
+        changed = [path for path, fp in current.items() if self.snapshot.get(path) != fp]
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_source(directory, poll_interval, force_poll=False):
+    if not force_poll and sys.platform.startswith('linux'):
+        try:
+            return InotifySource(directory)
+        except (OSError, AttributeError, TypeError) as e:
+            print(f"⚠️ inotify unavailable ({e}), falling back to polling")
+    return PollSource(directory, poll_interval)
+
+
+class SignalWatcher:
+    """Validates drops, keeps per-week aggregates and re-renders changed digests."""
+
+    def __init__(self, signals_dir=SIGNALS_DIR, store=None, digest_dir=DIGEST_DIR,
+                 schema_path=SCHEMA_PATH, top=10, window=8, half_life=2.0, ingest_files=False):
+        self.signals_dir = signals_dir
+        self.store = store or SegmentStore(os.path.join(signals_dir, 'segments'))
+        self.digest_dir = digest_dir
+        self.validator = compile_validator(schema_path)
+        self.top = top
+        self.window = window
+        self.half_life = half_life
+        self.ingest_files = ingest_files
+        self.weeks = {}
+        self.seen = {}
+        self.dirty = set()
+
+    def state(self, week):
+        state = self.weeks.get(week)
+        if state is None:
+            state = self.weeks[week] = WeekSummary(top=self.top, dedupe_ids=True)
+        return state
+
+    def bootstrap(self):
+        """Seed aggregates from existing segments (already validated at ingest)."""
+        for week in self.store.weeks():
+            source = self.store.segment_path(week)
+            state = self.state(week)
+            for obj in self.store.iter_week(week):
+                if isinstance(obj, dict):
+                    state.add(obj, source)
+
+    def process(self, paths):
+        """Validate and fold in new/changed files; returns the number accepted."""
+        accepted = []
+        for path in paths:
+            fp = fingerprint(path)
+            if fp is None or self.seen.get(path) == fp:
+                continue
+            self.seen[path] = fp
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    obj = json.load(f)
+            except Exception as e:
+                print(f"❌ {path}: parse error: {e}")
+                continue
+            if not isinstance(obj, dict):
+                print(f"❌ {path}: not an object")
+                continue
+            if self.validator is not None:
+                errors = list(self.validator.iter_errors(obj))
+                if errors:
+                    print(f"❌ {path}: " + "; ".join(error.message for error in errors))
+                    continue
+            week = iso_year_week(signal_timestamp(obj, path))
+            if self.state(week).add(obj, path):
+                self.dirty.add(week)
+                print(f"[watch] {week}: +{obj.get('id') or os.path.basename(path)}")
+            accepted.append(path)
+
+        if self.ingest_files and accepted:
+            ingest(self.store, accepted)
+            self.store.save_manifest()
+        return len(accepted)
+
+    def trends(self, week):
+        """Trend report for ``week`` over the running totals, or None without numpy."""
+        return week_trends(self.weeks, week, self.window, self.half_life)
+
+    def render(self, week):
+        state = self.state(week)
+        trends = self.trends(week)
+        content = render_summary(week, state.count, state.weight, state.top_signals(),
+                                 state.top_tags(TOP_TAGS), trends)
+        os.makedirs(self.digest_dir, exist_ok=True)
+        if trends is not None:
+            write_digest(week, json.dumps(trends, indent=2) + "\n", suffix='.json', directory=self.digest_dir)
+        return write_digest(week, content, directory=self.digest_dir)
+
+    def flush(self):
+        """Re-render dirty weeks; returns paths actually rewritten."""
+        written = []
+        for week in sorted(self.dirty):
+            path, changed = self.render(week)
+            if changed:
+                written.append(path)
+                print(f"✅ Wrote {path}")
+        self.dirty.clear()
+        return written
+
+    def run(self, source):
+        print(f"[watch] {self.signals_dir} ({source.name})")
+        try:
+            while True:
+                if self.process(source.wait()):
+                    self.flush()
+        except KeyboardInterrupt:
+            print("[watch] stopped")
+        finally:
+            source.close()
+
+
+def main():
+    """Signal ingest watcher CLI."""
+    parser = argparse.ArgumentParser(description="Watch signals/ and keep weekly digests live")
+    parser.add_argument('--signals', default=SIGNALS_DIR, help='Directory to watch')
+    parser.add_argument('--schema', default=SCHEMA_PATH, help='Path to signal schema')
+    parser.add_argument('--digests', default=DIGEST_DIR, help='Digest output directory')
+    parser.add_argument('--top', type=int, default=10, help='Number of top signals')
+    parser.add_argument('--window', type=int, default=8, help='Weeks of history for trends')
+    parser.add_argument('--half-life', type=float, default=2.0, help='Trend decay half-life in weeks')
+    parser.add_argument('--ingest', action='store_true', help='Move accepted files into week segments')
+    parser.add_argument('--poll', type=float, default=2.0, help='Polling interval when inotify is unavailable')
+    parser.add_argument('--force-poll', action='store_true', help='Use polling even where inotify works')
+    parser.add_argument('--once', action='store_true', help='Process current files, render, and exit')
+    args = parser.parse_args()
+
+    watcher = SignalWatcher(args.signals, digest_dir=args.digests, schema_path=args.schema, top=args.top,
+                            window=args.window, half_life=args.half_life, ingest_files=args.ingest)
+    watcher.bootstrap()
+    # Open the source before the initial scan so drops in between are not missed
+    source = None if args.once else open_source(args.signals, args.poll, args.force_poll)
+    watcher.process(json_files(args.signals))
+    watcher.flush()
+    if source is not None:
+        watcher.run(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
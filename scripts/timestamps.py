@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Shared timestamp parsing and normalization.
+
+Nearly every timestamp in the vault is either a ``YYYY-MM-DD`` date or an
+RFC 3339 date-time (``2025-09-22T10:00:00Z``), so those shapes are matched
+with a regex and handed to ``datetime.fromisoformat`` directly. Anything
+else falls back to ``dateutil`` (imported lazily, once per process). Parsed
+strings are memoized, so repeated timestamps across signals, indexes and
+reports are parsed once.
+
+Signal ingest stores :func:`normalize_timestamp` output, keeping segment
+records on the fast path for every later reader.
+
+Used by signal_store.py, signal_index.py, signal_sync.py, prompts_lint.py
+and mcp_knowledge_summon.py.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_RFC3339 = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"(?:[Tt ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:[Zz]|[+-]\d{2}:\d{2})?)?"
+)
+CACHE_SIZE = 8192
+
+_dateutil_parse: Any = None  # None: not tried yet; False: unavailable
+
+
+def _fallback(value: str) -> Optional[datetime]:
+    global _dateutil_parse
+    if _dateutil_parse is None:
+        try:
+            from dateutil import parser as date_parser
+
+            _dateutil_parse = date_parser.parse
+        except ImportError:
+            _dateutil_parse = False
+    if not _dateutil_parse:
+        return None
+    try:
+        return _dateutil_parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(value: str) -> Optional[datetime]:
+    text = value.strip()
+    if _RFC3339.fullmatch(text):
+        if text[-1] in "Zz":
+            text = text[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            return None  # well-formed but impossible, e.g. 2025-02-30
+    return _fallback(text)
+
+
+def parse_timestamp(value: Any, default: Optional[datetime] = None) -> Optional[datetime]:
+    """``value`` as a datetime (naive if it carried no offset), else ``default``."""
+
+    if isinstance(value, datetime):
+        return value
+    if not value or not isinstance(value, str):
+        return default
+    parsed = _parse(value)
+    return default if parsed is None else parsed
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Strict ``YYYY-MM-DD`` calendar date, or None when malformed or invalid."""
+
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if not _DATE.fullmatch(text):
+        return None
+    parsed = _parse(text)
+    return parsed.date() if parsed is not None else None
+
+
+def format_timestamp(dt: datetime) -> str:
+    """RFC 3339 text for ``dt``; UTC is written with a ``Z`` suffix."""
+
+    text = dt.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """Canonical fast-path form of ``value`` (offset preserved), or None if unparseable."""
+
+    dt = parse_timestamp(value)
+    return None if dt is None else format_timestamp(dt)
+
+
+def epoch_seconds(dt: datetime) -> float:
+    """POSIX seconds; naive datetimes are taken as UTC."""
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
@@ -10,6 +10,8 @@ from typing import Callable
 
 from jsonschema import Draft7Validator
 
+from schema_engine import PassCache, ValidationEngine
+
 
 def load(path: str) -> dict | None:
     try:
@@ -19,26 +21,33 @@ def load(path: str) -> dict | None:
         return None
 
 
-def validate(schema_path: str, data_path: str, *, draft: Callable = Draft7Validator) -> bool:
+def validate(
+    schema_path: str,
+    data_path: str,
+    *,
+    draft: Callable = Draft7Validator,
+    cache: PassCache | None = None,
+) -> bool:
     schema = load(schema_path)
     data = load(data_path)
     if schema is None or data is None:
         return True
-    validator = draft(schema)
-    errors = sorted(validator.iter_errors(data), key=lambda e: list(e.path))
-    if not errors:
+    with ValidationEngine(schema, draft=draft, jobs=1, cache=cache) as engine:
+        result = engine.validate(data_path, data)
+    if result.ok:
         print(f"[json] OK {data_path}")
         return True
-    for err in errors:
-        location = ".".join(str(p) for p in err.path) or "<root>"
-        print(f"[json] ERROR {data_path} :: {location} :: {err.message}")
+    for issue in result.issues:
+        location = issue.path[1:].lstrip(".") or "<root>"
+        print(f"[json] ERROR {data_path} :: {location} :: {issue.message}")
     return False
 
 
 def main() -> int:
     ok = True
-    ok &= validate("prompts/index.schema.json", "prompts/index.json", draft=Draft7Validator)
-    ok &= validate("tools/index.schema.json", "tools/index.json", draft=Draft7Validator)
+    cache = PassCache()
+    ok &= validate("prompts/index.schema.json", "prompts/index.json", draft=Draft7Validator, cache=cache)
+    ok &= validate("tools/index.schema.json", "tools/index.json", draft=Draft7Validator, cache=cache)
     return 0 if ok else 1
 
 
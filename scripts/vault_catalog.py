@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Incrementally maintained SQLite catalog of vault markdown documents.
+
+One row per document (fingerprint, title, footer status, TODO count) plus
+child tables for headings, outbound links and TODO lines. ``refresh`` only
+re-reads files whose (size, mtime_ns) changed and only re-parses files whose
+content hash changed, so callers can query instead of re-walking the tree.
+
+Usage:
+  python scripts/vault_catalog.py            # refresh every markdown file
+  python scripts/vault_catalog.py --stats    # refresh and print counts
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from file_inventory import inventory
+from footer_rules import has_required_footer, tail_has_link
+
+DB_PATH = Path(".cache/vault.db")
+PARSER_VERSION = 2
+
+LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+WIKILINK_RE = re.compile(r"\[\[([^\]|]+)(?:\|([^\]]*))?\]\]")
+CODE_SPAN_RE = re.compile(r"(`+).+?\1")
+FENCE_PREFIXES = ("```", "~~~")
+TODO_RE = re.compile(r"\b(TODO|FIXME)\b", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    title TEXT,
+    has_footer INTEGER NOT NULL,
+    tail_has_link INTEGER NOT NULL,
+    todo_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS headings (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    target TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    in_code INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS todos (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    snippet TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_headings_path ON headings(path);
+CREATE INDEX IF NOT EXISTS idx_links_path ON links(path);
+CREATE INDEX IF NOT EXISTS idx_links_target ON links(target);
+CREATE INDEX IF NOT EXISTS idx_todos_path ON todos(path);
+"""
+
+CHILD_TABLES = ("headings", "links", "todos")
+MAX_BIND = 500  # paths per IN (...) query, well under SQLite's bind-parameter limit
+
+
+def parse_document(text: str) -> dict:
+    """Extract catalog facts from markdown ``text``."""
+
+    headings: List[Tuple[int, int, str]] = []
+    links: List[Tuple[int, str, str, str, bool]] = []
+    todos: List[Tuple[int, str]] = []
+    in_fence = False
+    for idx, line in enumerate(text.splitlines(), start=1):
+        if line.lstrip(" ").startswith(FENCE_PREFIXES):
+            in_fence = not in_fence
+        if line.startswith("#"):
+            heading = line.lstrip("#").strip()
+            if heading:
+                level = len(line) - len(line.lstrip("#"))
+                headings.append((idx, level, heading))
+        if "](" in line or "[[" in line:
+            spans = [m.span() for m in CODE_SPAN_RE.finditer(line)] if "`" in line else []
+
+            def in_code(pos: int) -> bool:
+                return in_fence or any(start <= pos < end for start, end in spans)
+
+            for match in LINK_RE.finditer(line):
+                link_text, target = match.groups()
+                links.append((idx, link_text.strip(), target.strip(), "md", in_code(match.start())))
+            for match in WIKILINK_RE.finditer(line):
+                target, alias = match.groups()
+                links.append((idx, (alias or target).strip(), target.strip(), "wiki", in_code(match.start())))
+        if TODO_RE.search(line):
+            todos.append((idx, line.strip()))
+
+    title = next((h for _, level, h in headings if level == 1), None)
+    if title is None and headings:
+        title = headings[0][2]
+    return {
+        "title": title,
+        "has_footer": has_required_footer(text),
+        "tail_has_link": tail_has_link(text),
+        "headings": headings,
+        "links": links,
+        "todos": todos,
+    }
+
+
+class VaultCatalog:
+    """Thin wrapper around the SQLite catalog database."""
+
+    def __init__(self, db_path: Path = DB_PATH) -> None:
+        self.db_path = db_path
+        if str(db_path) != ":memory:":
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != PARSER_VERSION:
+            for table in ("documents", *CHILD_TABLES):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version={PARSER_VERSION}")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "VaultCatalog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- maintenance -----------------------------------------------------
+
+    def refresh(self, paths: Iterable[Path]) -> Dict[str, int]:
+        """Bring rows for ``paths`` up to date; returns per-outcome counts."""
+
+        stats = {"unchanged": 0, "touched": 0, "parsed": 0, "removed": 0}
+        known = {
+            row[0]: row[1:]
+            for row in self.conn.execute("SELECT path, size, mtime_ns, sha256 FROM documents")
+        }
+        with self.conn:
+            for path in paths:
+                key = Path(path).as_posix()
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    if key in known:
+                        self._delete(key)
+                        stats["removed"] += 1
+                    continue
+                previous = known.get(key)
+                if previous and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    raw = Path(path).read_bytes()
+                except OSError:
+                    continue
+                digest = hashlib.sha256(raw).hexdigest()
+                if previous and previous[2] == digest:
+                    self.conn.execute(
+                        "UPDATE documents SET size = ?, mtime_ns = ? WHERE path = ?",
+                        (st.st_size, st.st_mtime_ns, key),
+                    )
+                    stats["touched"] += 1
+                    continue
+                self._store(key, st, digest, raw.decode("utf-8", errors="replace"))
+                stats["parsed"] += 1
+        return stats
+
+    def prune(self, live_paths: Iterable[str]) -> int:
+        """Drop rows for documents that are no longer in ``live_paths``."""
+
+        live = set(live_paths)
+        stale = [row[0] for row in self.conn.execute("SELECT path FROM documents") if row[0] not in live]
+        with self.conn:
+            for key in stale:
+                self._delete(key)
+        return len(stale)
+
+    def _delete(self, key: str) -> None:
+        self.conn.execute("DELETE FROM documents WHERE path = ?", (key,))
+        for table in CHILD_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+
+    def _store(self, key: str, st: os.stat_result, digest: str, text: str) -> None:
+        facts = parse_document(text)
+        self._delete(key)
+        self.conn.execute(
+            "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                st.st_size,
+                st.st_mtime_ns,
+                digest,
+                facts["title"],
+                int(facts["has_footer"]),
+                int(facts["tail_has_link"]),
+                len(facts["todos"]),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO headings VALUES (?, ?, ?, ?)",
+            ((key, line, level, text) for line, level, text in facts["headings"]),
+        )
+        self.conn.executemany(
+            "INSERT INTO links VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (key, line, text, target, kind, int(code))
+                for line, text, target, kind, code in facts["links"]
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO todos VALUES (?, ?, ?)",
+            ((key, line, snippet) for line, snippet in facts["todos"]),
+        )
+
+    # -- queries ---------------------------------------------------------
+
+    def has(self, path: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM documents WHERE path = ?", (path,)).fetchone()
+        return row is not None
+
+    def documents(self, prefix: str = "") -> List[sqlite3.Row]:
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(
+            "SELECT * FROM documents WHERE path LIKE ? ESCAPE '\\' ORDER BY path",
+            (_like_prefix(prefix),),
+        ).fetchall()
+
+    def footer_status(self, paths: Sequence[str]) -> Dict[str, Tuple[bool, bool]]:
+        return {
+            path: (bool(footer), bool(link))
+            for path, footer, link in self._select_in(
+                "SELECT path, has_footer, tail_has_link FROM documents WHERE path IN ({})", "", paths
+            )
+        }
+
+    def headings(self, paths: Sequence[str]) -> Dict[str, List[Tuple[int, int, str]]]:
+        return self._grouped(
+            "SELECT path, line, level, text FROM headings WHERE path IN ({})", "ORDER BY path, line", paths
+        )
+
+    def links(self, paths: Sequence[str]) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Inline markdown links per document (wikilinks excluded)."""
+
+        return self._grouped(
+            "SELECT path, line, text, target FROM links WHERE path IN ({}) AND kind = 'md'",
+            "ORDER BY path, line, rowid",
+            paths,
+        )
+
+    def all_headings(self) -> List[Tuple[str, int, str]]:
+        return self.conn.execute("SELECT path, level, text FROM headings ORDER BY path, line").fetchall()
+
+    def all_links(self) -> List[Tuple[str, int, str, str, int]]:
+        return self.conn.execute(
+            "SELECT path, line, kind, target, in_code FROM links ORDER BY path, line, rowid"
+        ).fetchall()
+
+    def todos(self, paths: Sequence[str]) -> Dict[str, List[Tuple[int, str]]]:
+        return self._grouped("SELECT path, line, snippet FROM todos WHERE path IN ({})", "ORDER BY path, line", paths)
+
+    def linking_to(self, target: str) -> List[Tuple[str, int, str]]:
+        """Documents whose raw link target equals ``target`` (uses idx_links_target)."""
+
+        return self.conn.execute(
+            "SELECT path, line, text FROM links WHERE target = ? ORDER BY path, line", (target,)
+        ).fetchall()
+
+    def _select_in(self, query: str, order: str, paths: Sequence[str]) -> Iterable[tuple]:
+        """Rows of ``query`` (with an ``IN ({})`` slot) for ``paths``, in chunks of ``MAX_BIND``."""
+
+        unique = list(dict.fromkeys(paths))
+        for start in range(0, len(unique), MAX_BIND):
+            chunk = unique[start : start + MAX_BIND]
+            yield from self.conn.execute(f"{query.format(', '.join('?' * len(chunk)))} {order}", chunk)
+
+    def _grouped(self, query: str, order: str, paths: Sequence[str]) -> Dict[str, list]:
+        grouped: Dict[str, list] = {path: [] for path in paths}
+        for row in self._select_in(query, order, paths):
+            grouped[row[0]].append(tuple(row[1:]))
+        return grouped
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def markdown_paths() -> List[Path]:
+    """All markdown documents in the vault according to the shared inventory."""
+
+    return inventory().glob("**/*.md")
+
+
+def open_catalog(paths: Optional[Iterable[Path]] = None, db_path: Path = DB_PATH) -> VaultCatalog:
+    """Open the catalog and refresh ``paths`` (default: every markdown file)."""
+
+    catalog = VaultCatalog(db_path)
+    if paths is None:
+        paths = markdown_paths()
+        catalog.refresh(paths)
+        catalog.prune(p.as_posix() for p in markdown_paths())
+    else:
+        catalog.refresh(paths)
+    return catalog
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VaultMesh docs catalog")
+    parser.add_argument("--db", default=str(DB_PATH), help="Catalog database path")
+    parser.add_argument("--stats", action="store_true", help="Print catalog counts")
+    args = parser.parse_args()
+
+    catalog = VaultCatalog(Path(args.db))
+    paths = markdown_paths()
+    stats = catalog.refresh(paths)
+    stats["removed"] += catalog.prune(p.as_posix() for p in paths)
+    print(
+        f"[catalog] {len(paths)} docs · parsed {stats['parsed']} · "
+        f"touched {stats['touched']} · unchanged {stats['unchanged']} · removed {stats['removed']}"
+    )
+    if args.stats:
+        for table in ("documents", *CHILD_TABLES):
+            count = catalog.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"[catalog] {table}: {count}")
+    catalog.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Tests for diff coverage: hunk intervals intersected with line coverage."""
+
+import json
+import subprocess
+
+import pr_summary
+from diff_coverage import (
+    LineCoverage,
+    compress,
+    diff_coverage,
+    hunk_intervals,
+    intersect,
+    merge,
+    split_patches,
+)
+
+PATCH = """@@ -1,4 +1,5 @@
+ import os
+-x = 1
++x = 2
++y = 3
+ z = 4
+@@ -20,3 +21,4 @@ def f():
+     a = 1
++    b = 2
+     return a
+\\ No newline at end of file"""
+
+
+def test_hunk_intervals_track_new_side_lines():
+    assert hunk_intervals(PATCH) == [(2, 3), (22, 22)]
+    assert hunk_intervals(None) == []
+    assert hunk_intervals("@@ -0,0 +1 @@\n+only") == [(1, 1)]
+
+
+def test_interval_helpers():
+    assert compress([1, 2, 3, 5, 7, 8]) == [(1, 3), (5, 5), (7, 8)]
+    assert merge([(5, 9), (1, 2), (3, 4), (8, 12)]) == [(1, 12)]
+    assert intersect([(1, 10), (20, 30)], [(5, 22), (25, 25), (29, 40)]) == [(5, 10), (20, 22), (25, 25), (29, 30)]
+
+
+def test_diff_coverage_counts_executable_changed_lines():
+    coverage = LineCoverage.from_json({"files": {
+        "pkg/a.py": {"executed_lines": [1, 2, 4, 21, 23], "missing_lines": [3, 22]},
+        "pkg/b.py": {"executed_lines": [1], "missing_lines": []},
+    }}, "coverage.json")
+    changed = [
+        {"filename": "pkg/a.py", "status": "modified", "patch": PATCH},
+        {"filename": "pkg/b.py", "status": "removed", "patch": "@@ -1 +0,0 @@\n-x"},
+        {"filename": "docs/c.md", "status": "modified", "patch": PATCH},
+    ]
+    report = diff_coverage(changed, coverage)
+    assert (report["covered"], report["uncovered"]) == (1, 2)
+    assert report["files"] == [{"path": "pkg/a.py", "covered": 1, "uncovered": 2,
+                                "uncovered_ranges": [(3, 3), (22, 22)]}]
+
+    line, details = pr_summary.format_diff_coverage(report)
+    assert "(1/3 changed lines)" in line
+    assert "| `pkg/a.py` | 1/3 | 3, 22 |" in details
+
+
+def test_large_diff_stays_linear():
+    lines = 200_000
+    patch = f"@@ -0,0 +1,{lines} @@\n" + "\n".join("+x" for _ in range(lines))
+    executed = list(range(1, lines + 1, 2))
+    coverage = LineCoverage.from_json({"files": {"big.py": {"executed_lines": executed,
+                                                           "missing_lines": [n + 1 for n in executed]}}})
+    report = diff_coverage([{"filename": "big.py", "status": "added", "patch": patch}], coverage)
+    assert (report["covered"], report["uncovered"]) == (lines // 2, lines // 2)
+
+
+def test_split_patches_and_local_mode(tmp_path, monkeypatch):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, stdout=subprocess.DEVNULL)
+
+    git("init", "-q")
+    git("config", "user.email", "ci@example.org")
+    git("config", "user.name", "ci")
+    (tmp_path / "a b.py").write_text("a = 1\nb = 2\n")
+    (tmp_path / "c.py").write_text("c = 1\n")
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    (tmp_path / "a b.py").write_text("a = 1\nb = 3\nc = 4\n")
+    (tmp_path / "c.py").write_text("c = 2\n")
+    git("commit", "-qam", "head")
+
+    (tmp_path / "coverage.json").write_text(json.dumps({"files": {"a b.py": {"executed_lines": [1, 2], "missing_lines": [3]}}}))
+    monkeypatch.chdir(tmp_path)
+    context = pr_summary.load_context()
+    changed = {f["filename"]: f for f in pr_summary.local_changed_files("HEAD~1", wants_patch=pr_summary.patch_filter(context))}
+    assert changed["c.py"]["patch"] is None
+    assert hunk_intervals(changed["a b.py"]["patch"]) == [(2, 3)]
+
+    body, _ = pr_summary.render_summary(list(changed.values()), "", None, context)
+    assert "- Diff coverage: 🟥 50.0% (1/2 changed lines)" in body
+
+    diff = subprocess.run(["git", "diff", "HEAD~1"], cwd=tmp_path, stdout=subprocess.PIPE, text=True).stdout
+    assert set(split_patches(diff.splitlines(keepends=True))) == {"a b.py", "c.py"}
+
+
+def test_split_patches_ignores_header_lookalikes_inside_hunks():
+    diff = [
+        "diff --git a/a.md b/a.md\n", "--- a/a.md\n", "+++ b/a.md\n",
+        "@@ -1,2 +1,3 @@\n", " keep\n", "--- gone\n", "+++ heading-ish\n", "+x\n",
+        "\\ No newline at end of file\n",
+        "diff --git a/b.md b/b.md\n", "--- a/b.md\n", "+++ b/b.md\n", "@@ -0,0 +1 @@\n", "+y\n",
+    ]
+    patches = split_patches(diff)
+    assert set(patches) == {"a.md", "b.md"}
+    assert patches["a.md"].splitlines()[-2:] == ["+x", "\\ No newline at end of file"]
+    assert hunk_intervals(patches["a.md"]) == [(2, 3)]
+    assert patches["b.md"] == "@@ -0,0 +1 @@\n+y"
+
@@ -0,0 +1,43 @@
+"""Tests for the normalized eval-results snapshot."""
+
+import json
+
+from eval_snapshot import load_snapshot
+
+
+def write(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(payload if isinstance(payload, str) else json.dumps(payload), encoding="utf-8")
+
+
+def test_normalizes_each_source(tmp_path):
+    write(tmp_path / "eval-results" / "coverage.json", {"line_rate": 0.825})
+    write(tmp_path / "eval-results" / "adversarial-results.json",
+          {"status": "passed", "passed": True, "summary": {"total_prompts": 36, "findings_count": 0}})
+    write(tmp_path / "eval-results" / "roe-compliance-results.json",
+          {"status": "passed", "summary": {"lab_only_prompts": 4, "roe_compliant": 4, "compliance_issues": 0}})
+    write(tmp_path / "junit.xml", '<testsuites><testsuite tests="5" failures="1" errors="0" skipped="1" time="1.5"/></testsuites>')
+
+    snapshot = load_snapshot(tmp_path)
+    assert snapshot["coverage"]["pct"] == 82.5
+    assert (snapshot["adversarial"]["passed"], snapshot["adversarial"]["total"]) == (36, 36)
+    assert snapshot["roe"]["compliant"] == 4
+    assert snapshot["junit"]["passed"] == 3 and snapshot["junit"]["time"] == 1.5
+    assert (tmp_path / "eval-results" / "snapshot.json").exists()
+
+
+def test_rebuilds_only_when_inputs_change(tmp_path):
+    coverage = tmp_path / "eval-results" / "coverage-results.json"
+    write(coverage, {"total": {"lines": {"pct": 71.0}}})
+    assert load_snapshot(tmp_path)["coverage"]["pct"] == 71.0
+
+    snapshot_path = tmp_path / "eval-results" / "snapshot.json"
+    cached = json.loads(snapshot_path.read_text())
+    cached["coverage"]["pct"] = -1  # marker: only visible if the cache is reused
+    snapshot_path.write_text(json.dumps(cached))
+    assert load_snapshot(tmp_path)["coverage"]["pct"] == -1
+
+    write(coverage, "{broken")
+    assert "error" in load_snapshot(tmp_path)["coverage"]
+    coverage.unlink()
+    assert load_snapshot(tmp_path)["coverage"] is None
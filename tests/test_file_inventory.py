@@ -0,0 +1,35 @@
+"""Tests for the shared git-index-backed file inventory."""
+
+from pathlib import Path
+
+import file_inventory
+
+
+def test_glob_patterns_match_repo_layout():
+    """Glob queries honour ``*`` vs ``**`` and skip ignored trees."""
+    root = Path(__file__).parent.parent
+    inv = file_inventory.inventory(root)
+
+    docs = {p.relative_to(root).as_posix() for p in inv.glob("docs/*.md")}
+    assert "docs/SIGNALS.md" in docs
+    assert "docs/digests/2025-39.md" not in docs
+
+    nested = {p.relative_to(root).as_posix() for p in inv.glob("docs/**/*.md")}
+    assert "docs/digests/2025-39.md" in nested
+
+    assert not any(".obsidian" in p for p in inv.paths)
+
+
+def test_walk_fallback_prunes_ignored_dirs(tmp_path):
+    """Outside git the scandir walk never descends into ignored directories."""
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.md").write_text("# a\n", encoding="utf-8")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "b.md").write_text("# b\n", encoding="utf-8")
+
+    file_inventory.refresh()
+    inv = file_inventory.inventory(tmp_path)
+
+    assert inv.source == "walk"
+    assert inv.paths == ("docs/a.md",)
+    assert inv.under("docs", suffixes=[".MD"]) == [tmp_path / "docs" / "a.md"]
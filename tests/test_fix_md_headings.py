@@ -0,0 +1,65 @@
+"""Regression tests and benchmark for the emphasis-to-heading normalizer."""
+
+import time
+
+from fix_md_headings import normalize
+
+
+def test_first_line_and_flanked_emphasis_become_headings():
+    """First content line becomes H1; emphasis flanked by blanks becomes H2; fences untouched."""
+    text = (
+        "\n"
+        "**Intro Title**\n"
+        "\n"
+        "Body text\n"
+        "\n"
+        "__Section__\n"
+        "\n"
+        "Inline **bold** stays.\n"
+        "**Not flanked**\n"
+        "\n"
+        "```\n"
+        "\n"
+        "**inside fence**\n"
+        "\n"
+        "```\n"
+    )
+    assert normalize(text).splitlines() == [
+        "",
+        "# Intro Title",
+        "",
+        "Body text",
+        "",
+        "## Section",
+        "",
+        "Inline **bold** stays.",
+        "**Not flanked**",
+        "",
+        "```",
+        "",
+        "**inside fence**",
+        "",
+        "```",
+    ]
+    assert normalize(text).endswith("```\n")
+
+
+def test_unchanged_text_is_returned_verbatim():
+    """Documents without emphasis headings (including CRLF ones) are not rewritten."""
+    text = "# Title\r\n\r\nplain line\r\n"
+    assert normalize(text) is text
+
+
+def test_benchmark_100k_lines_is_linear():
+    """A 100k-line document normalizes in well under the old quadratic runtime."""
+    block = ["", "**Heading**", "", "Some prose with *emphasis* inside.", "- list item"]
+    lines = ["# Generated"] + block * 20_000
+    text = "\n".join(lines) + "\n"
+    assert len(lines) > 100_000
+
+    started = time.perf_counter()
+    result = normalize(text)
+    elapsed = time.perf_counter() - started
+
+    assert result.count("\n## Heading\n") == 20_000
+    assert elapsed < 5.0, f"normalize took {elapsed:.2f}s for {len(lines)} lines"
@@ -0,0 +1,147 @@
+"""Tests for the pooled GitHub client against a local stand-in server."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from github_client import ETagCache, GitHubClient, GitHubError, last_page
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like api.github.com
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.gauge:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.delay)
+            self._get()
+        finally:
+            with server.gauge:
+                server.active -= 1
+
+    def _get(self):
+        server = self.server
+        server.log.append((self.path, self.client_address[1], self.headers.get("If-None-Match")))
+        if self.path.startswith("/items"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+            else:
+                self._send(200, [1, 2, 3], {"ETag": '"v1"', "Link": '<http://x/items?page=2>; rel="last"'})
+        elif self.path.startswith("/pages"):
+            query = parse_qs(urlsplit(self.path).query)
+            page, per_page = int(query["page"][0]), int(query["per_page"][0])
+            start = (page - 1) * per_page
+            items = list(range(start, min(start + per_page, server.total)))
+            last = -(-server.total // per_page)
+            self._send(200, items, {"Link": f'<http://x/pages?per_page={per_page}&page={last}>; rel="last"'})
+        elif self.path == "/flaky":
+            server.failures -= 1
+            self._send(502 if server.failures >= 0 else 200, {"ok": server.failures < 0})
+        elif self.path == "/limited":
+            if not server.limited:
+                server.limited = True
+                self._send(403, {"message": "API rate limit exceeded"},
+                           {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"})
+            else:
+                self._send(200, {"ok": True}, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Limit": "5000"})
+        else:
+            self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        self.server.log.append((self.path, self.client_address[1], None))
+        self._send(502, {"message": "bad gateway"})
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    httpd.log, httpd.failures, httpd.limited, httpd.total = [], 0, False, 0
+    httpd.gauge, httpd.active, httpd.peak, httpd.delay = threading.Lock(), 0, 0, 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, tmp_path, **options):
+    sleeps = []
+    client = GitHubClient("t0ken", api_root=f"http://127.0.0.1:{server.server_address[1]}",
+                          cache=ETagCache(tmp_path), sleep=sleeps.append, backoff=0.01, **options)
+    return client, sleeps
+
+
+def test_conditional_get_served_from_cache_on_one_connection(server, tmp_path):
+    client, _ = make_client(server, tmp_path)
+    first = client.request("GET", "/items", params={"page": 1})
+    second = client.request("GET", "/items", params={"page": 1})
+    assert first.data == second.data == [1, 2, 3]
+    assert not first.cached and second.cached
+    assert 'rel="last"' in second.headers["Link"]
+    assert [entry[2] for entry in server.log] == [None, '"v1"']
+    assert len({entry[1] for entry in server.log}) == 1  # connection reused
+
+
+def test_retries_and_rate_limit_backoff(server, tmp_path):
+    client, sleeps = make_client(server, tmp_path)
+    server.failures = 2
+    assert client.json("GET", "/flaky") == {"ok": True}
+    assert len(sleeps) == 2
+
+    sleeps.clear()
+    assert client.json("GET", "/limited") == {"ok": True}
+    assert sleeps == [1.0]  # reset already passed: wait out the 1s margin only
+    assert client.rate_limit == {"limit": 5000, "remaining": 4999, "reset": 0}
+
+
+def test_errors_and_non_idempotent_methods(server, tmp_path):
+    client, sleeps = make_client(server, tmp_path)
+    with pytest.raises(GitHubError) as err:
+        client.json("GET", "/missing")
+    assert err.value.status == 404
+    with pytest.raises(GitHubError):
+        client.json("POST", "/comments", json_body={"body": "x"})
+    assert sleeps == [] and sum(1 for entry in server.log if entry[0] == "/comments") == 1
+
+
+def test_paginate_fetches_known_pages_in_order(server, tmp_path):
+    client, _ = make_client(server, tmp_path)
+    server.total = 2345
+    assert client.paginate("/pages", per_page=100, max_workers=4) == list(range(2345))
+    assert sum(1 for entry in server.log if entry[0].startswith("/pages")) == 24  # no empty-page probe
+
+    server.log.clear()
+    server.total = 7
+    assert client.paginate("/pages") == list(range(7))
+    assert len(server.log) == 1
+    assert last_page(None) == 1
+
+
+def test_nested_pools_never_exceed_the_connection_pool(server, tmp_path):
+    client, _ = make_client(server, tmp_path, pool_size=3)
+    server.total, server.delay = 800, 0.01
+    with ThreadPoolExecutor(4) as pool:  # like summarize_open_prs: PRs × pages
+        results = list(pool.map(lambda _: client.paginate("/pages", per_page=100, max_workers=8), range(4)))
+    assert results == [list(range(800))] * 4
+    assert server.peak <= 3
+    assert len({entry[1] for entry in server.log}) <= 3  # no throwaway connections
@@ -0,0 +1,41 @@
+"""Tests for the streaming JUnit reader."""
+
+from junit_reader import read_junit
+
+REPORT = """<?xml version="1.0"?>
+<testsuites>
+  <testsuite name="outer">
+    <testsuite name="unit" time="0.9">
+      <testcase classname="pkg.a" name="test_fast" time="0.01"/>
+      <testcase classname="pkg.a" name="test_slow" time="0.50"/>
+      <testcase classname="pkg.a" name="test_broken" time="0.20"><failure message="assert 1 == 2">trace</failure></testcase>
+      <testcase classname="pkg.b" name="test_skip" time="0"><skipped message="later"/></testcase>
+    </testsuite>
+    <testsuite name="integration">
+      <testcase classname="pkg.c" name="test_io" time="0.50"><error>boom
+second line</error></testcase>
+    </testsuite>
+  </testsuite>
+  <testsuite name="legacy" tests="3" failures="0" errors="0" skipped="1" time="2.0"/>
+</testsuites>
+"""
+
+
+def test_streams_counts_timings_and_failures(tmp_path):
+    path = tmp_path / "junit.xml"
+    path.write_text(REPORT)
+    report = read_junit(path, slowest=2)
+
+    assert [s["name"] for s in report["suites"]] == ["unit", "integration", "legacy"]
+    assert (report["tests"], report["failures"], report["errors"], report["skipped"], report["passed"]) == (8, 1, 1, 2, 4)
+    assert report["suites"][0]["time"] == 0.9  # suite attribute wins over the case sum
+    assert report["time"] == 3.4
+    assert report["slowest"] == [
+        {"id": "pkg.a::test_slow", "time": 0.5},  # tie with test_io: earlier test first
+        {"id": "pkg.c::test_io", "time": 0.5},
+    ]
+    assert report["failure_details"] == [
+        {"id": "pkg.a::test_broken", "kind": "failure", "message": "assert 1 == 2"},
+        {"id": "pkg.c::test_io", "kind": "error", "message": "boom\nsecond line"},
+    ]
+    assert read_junit(path, max_failures=1)["failure_details"][0]["id"] == "pkg.a::test_broken"
@@ -0,0 +1,58 @@
+"""Tests for link resolution and anchor validation in the vault link graph."""
+
+from link_graph import LinkGraph, prompt_doc_index
+
+
+def build(links):
+    graph = LinkGraph(
+        ["docs/a.md", "docs/b.md", "guides/Field Guide.md"],
+        [
+            ("docs/a.md", 1, "Overview"),
+            ("docs/b.md", 1, "Tool Hints & Recipes"),
+            ("docs/b.md", 2, "Setup"),
+            ("docs/b.md", 2, "Setup"),
+            ("guides/Field Guide.md", 1, "Intro {#start}"),
+        ],
+    )
+    for source, kind, raw in links:
+        graph.add(source, 1, kind, raw)
+    return graph
+
+
+def test_markdown_and_wikilinks_resolve_with_anchors():
+    """Relative links, duplicate-heading slugs, explicit ids and wikilinks resolve."""
+    graph = build(
+        [
+            ("docs/a.md", "md", "b.md#tool-hints--recipes"),
+            ("docs/a.md", "md", "./b.md#setup-1"),
+            ("docs/a.md", "md", "../guides/Field%20Guide.md#start"),
+            ("docs/b.md", "wiki", "field guide#Intro"),
+            ("docs/b.md", "md", "#setup"),
+            ("docs/b.md", "md", "https://example.com/x.md"),
+        ]
+    )
+    assert graph.broken == []
+    assert graph.linked_from("docs/b.md") == {"docs/a.md"}
+    assert graph.linked_from("guides/Field Guide.md") == {"docs/a.md", "docs/b.md"}
+
+
+def test_broken_files_and_anchors_are_reported():
+    """Missing targets and unknown heading slugs are reported once each."""
+    graph = build(
+        [
+            ("docs/a.md", "md", "missing.md"),
+            ("docs/a.md", "md", "b.md#nope"),
+            ("docs/a.md", "wiki", "Nowhere"),
+        ]
+    )
+    assert [(issue.target, issue.reason) for issue in graph.broken] == [
+        ("missing.md", "missing file"),
+        ("b.md#nope", "missing anchor"),
+        ("Nowhere", "missing file"),
+    ]
+
+
+def test_prompt_doc_index_normalises_paths():
+    """Prompt links map to normalised repo-relative doc paths."""
+    index = prompt_doc_index([{"id": "p1", "links": ["./docs/a.md#overview", "docs/../docs/b.md"]}])
+    assert index == {"docs/a.md": {"p1"}, "docs/b.md": {"p1"}}
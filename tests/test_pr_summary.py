@@ -0,0 +1,173 @@
+"""Tests for the importable PR summary pipeline."""
+
+import json
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+import pr_summary
+from github_client import GitHubClient
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+
+
+def test_local_changed_files(tmp_path, monkeypatch):
+    git("init", "-q", cwd=tmp_path)
+    git("config", "user.email", "ci@example.org", cwd=tmp_path)
+    git("config", "user.name", "ci", cwd=tmp_path)
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "prompts" / "index.json").write_text('{"prompts": [\n{"id": "p1"}\n]}\n')
+    (tmp_path / "docs" / "a.md").write_text("# A\n\nalpha\n")
+    (tmp_path / "blob.bin").write_bytes(b"\0\1")
+    git("add", "-A", cwd=tmp_path)
+    git("commit", "-qm", "base", cwd=tmp_path)
+    (tmp_path / "prompts" / "index.json").write_text('{"prompts": [\n{"id": "p1"},\n{"id": "p2"}\n]}\n')
+    git("mv", "docs/a.md", "docs/b.md", cwd=tmp_path)
+    (tmp_path / "blob.bin").write_bytes(b"\0\2")
+    (tmp_path / "docs" / "new file.md").write_text("new\n")
+    git("add", "-A", cwd=tmp_path)
+    git("commit", "-qm", "head", cwd=tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+    changed = {item["filename"]: item for item in pr_summary.local_changed_files("HEAD~1")}
+    assert changed["docs/b.md"]["status"] == "renamed"
+    assert changed["docs/b.md"]["previous_filename"] == "docs/a.md"
+    assert changed["docs/new file.md"]["status"] == "added"
+    assert changed["blob.bin"]["additions"] == changed["blob.bin"]["deletions"] == 0
+    index = changed["prompts/index.json"]
+    assert (index["additions"], index["deletions"]) == (2, 1)
+    assert index["patch"].startswith("@@")
+    assert pr_summary.extract_ids_from_patch(index["patch"]) == {"p1", "p2"}
+    assert all(item["patch"] is None for path, item in changed.items() if path != "prompts/index.json")
+
+    # p1 only gained a trailing comma: the structural diff reports p2 alone
+    pr_summary.attach_prompt_changes(changed.values(), pr_summary.PromptIndex.from_entries([]),
+                                     pr_summary.local_file_reader("HEAD~1"))
+    assert sorted(index["prompt_changes"]) == ["p2"]
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self.path.split("?")[0]
+        state["log"].append(("GET", path))
+        if path.endswith("/pulls"):
+            self._send(200, [{"number": n, "head": {"sha": pr["sha"]}} for n, pr in state["prs"].items()])
+        elif path.endswith("/files"):
+            self._send(200, state["prs"][int(path.split("/")[-2])]["files"])
+        elif path.endswith("/comments"):
+            self._send(200, state["prs"][int(path.split("/")[-2])]["comments"])
+        elif path.endswith("/labels"):
+            self._send(200, [{"name": name} for name in sorted(state["prs"][int(path.split("/")[-2])]["labels"])])
+        else:
+            self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        state = self.server.state
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        state["log"].append(("POST", self.path))
+        if self.path.endswith("/comments"):
+            state["prs"][int(self.path.split("/")[-2])]["comments"].append({"id": 99, "body": payload["body"]})
+        elif self.path.endswith("/labels"):
+            state["prs"][int(self.path.split("/")[-2])]["labels"].update(payload["labels"])
+        self._send(201, {})
+
+    def do_PATCH(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.state["log"].append(("PATCH", self.path))
+        for pr in self.server.state["prs"].values():
+            for comment in pr["comments"]:
+                if self.path.endswith(f"/comments/{comment['id']}"):
+                    comment["body"] = payload["body"]
+        self._send(200, {})
+
+    def do_DELETE(self):
+        state = self.server.state
+        state["log"].append(("DELETE", self.path))
+        parts = self.path.split("/")
+        state["prs"][int(parts[-3])]["labels"].discard(unquote(parts[-1]))
+        self._send(200, [])
+
+
+@pytest.fixture
+def github():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHub)
+    files = [{"filename": "docs/a.md", "status": "modified", "additions": 1, "deletions": 0}]
+    httpd.state = {"log": [], "prs": {
+        1: {"sha": "aaa", "files": files, "comments": [], "labels": {"needs-review"}},
+        2: {"sha": "bbb", "files": files, "comments": [{"id": 7, "body": f"{pr_summary.SUMMARY_TAG}\n<!-- head:bbb -->"}],
+            "labels": set()},
+    }}
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_all_open_short_circuits_and_skips_identical_bodies(github, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = GitHubClient("t", api_root=f"http://127.0.0.1:{github.server_address[1]}")
+    context = pr_summary.load_context()
+    log = github.state["log"]
+
+    bodies = pr_summary.summarize_open_prs(client, "o/r", context)
+    assert bodies["2"] is None  # same head: nothing fetched beyond the comment and label lists
+    assert ("GET", "/repos/o/r/pulls/2/files") not in log
+    assert ("POST", "/repos/o/r/issues/1/comments") in log
+    assert "<!-- head:aaa -->" in bodies["1"]
+
+    log.clear()
+    github.state["prs"][1]["sha"] = "ccc"
+    pr_summary.summarize_open_prs(client, "o/r", context)
+    assert [entry for entry in log if entry[0] == "POST"] == []  # identical summary: no new comment or labels
+    assert [entry for entry in log if entry[0] == "PATCH"] == [("PATCH", "/repos/o/r/issues/comments/99")]
+    assert "<!-- head:ccc -->" in github.state["prs"][1]["comments"][0]["body"]  # head tag moved
+
+    log.clear()
+    pr_summary.summarize_open_prs(client, "o/r", context)
+    assert ("GET", "/repos/o/r/pulls/1/files") not in log  # same head again: short-circuits
+    assert [entry for entry in log if entry[0] != "GET"] == []
+
+
+def test_label_delta_and_concurrent_writes(github, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = GitHubClient("t", api_root=f"http://127.0.0.1:{github.server_address[1]}")
+    context = pr_summary.load_context()
+    state, log = github.state, github.state["log"]
+
+    pr_summary.summarize_pr(client, "o/r", "1", "aaa", context)
+    assert ("POST", "/repos/o/r/issues/1/labels") in log
+    assert state["prs"][1]["labels"] == {"area:docs", "needs-review"}
+
+    log.clear()
+    state["prs"][1]["labels"].discard("area:docs")  # removed by hand: the label is re-sent, the head tag moved
+    pr_summary.summarize_pr(client, "o/r", "1", "bbb", context)
+    assert sorted(entry for entry in log if entry[0] != "GET") == [("PATCH", "/repos/o/r/issues/comments/99"),
+                                                                   ("POST", "/repos/o/r/issues/1/labels")]
+
+    log.clear()
+    state["prs"][1]["files"] = [{"filename": "prompts/x.md", "status": "modified", "additions": 1, "deletions": 0}]
+    pr_summary.summarize_pr(client, "o/r", "1", "ccc", context)
+    writes = sorted(entry for entry in log if entry[0] != "GET")
+    assert writes == [("DELETE", "/repos/o/r/issues/1/labels/area%3Adocs"),
+                      ("PATCH", "/repos/o/r/issues/comments/99"),
+                      ("POST", "/repos/o/r/issues/1/labels")]
+    assert state["prs"][1]["labels"] == {"area:prompts", "needs-review"}  # human label kept
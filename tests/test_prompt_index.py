@@ -0,0 +1,62 @@
+"""Tests for the persistent prompt reverse-dependency index."""
+
+import json
+
+import prompt_index
+from prompt_index import PromptIndex, changed_prompts, load_prompt_index
+
+
+def write_index(path, prompts, indent=None):
+    path.write_text(json.dumps({"version": 1, "prompts": prompts}, indent=indent), encoding="utf-8")
+
+
+PROMPTS = [
+    {"id": "p1", "owner": "ops", "domain": "recon", "links": ["../docs/a.md#x", "../docs/../docs/b.md"]},
+    {"id": "p2", "owner": "ops", "domain": "dfir", "links": ["/docs/b.md"]},
+    {"title": "p3", "owner": "sec"},
+]
+
+
+def test_reverse_maps():
+    index = PromptIndex.from_entries(PROMPTS)
+    assert index.prompts_for_doc("docs/b.md") == {"p1", "p2"}
+    assert index.prompts_for_doc("docs/a.md") == {"p1"}
+    assert index.prompts_for_owner("ops") == {"p1", "p2"}
+    assert index.get("p3").owner == "sec"
+
+
+def test_links_resolve_against_the_index_without_touching_the_filesystem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # nothing exists here: resolution must not depend on it
+    entry = {"id": "p", "links": ["../docs/SIGNALS.md#feeds", "Tem-Prompts.md", "/docs/b.md", "../../outside.md",
+                                  "https://x.org/a", "#top", "./"]}
+    assert prompt_index.doc_links(entry) == ("docs/SIGNALS.md", "prompts/Tem-Prompts.md", "docs/b.md")
+
+
+def test_structural_diff_ignores_formatting():
+    old = PromptIndex.from_text(json.dumps({"prompts": PROMPTS}))
+    reformatted = PromptIndex.from_text(json.dumps({"prompts": PROMPTS}, indent=2))
+    assert changed_prompts(old, reformatted) == {}
+
+    edited = [dict(PROMPTS[0], domain="osint"), {"id": "p4", "owner": "new"}, PROMPTS[2]]
+    new = PromptIndex.from_text(json.dumps({"prompts": edited}), previous=old)
+    changes = changed_prompts(old, new)
+    assert sorted(changes) == ["p1", "p2", "p4"]
+    assert changes["p1"].domain == "osint"
+    assert changes["p2"].domain == "dfir"  # removed: old record
+    assert new.get("p3") is old.get("p3")  # unchanged entry reused
+
+
+def test_cache_rebuilt_only_when_index_changes(tmp_path, monkeypatch):
+    source, cache = tmp_path / "index.json", tmp_path / "cache" / "prompt-index.json"
+    write_index(source, PROMPTS)
+    first = load_prompt_index(source, cache)
+    assert json.loads(cache.read_text())["docs"]["docs/b.md"] == ["p1", "p2"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rebuilt without a change")
+
+    monkeypatch.setattr(prompt_index, "make_record", fail)
+    assert load_prompt_index(source, cache).prompts == first.prompts
+
+    write_index(source, PROMPTS, indent=2)  # new bytes, same prompts: every record reused
+    assert load_prompt_index(source, cache).sha256 != first.sha256
@@ -0,0 +1,61 @@
+"""Tests for the batch schema validation engine."""
+
+import schema_engine
+from schema_engine import PassCache, ValidationEngine, to_sarif
+
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": ["id"],
+    "properties": {"id": {"type": "string"}, "weight": {"type": "number", "minimum": 0}},
+}
+
+
+def test_results_keep_input_order_and_cache_only_passes(tmp_path):
+    cache = PassCache(tmp_path / "validation.json")
+    docs = [("a.json", {"id": "a"}), ("seg.jsonl:3", {"weight": -1}), ("c.json", {"id": "c", "weight": 2})]
+
+    with ValidationEngine(SCHEMA, jobs=1, cache=cache) as engine:
+        first = engine.validate_many(docs)
+    assert [r.ok for r in first] == [True, False, True]
+    assert [i.keyword for i in first[1].issues] == ["required", "minimum"]
+    assert first[1].issues[1].path == "$.weight"
+
+    again = ValidationEngine(SCHEMA, jobs=1, cache=PassCache(tmp_path / "validation.json")).validate_many(docs)
+    assert [r.cached for r in again] == [True, False, True]
+
+    sarif = to_sarif(again, "test")
+    [finding, _] = sarif["runs"][0]["results"]
+    assert finding["locations"][0]["physicalLocation"]["region"] == {"startLine": 3}
+
+
+def test_pool_matches_inline_results(monkeypatch):
+    monkeypatch.setattr(schema_engine, "PARALLEL_THRESHOLD", 10)
+    monkeypatch.setattr(schema_engine, "CHUNK_SIZE", 7)
+    docs = [(f"{i}.json", {"id": str(i)} if i % 5 else {"weight": i}) for i in range(50)]
+    with ValidationEngine(SCHEMA, jobs=2) as engine:
+        pooled = engine.validate_many(docs)
+        pool = engine._pool
+        assert engine.validate_many(docs) == pooled and engine._pool is pool  # one pool per engine
+    assert engine._pool is None
+    inline = ValidationEngine(SCHEMA, jobs=1).validate_many(docs)
+    assert pooled == inline
+    assert sum(not r.ok for r in pooled) == 10
+
+
+def test_pass_cache_keeps_the_newest_keys(tmp_path):
+    cache = PassCache(tmp_path / "validation.json", limit=3)
+    for key in "abcde":
+        cache.add(key)
+    cache.save()
+    reloaded = PassCache(tmp_path / "validation.json", limit=3)
+    assert list(reloaded.keys) == ["c", "d", "e"]
+
+
+def test_pass_cache_keys_include_the_draft(tmp_path):
+    from jsonschema import Draft7Validator
+
+    cache = PassCache(tmp_path / "validation.json")
+    ValidationEngine(SCHEMA, jobs=1, cache=cache).validate_many([("a.json", {"id": "a"})])
+    [result] = ValidationEngine(SCHEMA, draft=Draft7Validator, jobs=1, cache=cache).validate_many([("a.json", {"id": "a"})])
+    assert result.ok and not result.cached
@@ -0,0 +1,51 @@
+"""Tests for the vectorized rolling signal aggregates."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from signal_aggregates import SignalTable, aggregate, week_index, week_label, window_weeks
+from signal_columns import SignalColumns
+
+
+def table(buckets):
+    columns = SignalColumns()
+    for week, records in buckets.items():
+        columns.extend(records, week)
+    return SignalTable.from_columns(columns)
+
+
+def test_week_index_round_trips_across_year_boundary():
+    assert week_index("2021-01") - week_index("2020-53") == 1
+    assert week_label(week_index("2025-39")) == "2025-39"
+    assert window_weeks(["2021-01"], 3) == ["2020-52", "2020-53", "2021-01"]
+
+
+def test_rolling_means_and_deltas_match_scalar_recurrence():
+    """Decayed means and week-over-week deltas agree with a per-key loop."""
+    buckets = {
+        "2025-37": [{"weight": 2.0, "tags": ["ci"], "scope": "ops"}],
+        "2025-39": [
+            {"weight": 4.0, "tags": ["ci", "docs"], "scope": "ops"},
+            {"weight": 1.0, "tags": ["ci"]},
+        ],
+    }
+    aggregates = aggregate(table(buckets), half_life=1.0)
+
+    rows = {row["key"]: row for row in aggregates["tags"].for_week("2025-39")}
+    # ci: weeks 37, 38, 39 -> sums 2, 0, 5 / counts 1, 0, 2 with alpha 0.5
+    assert rows["ci"]["count"] == 2
+    assert rows["ci"]["decayed_weight"] == pytest.approx(0.25 * 2 + 5)
+    assert rows["ci"]["rolling_mean"] == pytest.approx((0.25 * 2 + 5) / (0.25 + 2))
+    assert rows["ci"]["weight_delta"] == pytest.approx(5.0)
+    assert rows["docs"]["mean_delta"] == pytest.approx(4.0)
+
+    scopes = {row["key"]: row for row in aggregates["scopes"].for_week("2025-39")}
+    assert scopes["unscoped"]["weight"] == pytest.approx(1.0)
+    assert scopes["ops"]["decayed_weight"] == pytest.approx(0.25 * 2 + 4)
+    assert aggregates["tags"].for_week("2025-30") == []
+
+
+def test_aggregate_handles_empty_table():
+    aggregates = aggregate(table({}))
+    assert aggregates["tags"].for_week("2025-39") == []
@@ -0,0 +1,37 @@
+"""Tests and memory benchmark for the columnar signal representation."""
+
+from signal_columns import SignalColumns, measure
+
+
+def test_rows_round_trip_with_interned_tags():
+    """Row views expose the appended fields; repeated tags share one pool entry."""
+    columns = SignalColumns()
+    columns.append({"id": "a", "title": "First", "weight": 2, "tags": ["ci", "docs"]}, "2025-39", "x.json")
+    columns.append({"id": "b", "summary": "Second", "tags": ["ci"], "scope": "ops"}, "2025-40")
+    columns.append({"tags": []}, "2025-40", "signals/c.json")
+
+    first, second, third = columns
+    assert first["title"] == "First" and first.weight == 2.0 and first.tags == ["ci", "docs"]
+    assert first.scope == "unscoped" and first.week == "2025-39" and first.source == "x.json"
+    assert second.title == "Second" and second.get("scope") == "ops" and second.weight == 1.0
+    assert third.id == "(no-id)" and third.title == "c.json" and third.tags == []
+    assert columns.tags.values == ["ci", "docs"]
+    assert columns.by_week() == {"2025-39": [0], "2025-40": [1, 2]}
+    assert columns.weeks() == ["2025-39", "2025-40"]
+
+
+def test_duplicate_ids_ignore_records_without_id():
+    columns = SignalColumns()
+    for obj in ({"id": "a"}, {"id": "a"}, {"id": "b"}, {}, {}, {"title": "t"}):
+        columns.append(obj, "2025-39")
+    assert columns.duplicate_ids() == 1
+
+
+def test_benchmark_columnar_footprint_is_a_fraction_of_dicts():
+    """Per-signal memory of the columnar loader stays well under list-of-dicts."""
+    result = measure(20_000)
+    print(
+        f"dicts {result['dict_bytes_per_signal']:.0f} B/signal, "
+        f"columns {result['columnar_bytes_per_signal']:.0f} B/signal"
+    )
+    assert result["columnar_bytes_per_signal"] < result["dict_bytes_per_signal"] / 2
@@ -0,0 +1,79 @@
+"""Tests for the persisted signal query index."""
+
+import json
+
+from signal_index import SignalIndex, parse_bound, where
+from signal_store import SegmentStore
+
+
+def make_index(tmp_path):
+    signals = tmp_path / "signals"
+    signals.mkdir()
+    store = SegmentStore(str(signals / "segments"))
+    store.append("2025-27", [
+        {"id": "a", "weight": 1, "tags": ["governance"], "timestamp": "2025-07-01T09:00:00Z"},
+        {"id": "b", "weight": 3, "tags": ["governance", "ci"], "timestamp": "2025-07-02T09:00:00Z"},
+    ])
+    store.append("2025-39", [
+        {"id": "c", "weight": 5, "tags": ["ci"], "scope": "ops", "timestamp": "2025-09-24T09:00:00Z"},
+    ])
+    path = str(tmp_path / "index.db")
+    return SignalIndex(path, store=store, signals_dir=str(signals)), store, signals, path
+
+
+def ids(index, rows):
+    return [record["id"] for record in index.describe(rows)]
+
+
+def test_filters_top_k_and_grouping(tmp_path):
+    index, _, signals, _ = make_index(tmp_path)
+    (signals / "loose.json").write_text(json.dumps(
+        {"id": "d", "title": "Loose", "weight": 2.5, "tags": ["governance"], "timestamp": "2025-09-30T23:00:00Z"}
+    ), encoding="utf-8")
+    assert index.update() == (4, 0)
+
+    q3 = dict(start=parse_bound("2025-07-01"), end=parse_bound("2025-09-30", end=True))
+    assert ids(index, index.query(["governance"], min_weight=2, **q3)) == ["b", "d"]
+    assert ids(index, index.query(["ci"], scope="ops")) == ["c"]
+    assert ids(index, index.top(2)) == ["c", "b"]
+    assert ids(index, index.top(5, tags=["governance"], **q3)) == ["b", "d", "a"]
+    assert index.count(tags=["ci"]) == (2, 8.0)
+    assert index.group("tag")[0] == {"key": "governance", "count": 3, "weight": 6.5}
+    assert index.group("scope", tags=["ci"]) == [{"key": "ops", "count": 1, "weight": 5.0},
+                                                  {"key": "unscoped", "count": 1, "weight": 3.0}]
+    [loose] = index.describe(index.query(["governance"], min_weight=2.5, max_weight=2.5))
+    assert loose["title"] == "Loose" and loose["tags"] == ["governance"]
+
+
+def test_incremental_update_reads_only_new_records(tmp_path):
+    index, store, signals, path = make_index(tmp_path)
+    index.update()
+    index.close()
+
+    reloaded = SignalIndex(path, store=store, signals_dir=str(signals))
+    assert reloaded.update() == (0, 0)
+    store.append("2025-39", [{"id": "e", "weight": 9, "timestamp": "2025-09-25T09:00:00Z"}])
+    assert reloaded.update() == (1, 0)
+    assert ids(reloaded, reloaded.query(min_weight=9)) == ["e"]
+    store.append("2025-27", [{"id": "f", "weight": 2, "timestamp": "2025-07-01T12:00:00Z"}])
+    assert reloaded.update() == (1, 0)
+    assert ids(reloaded, reloaded.query()) == ["a", "f", "b", "c", "e"]
+
+    # A rewritten segment (new inode) is re-indexed and its old rows retired
+    store.rewrite("2025-27", [{"id": "a", "weight": 7, "timestamp": "2025-07-01T09:00:00Z"}])
+    assert reloaded.update() == (1, 3)
+    assert ids(reloaded, reloaded.query(max_weight=1)) == []
+    assert reloaded.query(tags=["governance"]) == []  # retired rows leave the postings too
+    assert len(reloaded) == 3
+    assert sorted(ids(reloaded, reloaded.query())) == ["a", "c", "e"]
+
+
+def test_queries_use_the_access_path_indexes(tmp_path):
+    index, *_ = make_index(tmp_path)
+    index.update()
+    for filters, name in ((dict(start=0.0, end=1.0), "idx_signals_ts"), (dict(tags=["ci"]), "idx_tags_tag"),
+                          (dict(min_weight=4.0), "idx_signals_weight")):
+        condition, params = where(**filters)
+        plan = " ".join(row[-1] for row in index.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT s.row FROM signals s WHERE {condition}", params))
+        assert name in plan, plan
@@ -0,0 +1,13 @@
+"""Tests for the week-partitioned signal segment store."""
+
+from signal_store import SegmentStore
+
+
+def test_segments_missing_from_the_manifest_are_counted_from_disk(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.append("2025-02", [{"id": "a"}, {"id": "b"}])
+    (tmp_path / "2025-01.jsonl").write_text('{"id": "x"}\n', encoding="utf-8")
+    assert store.weeks() == ["2025-01", "2025-02"]
+    assert store.segment_info("2025-01") == {"count": 1, "bytes": 12}
+    assert store.segment_info("2025-02")["count"] == 2
+
@@ -0,0 +1,51 @@
+"""Tests for streaming digest summaries and tag sketches."""
+
+import random
+from collections import Counter
+
+from signal_stream import CountMinTopK, SpaceSaving, TopK, summarize
+
+
+def test_top_k_matches_full_sort_including_ties():
+    random.seed(7)
+    items = [(random.randint(0, 5) / 2, f"T{random.randint(0, 9)}", f"id{i}") for i in range(2000)]
+    top = TopK(25)
+    for weight, title, ident in items:
+        top.push(weight, title, ident)
+    expected = sorted(items, key=lambda x: (-x[0], x[1]))[:25]
+    assert [(r["weight"], r["title"], r["id"]) for r in top.items()] == expected
+
+
+def test_sketches_keep_heavy_hitters():
+    """Both sketches report the dominant tags of a skewed stream within their error bounds."""
+    random.seed(3)
+    stream = [f"hot{i}" for i in range(5) for _ in range(2000 - 300 * i)]
+    stream += [f"cold{random.randint(0, 5000)}" for _ in range(20000)]
+    random.shuffle(stream)
+    exact = Counter(stream)
+
+    saving, cms = SpaceSaving(64), CountMinTopK(candidates=32)
+    for tag in stream:
+        saving.add(tag)
+        cms.add(tag)
+
+    hot = [tag for tag, _ in exact.most_common(5)]
+    assert [tag for tag, _ in saving.most_common(5)] == hot
+    assert [tag for tag, _ in cms.most_common(5)] == hot
+    for tag in hot:
+        assert exact[tag] <= saving[tag] <= exact[tag] + len(stream) / 64
+        assert exact[tag] <= cms[tag]
+
+
+def test_summarize_groups_by_week():
+    records = [
+        ("2025-39", {"id": "a", "weight": 2, "tags": ["ci"]}, "s"),
+        ("2025-39", {"id": "b", "tags": ["ci", "docs"], "scope": "ops"}, "s"),
+        ("2025-40", {"summary": "c"}, "x.json"),
+    ]
+    weeks = summarize(records, top=1)
+    assert weeks["2025-39"].count == 2 and weeks["2025-39"].weight == 3.0
+    assert weeks["2025-39"].top_signals() == [{"id": "a", "title": "a", "weight": 2.0}]
+    assert weeks["2025-39"].top_tags() == [("ci", 2), ("docs", 1)]
+    assert weeks["2025-39"].scopes == {"unscoped": 1, "ops": 1}
+    assert weeks["2025-40"].top_signals()[0]["title"] == "c"
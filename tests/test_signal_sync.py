@@ -0,0 +1,147 @@
+"""Tests for Merkle-tree signal replication between two segment stores."""
+
+import threading
+
+import pytest
+
+from signal_store import SegmentStore
+from signal_sync import RemotePeer, SegmentTree, SyncServer, load_validator, sync
+
+
+def node(tmp_path, name, validator=None):
+    return SegmentTree(SegmentStore(str(tmp_path / name / "segments")), cache_dir=str(tmp_path / "cache" / name),
+                       validator=validator)
+
+
+def seed(tree, count=2000):
+    for week in ("2025-37", "2025-38", "2025-39", "2025-40"):
+        records = [
+            {"id": f"{week}-{i}", "weight": i % 7, "timestamp": "2025-09-22T10:00:00Z"}
+            for i in range(count // 4)
+        ]
+        tree.store.append(week, records)
+    tree.store.save_manifest()
+
+
+@pytest.fixture
+def pair(tmp_path):
+    a, b = node(tmp_path, "a"), node(tmp_path, "b")
+    seed(a)
+    seed(b)
+    return a, b
+
+
+def test_sync_transfers_only_the_difference_and_converges(pair):
+    a, b = pair
+    assert a.root() == b.root()
+    a.store.append("2025-39", [{"id": "only-a", "timestamp": "2025-09-24T00:00:00Z"}])
+    b.store.append("2025-41", [{"id": "only-b", "timestamp": "2025-10-06T00:00:00Z"}])
+    # Conflict: the later timestamp wins on both sides
+    a.put("2025-38", [{"id": "2025-38-5", "weight": 9, "timestamp": "2025-09-23T00:00:00Z"}])
+    b.put("2025-38", [{"id": "2025-38-5", "weight": 1, "timestamp": "2025-09-24T00:00:00Z"}])
+
+    stats = sync(a, b)
+
+    assert a.root() == b.root()
+    assert stats["pulled"] == 2 and stats["pushed"] == 1
+    assert stats["leaves"] < 100, stats  # a few buckets, not 2000 leaves
+    [merged] = a.fetch("2025-38", ["2025-38-5"])
+    assert merged["weight"] == 1
+    assert sum(1 for _ in a.store.iter_week("2025-38")) == 500
+    assert sync(a, b) == {"weeks": 0, "buckets": 0, "leaves": 0, "pulled": 0, "pushed": 0, "skipped": 0}
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(tree, **kwargs):
+        server = SyncServer(("127.0.0.1", 0), tree, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server.server_address
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_put_rejects_bad_weeks_and_invalid_records(tmp_path):
+    tree = node(tmp_path, "v", validator=load_validator())
+    with pytest.raises(ValueError, match="invalid week"):
+        tree.put("../escaped", [{"id": "x"}])
+    with pytest.raises(ValueError, match="invalid record"):
+        tree.put("2025-39", [{"id": "ok"}, {"weight": 1}])
+    assert not (tmp_path / "v" / "escaped.jsonl").exists()
+    assert tree.store.weeks() == []  # the whole batch was refused
+
+
+def test_invalid_peer_week_is_skipped_and_caches_still_saved(tmp_path, capsys):
+    a = node(tmp_path, "a", validator=load_validator())
+    b = node(tmp_path, "b")
+    b.store.append("2025-38", [{"weight": 1}])  # no id: fails the schema on a
+    b.store.append("2025-39", [{"id": "fine", "timestamp": "2025-09-24T00:00:00Z"}])
+    b.store.save_manifest()
+
+    stats = sync(a, b, push=False)
+    assert (stats["pulled"], stats["skipped"]) == (1, 1)
+    assert "2025-38" in capsys.readouterr().err
+    assert a.store.weeks() == ["2025-39"]
+    assert (tmp_path / "cache" / "b").is_dir()  # peer cache persisted despite the bad week
+
+
+def test_leaf_hashes_come_from_the_cache(pair, monkeypatch):
+    a, _ = pair
+    [prefix, *_] = sorted(a.buckets("2025-39"))
+    expected = a.leaves("2025-39", [prefix])
+    assert expected
+
+    def fail(week):
+        raise AssertionError("segment re-read")
+
+    monkeypatch.setattr(a, "records", fail)
+    assert a.leaves("2025-39", [prefix]) == expected
+
+
+def test_served_node_is_read_only_unless_writable_with_token(pair, serve):
+    a, b = pair
+    a.store.append("2025-40", [{"id": "local-only"}])
+    peer = RemotePeer(*serve(b))
+    try:
+        assert sync(a, peer)["skipped"] == 1  # the push is refused and reported, not raised
+    finally:
+        peer.close()
+
+    address = serve(b, writable=True, token="s3cret")
+    for token in (None, "wrong"):
+        peer = RemotePeer(*address, token=token)
+        try:
+            with pytest.raises(RuntimeError, match="unauthorized"):
+                peer.root()
+        finally:
+            peer.close()
+    peer = RemotePeer(*address, token="s3cret")
+    try:
+        assert sync(a, peer)["pushed"] == 1
+        assert a.root() == peer.root()
+    finally:
+        peer.close()
+
+
+def test_sync_over_local_socket(pair):
+    a, b = pair
+    b.store.append("2025-40", [{"id": "remote-only"}])
+    server = SyncServer(("127.0.0.1", 0), b)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    peer = RemotePeer(*server.server_address)
+    try:
+        stats = sync(a, peer, dry_run=True)
+        assert stats["pulled"] == 1 and a.root() != peer.root()
+        sync(a, peer, push=False)
+        assert a.root() == peer.root()
+    finally:
+        peer.close()
+        server.shutdown()
+        server.server_close()
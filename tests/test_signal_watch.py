@@ -0,0 +1,75 @@
+"""Tests for the incremental signal ingest watcher."""
+
+import json
+import sys
+
+import pytest
+
+from generate_weekly_digest import render_summary
+from signal_stream import summarize
+from signal_watch import InotifySource, PollSource, SignalWatcher
+
+SCHEMA = "docs/schemas/signal.schema.json"
+
+
+def drop(directory, name, **record):
+    path = directory / name
+    path.write_text(json.dumps(record), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    signals = tmp_path / "signals"
+    signals.mkdir()
+    return SignalWatcher(str(signals), digest_dir=str(tmp_path / "digests"), schema_path=SCHEMA, top=2)
+
+
+def test_incremental_digest_matches_full_render(watcher, tmp_path):
+    """Running aggregates render the same digest body as a full rebuild."""
+    signals = tmp_path / "signals"
+    records = [
+        dict(id="a", title="Alpha", weight=2, tags=["ci"], timestamp="2025-09-22T10:00:00Z"),
+        dict(id="b", title="Beta", weight=5, tags=["ci", "docs"], timestamp="2025-09-23T10:00:00Z"),
+        dict(id="c", title="Gamma", weight=1, timestamp="2025-09-24T10:00:00Z"),
+    ]
+    paths = [drop(signals, f"{r['id']}.json", **r) for r in records]
+    assert watcher.process(paths) == 3
+    [written] = watcher.flush()
+
+    summary = summarize([("2025-39", r, "") for r in records], top=2)["2025-39"]
+    expected = render_summary("2025-39", summary.count, summary.weight, summary.top_signals(),
+                              summary.top_tags(12), watcher.trends("2025-39"))
+    with open(written, encoding="utf-8") as f:
+        assert f.read() == expected
+
+    # Re-seeing the same files, or a duplicate id, rewrites nothing
+    dup = drop(signals, "dup.json", **records[0])
+    assert watcher.process(paths + [dup]) == 1
+    assert watcher.flush() == []
+
+
+def test_invalid_files_are_rejected_once(watcher, tmp_path, capsys):
+    signals = tmp_path / "signals"
+    bad = drop(signals, "bad.json", title="no id", weight=-1)
+    assert watcher.process([bad, bad]) == 0
+    assert capsys.readouterr().out.count("❌") == 1
+    assert watcher.flush() == []
+
+
+def test_poll_source_reports_new_and_changed_files(tmp_path):
+    source = PollSource(str(tmp_path), interval=0)
+    path = drop(tmp_path, "x.json", id="x")
+    assert source.wait() == [path]
+    assert source.wait() == []
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_source_reports_completed_writes(tmp_path):
+    source = InotifySource(str(tmp_path))
+    try:
+        path = drop(tmp_path, "y.json", id="y")
+        (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+        assert source.wait(timeout=2) == [path]
+    finally:
+        source.close()
@@ -0,0 +1,40 @@
+"""Tests for shared timestamp parsing."""
+
+from datetime import date, datetime, timedelta, timezone
+
+from timestamps import normalize_timestamp, parse_date, parse_timestamp
+
+
+def test_fast_path_matches_dateutil():
+    from dateutil import parser as date_parser
+
+    for value in [
+        "2025-09-22",
+        "2025-09-22T10:00:00Z",
+        "2025-09-22T10:00:00.250+02:00",
+        "2025-09-22 10:00",
+        "2025-09-22T10:00:00",
+    ]:
+        assert parse_timestamp(value) == date_parser.parse(value), value
+
+
+def test_fallback_and_defaults():
+    assert parse_timestamp("22 Sep 2025 10:00 UTC") == datetime(2025, 9, 22, 10, tzinfo=timezone.utc)
+    assert parse_timestamp("2025-02-30T00:00:00Z") is None
+    assert parse_timestamp("not a date", default="x") == "x"
+    assert parse_timestamp(None) is None and parse_timestamp(42) is None
+
+
+def test_normalize_keeps_offset_and_week():
+    assert normalize_timestamp("22 Sep 2025 10:00 UTC") == "2025-09-22T10:00:00Z"
+    local = normalize_timestamp("2025-09-29T00:30:00+02:00")
+    assert local == "2025-09-29T00:30:00+02:00"
+    assert parse_timestamp(local).utcoffset() == timedelta(hours=2)
+    assert parse_timestamp(local).isocalendar()[1] == 40
+
+
+def test_parse_date_is_strict():
+    assert parse_date(" 2025-09-22 ") == date(2025, 9, 22)
+    assert parse_date("2025-02-30") is None
+    assert parse_date("2025-9-22") is None
+    assert parse_date("2025-09-22T10:00:00Z") is None
@@ -0,0 +1,52 @@
+"""Tests for the incremental SQLite docs catalog."""
+
+import os
+
+from vault_catalog import VaultCatalog
+
+
+def test_refresh_reparses_only_changed_documents(tmp_path):
+    """Unchanged fingerprints skip reads; touched files with equal hashes skip parsing."""
+    doc = tmp_path / "note.md"
+    doc.write_text("# Title\n\nSee [guide](guide.md#setup).\n\nTODO: tidy\n", encoding="utf-8")
+    catalog = VaultCatalog(tmp_path / "vault.db")
+
+    assert catalog.refresh([doc])["parsed"] == 1
+    assert catalog.refresh([doc])["unchanged"] == 1
+
+    st = doc.stat()
+    os.utime(doc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert catalog.refresh([doc])["touched"] == 1
+
+    key = doc.as_posix()
+    row = catalog.documents(str(tmp_path))[0]
+    assert row["title"] == "Title"
+    assert row["todo_count"] == 1
+    assert catalog.links([key])[key] == [(3, "guide", "guide.md#setup")]
+    assert catalog.linking_to("guide.md#setup")[0][0] == key
+
+    doc.unlink()
+    assert catalog.refresh([doc])["removed"] == 1
+    assert not catalog.has(key)
+    catalog.close()
+
+
+def test_path_queries_use_chunked_in_lookups(tmp_path, monkeypatch):
+    import vault_catalog
+
+    monkeypatch.setattr(vault_catalog, "MAX_BIND", 2)
+    paths = []
+    for n in range(5):
+        doc = tmp_path / f"d{n}.md"
+        footer = "\n— VaultMesh · Earth’s Civilization Ledger —\nhttps://x\n" if n % 2 else ""
+        doc.write_text(f"# D{n}\n\n## Part\n{footer}", encoding="utf-8")
+        paths.append(doc)
+    with VaultCatalog(tmp_path / "vault.db") as catalog:
+        catalog.refresh(paths)
+        keys = [p.as_posix() for p in paths] + [(tmp_path / "missing.md").as_posix()]
+        status = catalog.footer_status(keys)
+        assert sorted(status) == sorted(keys[:5])
+        assert [status[k][0] for k in keys[:5]] == [False, True, False, True, False]
+        headings = catalog.headings(keys)
+        assert headings[keys[4]] == [(1, 1, "D4"), (3, 2, "Part")]
+        assert headings[keys[5]] == []